@@ -1,33 +1,116 @@
 """The Braiins Pool integration."""
 
 from datetime import timedelta
+from functools import partial
 import logging
+import os
+from urllib.parse import quote
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .coordinator import BraiinsDataUpdateCoordinator
-from .api import BraiinsPoolApiClient
-from .const import DOMAIN, CONF_API_KEY, DEFAULT_SCAN_INTERVAL_MINS
+from .coordinator import BraiinsDataUpdateCoordinator, BraiinsFarmUpdateCoordinator
+from .api import (
+    API_BASE_URL,
+    DEFAULT_COIN,
+    DEFAULT_HEDGE_PERCENTILE,
+    BraiinsPoolApiClient,
+)
+from .cache import api_key_digest
+from .prometheus import BraiinsPoolMetricsView
+from .scheduler import entry_jitter
+from .services import async_setup_services
+from .session import async_create_session, async_prewarm
+from .const import (
+    DOMAIN,
+    CONF_ACCOUNT_NAME,
+    CONF_ACCOUNTS,
+    CONF_ALIGNED_POLLING,
+    CONF_API_KEY,
+    CONF_COINS,
+    CONF_DEDICATED_SESSION,
+    CONF_ENTRY_TYPE,
+    CONF_FETCH_WORKERS,
+    CONF_HASHRATE_HISTORY,
+    CONF_HEDGE_REQUESTS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_POLL_JITTER_SECS,
+    CONF_POLL_OFFSET_SECS,
+    CONF_POOL_STATS_TTL,
+    CONF_STAGGER_MS,
+    CONF_STALE_GRACE_MINS,
+    DATA_PROFILE_PROBE_CACHE,
+    DEFAULT_COINS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_POLL_JITTER_SECS,
+    DEFAULT_POLL_OFFSET_SECS,
+    DEFAULT_POOL_STATS_TTL_MINS,
+    DEFAULT_SCAN_INTERVAL_MINS,
+    DEFAULT_STAGGER_MS,
+    DEFAULT_STALE_GRACE_MINS,
+    ENTRY_TYPE_ACCOUNT,
+    ENTRY_TYPE_FARM,
+    HISTORY_DIR,
+)
 
 _LOGGER = logging.getLogger(__name__)
 SCAN_INTERVAL = timedelta(minutes=DEFAULT_SCAN_INTERVAL_MINS)
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Braiins Pool integration."""
+    async_setup_services(hass)
+    hass.http.register_view(BraiinsPoolMetricsView())
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Braiins Pool from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    api_key = entry.data[CONF_API_KEY]
+    dedicated_session = entry.options.get(CONF_DEDICATED_SESSION, False)
+    if dedicated_session:
+        session = async_create_session(hass)
+        entry.async_on_unload(session.close)
+    else:
+        session = async_get_clientsession(hass)
 
-    session = async_get_clientsession(hass)
-    api_client = BraiinsPoolApiClient(session, api_key)
+    if entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_ACCOUNT) == ENTRY_TYPE_FARM:
+        coordinator = _create_farm_coordinator(hass, entry, session)
+        connections = min(coordinator.max_concurrent, len(coordinator.accounts))
+    else:
+        api_client = _create_api_client(entry, session, entry.data[CONF_API_KEY])
+        coordinator = _create_account_coordinator(
+            hass, entry, api_client, SCAN_INTERVAL
+        )
+        _seed_probed_profile(hass, coordinator, entry.data[CONF_API_KEY])
+        # Profile and pool statistics are requested at the same time
+        connections = 2
+    if dedicated_session:
+        coordinator.prewarm = partial(async_prewarm, session, API_BASE_URL, connections)
+    if stale_grace_mins := entry.options.get(
+        CONF_STALE_GRACE_MINS, DEFAULT_STALE_GRACE_MINS
+    ):
+        coordinator.stale_grace = timedelta(minutes=stale_grace_mins)
 
-    coordinator = BraiinsDataUpdateCoordinator(
-        hass,
-        api_client=api_client,
-        update_interval=SCAN_INTERVAL,
-    )
+    if entry.options.get(CONF_ALIGNED_POLLING, False):
+        # Each entry gets its own deterministic slot after the boundary, so
+        # entries do not all hit the API at the same moment.
+        jitter = entry_jitter(
+            entry.entry_id,
+            entry.options.get(CONF_POLL_JITTER_SECS, DEFAULT_POLL_JITTER_SECS),
+        )
+        coordinator.set_aligned_polling(
+            timedelta(
+                seconds=entry.options.get(
+                    CONF_POLL_OFFSET_SECS, DEFAULT_POLL_OFFSET_SECS
+                )
+                + jitter
+            )
+        )
 
     await coordinator.async_config_entry_first_refresh()
 
@@ -35,12 +118,131 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
 
+    entry.async_on_unload(coordinator.async_track_day_rollover())
+    if entry.options.get(CONF_HASHRATE_HISTORY, False):
+        _track_hashrate_history(hass, entry, coordinator)
+    # Every consumer is in place; later updates fetch only what is consumed
+    coordinator.demand.start()
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     return True
 
 
+def _create_api_client(
+    entry: ConfigEntry, session, api_key: str
+) -> BraiinsPoolApiClient:
+    """Create the API client of one account."""
+    return BraiinsPoolApiClient(
+        session,
+        api_key,
+        hedge_percentile=(
+            DEFAULT_HEDGE_PERCENTILE
+            if entry.options.get(CONF_HEDGE_REQUESTS, False)
+            else None
+        ),
+    )
+
+
+def _create_account_coordinator(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    api_client: BraiinsPoolApiClient,
+    update_interval: timedelta | None,
+) -> BraiinsDataUpdateCoordinator:
+    """Create the coordinator of a single account."""
+    return BraiinsDataUpdateCoordinator(
+        hass,
+        api_client=api_client,
+        update_interval=update_interval,
+        pool_stats_ttl=timedelta(
+            minutes=entry.options.get(CONF_POOL_STATS_TTL, DEFAULT_POOL_STATS_TTL_MINS)
+        ),
+        coins=entry.options.get(CONF_COINS, DEFAULT_COINS),
+        fetch_workers=entry.options.get(CONF_FETCH_WORKERS, False),
+    )
+
+
+def _create_farm_coordinator(
+    hass: HomeAssistant, entry: ConfigEntry, session
+) -> BraiinsFarmUpdateCoordinator:
+    """Create the coordinator of a farm entry and its accounts."""
+    # Accounts get no update interval of their own; the farm refreshes them.
+    accounts = {
+        account[CONF_ACCOUNT_NAME]: _create_account_coordinator(
+            hass,
+            entry,
+            _create_api_client(entry, session, account[CONF_API_KEY]),
+            None,
+        )
+        for account in entry.data[CONF_ACCOUNTS]
+    }
+    for account in entry.data[CONF_ACCOUNTS]:
+        _seed_probed_profile(
+            hass, accounts[account[CONF_ACCOUNT_NAME]], account[CONF_API_KEY]
+        )
+    return BraiinsFarmUpdateCoordinator(
+        hass,
+        accounts=accounts,
+        update_interval=SCAN_INTERVAL,
+        max_concurrent=entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        stagger=timedelta(
+            milliseconds=entry.options.get(CONF_STAGGER_MS, DEFAULT_STAGGER_MS)
+        ),
+        coins=entry.options.get(CONF_COINS, DEFAULT_COINS),
+    )
+
+
+def _seed_probed_profile(
+    hass: HomeAssistant, coordinator: BraiinsDataUpdateCoordinator, api_key: str
+) -> None:
+    """Hand the profile fetched by the config flow to the first refresh."""
+    probe_cache = hass.data.get(DATA_PROFILE_PROBE_CACHE)
+    if probe_cache is None:
+        return
+    digest = api_key_digest(api_key)
+    profile = probe_cache.get(digest)
+    probe_cache.pop(digest)
+    if profile is not None and DEFAULT_COIN in coordinator.coins:
+        coordinator.seed_profile(DEFAULT_COIN, profile)
+
+
+def _track_hashrate_history(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: BraiinsDataUpdateCoordinator | BraiinsFarmUpdateCoordinator,
+) -> None:
+    """Record every account's hash rates into its own on-disk history."""
+    # Only entries with the history enabled load the storage code
+    from .timeseries import HashrateHistory, async_track_hashrate_history
+
+    directory = hass.config.path(HISTORY_DIR, entry.entry_id)
+    if isinstance(coordinator, BraiinsFarmUpdateCoordinator):
+        accounts = {
+            os.path.join(directory, quote(name, safe="")): account
+            for name, account in coordinator.accounts.items()
+        }
+    else:
+        accounts = {directory: coordinator}
+    for account_directory, account in accounts.items():
+        account.history = HashrateHistory(account_directory)
+        entry.async_on_unload(
+            async_track_hashrate_history(hass, account, account.history)
+        )
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
     if unload_ok:
+        # Home Assistant shuts the coordinator down right after, which
+        # cancels requests still in flight instead of waiting for their
+        # timeouts, so unloading and reloading stay fast.
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
@@ -1,26 +1,82 @@
 """API client for Braiins Pool."""
 
+import asyncio
 import logging
 import aiohttp
 import json
-from decimal import Decimal
+import time
+from typing import TYPE_CHECKING
 
-API_HEADERS = {"Pool-Auth-Token": "{}", "Accept": "application/json"}
-API_URL_POOL_STATS = "https://pool.braiins.com/stats/json/{}"
-API_URL_USER_PROFILE = "https://pool.braiins.com/accounts/profile/json/{}/"
-API_URL_DAILY_REWARDS = "https://pool.braiins.com/accounts/rewards/json/{}"
-API_URL_DAILY_HASHRATE = "https://pool.braiins.com/accounts/hash_rate_daily/json/{}/{}"
-API_URL_BLOCK_REWARDS = (
-    "https://pool.braiins.com/accounts/block_rewards/json/{}?from={}&to={}"
+from .metrics import ApiMetrics, EndpointMetrics
+from .schema import (
+    BlockReward,
+    DailyHashrate,
+    DailyReward,
+    Payout,
+    PoolStats,
+    SchemaError,
+    UserProfile,
+    Worker,
+    decode_block_rewards,
+    decode_daily_hashrate,
+    decode_daily_rewards,
+    decode_payouts,
+    decode_pool_stats,
+    decode_profile,
+    decode_workers,
 )
-API_URL_WORKERS = "https://pool.braiins.com/accounts/workers/json/{}/"
-API_URL_PAYOUTS = "https://pool.braiins.com/accounts/payouts/json/{}?from={}&to={}"
+from .tracing import DEFAULT_TRACE_BODY_LIMIT, RequestTracer
+
+if TYPE_CHECKING:
+    # Cassettes are only used in development, so cassette.py is not loaded
+    # unless one is created.
+    from .cassette import Cassette
+
+API_HEADERS = {"Pool-Auth-Token": "{}", "Accept": "application/json"}
+API_BASE_URL = "https://pool.braiins.com"
+API_URL_POOL_STATS = "/stats/json/{}"
+API_URL_USER_PROFILE = "/accounts/profile/json/{}/"
+API_URL_DAILY_REWARDS = "/accounts/rewards/json/{}"
+API_URL_DAILY_HASHRATE = "/accounts/hash_rate_daily/json/{}/{}"
+API_URL_BLOCK_REWARDS = "/accounts/block_rewards/json/{}?from={}&to={}"
+API_URL_WORKERS = "/accounts/workers/json/{}/"
+API_URL_PAYOUTS = "/accounts/payouts/json/{}?from={}&to={}"
 DEFAULT_COIN = "btc"
 
+# Connect and read budgets per endpoint, so a stuck connection fails the
+# request instead of holding the update for as long as the session allows.
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5, sock_read=20)
+REQUEST_TIMEOUTS = {
+    "profile": aiohttp.ClientTimeout(total=15, connect=5, sock_read=10),
+    "pool_stats": aiohttp.ClientTimeout(total=15, connect=5, sock_read=10),
+    "workers": DEFAULT_TIMEOUT,
+    "daily_rewards": aiohttp.ClientTimeout(total=60, connect=5, sock_read=30),
+    "daily_hashrate": aiohttp.ClientTimeout(total=60, connect=5, sock_read=30),
+    "block_rewards": aiohttp.ClientTimeout(total=60, connect=5, sock_read=30),
+    "payouts": aiohttp.ClientTimeout(total=60, connect=5, sock_read=30),
+}
+# Endpoints polled on every update with small responses, for which a second
+# request is cheap enough to hedge against a slow first one.
+HEDGED_ENDPOINTS = frozenset({"profile", "pool_stats"})
+DEFAULT_HEDGE_PERCENTILE = 95
+# Responses an endpoint needs before its latency percentile is used
+HEDGE_MIN_SAMPLES = 20
+
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _excerpt(body: str) -> str:
+    """Return the start of a response body for a log or error message.
+
+    The whole exchange goes to the trace; a large body in an error would be
+    repeated by every failed update.
+    """
+    if len(body) <= DEFAULT_TRACE_BODY_LIMIT:
+        return body
+    return f"{body[:DEFAULT_TRACE_BODY_LIMIT]}... ({len(body)} characters)"
+
+
 class BraiinsPoolApiException(Exception):
     """Base exception for Braiins Pool API."""
 
@@ -29,50 +85,178 @@ class BraiinsPoolAuthError(BraiinsPoolApiException):
     """Authentication error."""
 
 
+class BraiinsPoolSchemaError(BraiinsPoolApiException):
+    """A response does not have the structure the decoders expect."""
+
+
 class BraiinsPoolApiClient:
     """API client for Braiins Pool."""
 
-    def __init__(self, session: aiohttp.ClientSession, api_key: str):
-        """Initialize."""
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        api_key: str,
+        base_url: str = API_BASE_URL,
+        cassette: "Cassette | None" = None,
+        hedge_percentile: float | None = None,
+    ):
+        """Initialize.
+
+        With a cassette, responses are recorded to it, or replayed from it
+        without network access; see cassette.py. With a hedge percentile,
+        a request to a hedged endpoint that is still running after that
+        percentile of the endpoint's latencies gets a second, identical
+        request, and whichever answers first is used.
+        """
         self._session = session
         self._api_key = api_key
+        self._base_url = base_url
+        self.hedge_percentile = hedge_percentile
+        self.closed = False
+        self._tasks: set[asyncio.Task] = set()
+        self.metrics = ApiMetrics()
+        self.tracer = RequestTracer(api_key)
+        if cassette is not None:
+            self._session = cassette.session(session, api_key, base_url)
 
-    async def _request(self, url: str):
+    async def _request(self, url: str, endpoint: str = "other"):
         """
         Helper method to perform API requests to the Braiins Pool API.
 
         Args:
             url (str): The full URL of the API endpoint to request.
+            endpoint (str): Name the request is counted under in the metrics.
 
         Returns:
             dict: The JSON response from the API.
 
         Raises:
-            BraiinsPoolApiException: If an API error or non-JSON response occurs.
+            BraiinsPoolApiException: If an API error or non-JSON response occurs,
+                or the client is closed.
         """
-        headers = {k: v.format(self._api_key) for k, v in API_HEADERS.items()}
-        _LOGGER.debug("Making API request to: %s, Headers: %s", url, headers)
+        if self.closed:
+            raise BraiinsPoolApiException("API client is closed")
+        # Every request runs as a task of its own, so async_close can cancel
+        # all requests in flight without knowing who is waiting for them.
+        task = asyncio.create_task(self._async_request(url, endpoint))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return await task
+
+    async def async_close(self) -> None:
+        """Cancel the requests in flight and refuse new ones.
+
+        Callers waiting for a cancelled request get asyncio.CancelledError.
+        """
+        self.closed = True
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _async_request(self, url: str, endpoint: str):
+        """Perform a request, recording its outcome in the metrics."""
+        metrics = self.metrics.endpoint(endpoint)
+        timeout = REQUEST_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+        try:
+            if (
+                self.hedge_percentile is not None
+                and endpoint in HEDGED_ENDPOINTS
+                and metrics.requests >= HEDGE_MIN_SAMPLES
+            ):
+                hedge_after = metrics.latency_ms_percentile(self.hedge_percentile)
+                return await self._hedged_fetch(
+                    url, metrics, timeout, hedge_after / 1000
+                )
+            return await self._fetch(url, metrics, timeout)
+        except Exception as err:
+            metrics.observe_error(err)
+            raise
+
+    async def _hedged_fetch(
+        self,
+        url: str,
+        metrics: EndpointMetrics,
+        timeout: aiohttp.ClientTimeout,
+        hedge_after: float,
+    ):
+        """Fetch a URL, sending a second request if the first is slow.
+
+        The first successful response wins and the other request is
+        cancelled. Only an error of both requests is raised.
+        """
+        tasks = {asyncio.create_task(self._fetch(url, metrics, timeout))}
         try:
-            async with self._session.get(url, headers=headers) as response:
-                _LOGGER.debug(
-                    "Received API response: Status: %s, Headers: %s",
-                    response.status,
-                    response.headers,
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                metrics.hedged += 1
+                tasks.add(asyncio.create_task(self._fetch(url, metrics, timeout)))
+            while True:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
                 )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                if not tasks:
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch(
+        self,
+        url: str,
+        metrics: EndpointMetrics,
+        timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+    ):
+        """Fetch and decode a URL, recording timings and size in metrics."""
+        started = time.monotonic()
+        headers = {k: v.format(self._api_key) for k, v in API_HEADERS.items()}
+        # Headers and bodies go to the bounded, redacted trace rather than the
+        # log, and only while debug logging is enabled.
+        tracing = _LOGGER.isEnabledFor(logging.DEBUG)
+        try:
+            async with self._session.get(
+                url, headers=headers, timeout=timeout
+            ) as response:
+                # aiohttp keeps the body read, so decoding it costs no second read
+                response_size = len(await response.read())
                 response_text = await response.text()
-                _LOGGER.debug("API Response Body: %s", response_text)
+                elapsed_ms = (time.monotonic() - started) * 1000
+                metrics.observe_response(elapsed_ms, response_size)
+                if tracing:
+                    _LOGGER.debug(
+                        "API request to %s: status %s, %s bytes in %.0f ms",
+                        url,
+                        response.status,
+                        response_size,
+                        elapsed_ms,
+                    )
+                    self.tracer.record(
+                        url,
+                        headers,
+                        response.status,
+                        response.headers,
+                        response_text,
+                        elapsed_ms,
+                    )
                 response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
                 try:
-                    return json.loads(response_text)
+                    decode_started = time.monotonic()
+                    data = json.loads(response_text)
+                    metrics.observe_decode((time.monotonic() - decode_started) * 1000)
+                    return data
                 except (aiohttp.ContentTypeError, json.JSONDecodeError) as json_err:
+                    excerpt = _excerpt(response_text)
                     _LOGGER.error(
                         "API request to %s returned non-JSON response (status: %s). Response text: %s",
                         url,
                         response.status,
-                        response_text,
+                        excerpt,
                     )
                     raise BraiinsPoolApiException(
-                        f"API returned non-JSON response. Status: {response.status}, Body: {response_text}"
+                        f"API returned non-JSON response. Status: {response.status}, Body: {excerpt}"
                     ) from json_err
         except aiohttp.ClientResponseError as err:
             if (
@@ -92,6 +276,9 @@ class BraiinsPoolApiClient:
                 f"API error {err.status}: {err.message}"
             ) from err
         except aiohttp.ClientError as err:
+            if tracing:
+                _LOGGER.debug("API request to %s failed: %s", url, err)
+                self.tracer.record(url, headers, error=err)
             raise err
         except (
             BraiinsPoolAuthError
@@ -107,52 +294,54 @@ class BraiinsPoolApiClient:
             )
             raise err
 
-    async def get_user_profile(self, coin=DEFAULT_COIN):
-        """Fetch user profile from Braiins Pool API."""
-        url = API_URL_USER_PROFILE.format(coin)
-        data = await self._request(url)
-        processed_data = {}
-        if coin == "btc" and "btc" in data:
-            btc_data = data["btc"]
-            processed_data["current_balance"] = Decimal(
-                btc_data.get("current_balance", "0")
-            )
-            processed_data["today_reward"] = Decimal(btc_data.get("today_reward", "0"))
-            processed_data["all_time_reward"] = Decimal(
-                btc_data.get("all_time_reward", "0")
-            )
-            processed_data["ok_workers"] = int(btc_data.get("ok_workers", 0))
-            processed_data["pool_5m_hash_rate"] = float(
-                btc_data.get("hash_rate_5m", "0")
-            )
-        return processed_data
-
-    async def get_account_stats(self):
-        """Fetch account statistics from Braiins Pool API. Not parsed yet."""
-        url = API_URL_POOL_STATS.format(DEFAULT_COIN)
-        return await self._request(url)
-
-    async def get_daily_rewards(self):
-        """Fetch daily rewards from Braiins Pool API. Not parsed yet."""
-        url = API_URL_DAILY_REWARDS.format(DEFAULT_COIN)
-        return await self._request(url)
-
-    async def get_daily_hashrate(self, group="user", coin=DEFAULT_COIN):
-        """Fetch daily hashrate from Braiins Pool API. Not parsed yet."""
-        url = API_URL_DAILY_HASHRATE.format(group, coin)
-        return await self._request(url)
-
-    async def get_block_rewards(self, from_date: str, to_date: str, coin=DEFAULT_COIN):
-        """Fetch block rewards from Braiins Pool API. Not parsed yet."""
-        url = API_URL_BLOCK_REWARDS.format(coin, from_date, to_date)
-        return await self._request(url)
-
-    async def get_workers(self, coin=DEFAULT_COIN):
-        """Fetch worker data from Braiins Pool API. Not parsed yet."""
-        url = API_URL_WORKERS.format(coin)
-        return await self._request(url)
-
-    async def get_payouts(self, from_date: str, to_date: str, coin=DEFAULT_COIN):
-        """Fetch payouts data from Braiins Pool API. Not parsed yet."""
-        url = API_URL_PAYOUTS.format(coin, from_date, to_date)
-        return await self._request(url)
+    async def _get(self, url: str, endpoint: str, decode, coin: str):
+        """Request an endpoint and decode its response for a coin."""
+        data = await self._request(url, endpoint)
+        try:
+            return decode(data, coin)
+        except SchemaError as err:
+            _LOGGER.error("Unexpected %s response from %s: %s", endpoint, url, err)
+            raise BraiinsPoolSchemaError(
+                f"Unexpected {endpoint} response: {err}"
+            ) from err
+
+    async def get_user_profile(self, coin=DEFAULT_COIN) -> UserProfile | dict:
+        """Fetch the account figures of a coin; empty without data for it."""
+        url = self._base_url + API_URL_USER_PROFILE.format(coin)
+        return await self._get(url, "profile", decode_profile, coin)
+
+    async def get_account_stats(self, coin=DEFAULT_COIN) -> PoolStats | dict:
+        """Fetch the pool-wide statistics of a coin; empty without data for it."""
+        url = self._base_url + API_URL_POOL_STATS.format(coin)
+        return await self._get(url, "pool_stats", decode_pool_stats, coin)
+
+    async def get_daily_rewards(self, coin=DEFAULT_COIN) -> list[DailyReward]:
+        """Fetch the daily rewards of the account's whole history."""
+        url = self._base_url + API_URL_DAILY_REWARDS.format(coin)
+        return await self._get(url, "daily_rewards", decode_daily_rewards, coin)
+
+    async def get_daily_hashrate(
+        self, group="user", coin=DEFAULT_COIN
+    ) -> list[DailyHashrate]:
+        """Fetch the daily average hash rates of the account's history."""
+        url = self._base_url + API_URL_DAILY_HASHRATE.format(group, coin)
+        return await self._get(url, "daily_hashrate", decode_daily_hashrate, coin)
+
+    async def get_block_rewards(
+        self, from_date: str, to_date: str, coin=DEFAULT_COIN
+    ) -> list[BlockReward]:
+        """Fetch the block rewards of a date range."""
+        url = self._base_url + API_URL_BLOCK_REWARDS.format(coin, from_date, to_date)
+        return await self._get(url, "block_rewards", decode_block_rewards, coin)
+
+    async def get_workers(self, coin=DEFAULT_COIN) -> dict[str, Worker]:
+        """Fetch the workers of the account, keyed by worker name."""
+        url = self._base_url + API_URL_WORKERS.format(coin)
+        return await self._get(url, "workers", decode_workers, coin)
+
+    async def get_payouts(
+        self, from_date: str, to_date: str, coin=DEFAULT_COIN
+    ) -> list[Payout]:
+        """Fetch the payouts of a date range."""
+        url = self._base_url + API_URL_PAYOUTS.format(coin, from_date, to_date)
+        return await self._get(url, "payouts", decode_payouts, coin)
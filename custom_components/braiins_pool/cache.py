@@ -0,0 +1,78 @@
+"""Small in-memory caches shared across Braiins Pool config entries."""
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import timedelta
+from typing import Any
+
+
+def api_key_digest(api_key: str) -> str:
+    """Return the cache key of an API key, so caches never hold the key itself."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class TimedCache:
+    """Cache whose values expire after a time-to-live.
+
+    The TTL is checked on read, so callers with different freshness
+    requirements can share the same cached value.
+    """
+
+    def __init__(self, ttl: timedelta):
+        """Initialize."""
+        self._ttl = ttl.total_seconds()
+        self._values: dict[Hashable, tuple[float, Any]] = {}
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+
+    def get(self, key: Hashable, ttl: timedelta | None = None) -> Any | None:
+        """Return the cached value for key, or None if missing or expired."""
+        cached = self._values.get(key)
+        if cached is None:
+            return None
+        stored_at, value = cached
+        max_age = self._ttl if ttl is None else ttl.total_seconds()
+        if time.monotonic() - stored_at >= max_age:
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value for key."""
+        self._values[key] = (time.monotonic(), value)
+
+    def evict_expired(self) -> None:
+        """Drop the values older than the cache's TTL."""
+        expired_before = time.monotonic() - self._ttl
+        self._values = {
+            key: cached
+            for key, cached in self._values.items()
+            if cached[0] > expired_before
+        }
+
+    def pop(self, key: Hashable) -> Any | None:
+        """Remove and return the value for key, regardless of its age."""
+        cached = self._values.pop(key, None)
+        return None if cached is None else cached[1]
+
+    async def async_get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: timedelta | None = None,
+    ) -> Any:
+        """Return the cached value for key, fetching it if missing or expired.
+
+        Concurrent callers for the same key wait for a single fetch instead of
+        each issuing their own request.
+        """
+        value = self.get(key, ttl)
+        if value is not None:
+            return value
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            value = self.get(key, ttl)
+            if value is None:
+                value = await fetch()
+                self.set(key, value)
+        return value
@@ -0,0 +1,167 @@
+"""Record and replay Braiins Pool API exchanges.
+
+A cassette stores the responses the API client received, one JSON object
+per line (gzip-compressed if the file name ends in ``.gz``): the URL
+relative to the API base URL, the status, the response headers and the
+body. The API key is replaced by a placeholder wherever it appears.
+
+    cassette = Cassette(MODE_RECORD)
+    client = BraiinsPoolApiClient(session, api_key, cassette=cassette)
+    ...
+    cassette.save(path)
+
+    client = BraiinsPoolApiClient(None, "any", cassette=Cassette.load(path))
+
+Replaying needs no network. Responses are returned in recorded order per
+URL; once they are used up the last one is repeated, so a short recording
+can feed any number of polls. A URL that was never recorded fails like an
+unreachable server.
+"""
+
+import gzip
+import json
+from collections import defaultdict
+from typing import Any
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from .const import REDACTED
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+
+class Cassette:
+    """Recorded API responses."""
+
+    def __init__(self, mode: str = MODE_REPLAY, interactions: list[dict] | None = None):
+        """Initialize."""
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.mode = mode
+        self.interactions: list[dict[str, Any]] = interactions or []
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """Load a cassette for replaying. Does blocking I/O."""
+        with _open(path, "rt") as cassette_file:
+            interactions = [json.loads(line) for line in cassette_file if line.strip()]
+        return cls(MODE_REPLAY, interactions)
+
+    def save(self, path: str) -> None:
+        """Write the recorded interactions to a file. Does blocking I/O."""
+        with _open(path, "wt") as cassette_file:
+            for interaction in self.interactions:
+                cassette_file.write(json.dumps(interaction, separators=(",", ":")))
+                cassette_file.write("\n")
+
+    def session(
+        self, session: aiohttp.ClientSession | None, api_key: str, base_url: str
+    ) -> "CassetteSession":
+        """Return a session that records to or replays from this cassette."""
+        return CassetteSession(self, session, api_key, base_url)
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class CassetteResponse:
+    """A recorded response, offering the parts of ClientResponse the client uses."""
+
+    def __init__(self, url: str, status: int, headers: dict[str, str], body: str):
+        """Initialize."""
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self._body = body
+
+    async def text(self) -> str:
+        return self._body
+
+    async def read(self) -> bytes:
+        return self._body.encode()
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                None, (), status=self.status, message="", headers=self.headers
+            )
+
+    async def __aenter__(self) -> "CassetteResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+class _RequestContext:
+    def __init__(self, coro):
+        self._coro = coro
+
+    async def __aenter__(self) -> CassetteResponse:
+        return await self._coro
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+class CassetteSession:
+    """Session wrapper that records to or replays from a cassette."""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        session: aiohttp.ClientSession | None,
+        api_key: str,
+        base_url: str,
+    ):
+        """Initialize."""
+        self._cassette = cassette
+        self._session = session
+        self._api_key = api_key
+        self._base_url = base_url
+        self._replay: dict[str, list[dict]] = defaultdict(list)
+        for interaction in cassette.interactions:
+            self._replay[interaction["url"]].append(interaction)
+
+    def get(self, url: str, **kwargs) -> _RequestContext:
+        """Perform or replay a GET request."""
+        if self._cassette.mode == MODE_RECORD:
+            return _RequestContext(self._record(url, **kwargs))
+        return _RequestContext(self._play(url))
+
+    def _relative(self, url: str) -> str:
+        return url.removeprefix(self._base_url)
+
+    def _redact(self, text: str) -> str:
+        return text.replace(self._api_key, REDACTED) if self._api_key else text
+
+    async def _record(self, url: str, **kwargs) -> CassetteResponse:
+        async with self._session.get(url, **kwargs) as response:
+            body = await response.text()
+            status = response.status
+            headers = {
+                key: self._redact(value) for key, value in response.headers.items()
+            }
+        self._cassette.interactions.append(
+            {
+                "url": self._redact(self._relative(url)),
+                "status": status,
+                "headers": headers,
+                "body": self._redact(body),
+            }
+        )
+        return CassetteResponse(url, status, headers, body)
+
+    async def _play(self, url: str) -> CassetteResponse:
+        recorded = self._replay.get(self._redact(self._relative(url)))
+        if not recorded:
+            raise aiohttp.ClientConnectionError(f"No recorded response for {url}")
+        interaction = recorded.pop(0) if len(recorded) > 1 else recorded[0]
+        return CassetteResponse(
+            url, interaction["status"], interaction["headers"], interaction["body"]
+        )
@@ -1,23 +1,119 @@
 """Config flow for Braiins Pool integration."""
 
+import asyncio
+from collections.abc import Mapping
+from datetime import timedelta
 import logging
+from typing import Any
 
+import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import (
+    SelectSelector,
+    SelectSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
 
-from .const import CONF_API_KEY, DOMAIN, CONF_REWARDS_ACCOUNT_NAME
+from .api import BraiinsPoolApiClient, BraiinsPoolApiException, BraiinsPoolAuthError
+from .cache import TimedCache, api_key_digest
+from .const import (
+    CONF_ACCOUNT_NAME,
+    CONF_ACCOUNTS,
+    CONF_ALIGNED_POLLING,
+    CONF_API_KEY,
+    CONF_COINS,
+    CONF_DEDICATED_SESSION,
+    CONF_ENTRY_TYPE,
+    CONF_FETCH_WORKERS,
+    CONF_HASHRATE_HISTORY,
+    CONF_HEDGE_REQUESTS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_POLL_JITTER_SECS,
+    CONF_POLL_OFFSET_SECS,
+    CONF_POOL_STATS_TTL,
+    CONF_STAGGER_MS,
+    CONF_STALE_GRACE_MINS,
+    DATA_PROFILE_PROBE_CACHE,
+    DEFAULT_COINS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_POLL_JITTER_SECS,
+    DEFAULT_POLL_OFFSET_SECS,
+    DEFAULT_POOL_STATS_TTL_MINS,
+    DEFAULT_STAGGER_MS,
+    DEFAULT_STALE_GRACE_MINS,
+    DOMAIN,
+    CONF_REWARDS_ACCOUNT_NAME,
+    ENTRY_TYPE_FARM,
+    PROFILE_PROBE_TTL_SECS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+FARM_CONCURRENCY_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=1, max=32))
+FARM_STAGGER_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=0, max=10000))
+
+
+def _parse_farm_accounts(api_keys: str) -> list[dict]:
+    """Parse one API key per line, optionally prefixed with "name=".
+
+    Raises ValueError if no key is given or an account name is used twice.
+    """
+    accounts = []
+    for line in api_keys.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        name, _, api_key = line.rpartition("=")
+        name = name.strip() or f"Account {len(accounts) + 1}"
+        accounts.append({CONF_ACCOUNT_NAME: name, CONF_API_KEY: api_key.strip()})
+    names = [account[CONF_ACCOUNT_NAME] for account in accounts]
+    if not accounts or not all(account[CONF_API_KEY] for account in accounts):
+        raise ValueError("No API key given")
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate account name")
+    return accounts
+
 
 class BraiinsPoolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Braiins Pool."""
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize."""
+        # Digests of the keys whose probed profile is cached for this flow
+        # and not yet handed to an entry
+        self._probed_keys: set[str] = set()
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow for this handler."""
+        return BraiinsPoolOptionsFlow()
+
+    @callback
+    def async_remove(self) -> None:
+        """Drop the probed profiles no entry is going to use."""
+        if probe_cache := self.hass.data.get(DATA_PROFILE_PROBE_CACHE):
+            for digest in self._probed_keys:
+                probe_cache.pop(digest)
+        self._probed_keys.clear()
+
+    def _hand_over_probed_profiles(self, api_keys: list[str]) -> None:
+        """Leave the probed profiles of the keys an entry uses for its setup."""
+        self._probed_keys.difference_update(map(api_key_digest, api_keys))
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
+        return self.async_show_menu(step_id="user", menu_options=["account", "farm"])
+
+    async def async_step_account(self, user_input=None):
+        """Handle setting up a single account."""
         if user_input is None:
             return self._show_config_form()
 
@@ -37,10 +133,116 @@ class BraiinsPoolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )  # Or a more specific ID if available from API
             self._abort_if_unique_id_configured()
 
-            return self.async_create_entry(title=rewards_account_name, data=user_input)
+            if error := await self._async_probe_api_key(user_input[CONF_API_KEY]):
+                errors["base"] = error
+            else:
+                self._hand_over_probed_profiles([user_input[CONF_API_KEY]])
+                return self.async_create_entry(
+                    title=rewards_account_name, data=user_input
+                )
 
         return self._show_config_form(user_input, errors)
 
+    async def _async_probe_api_key(self, api_key: str) -> str | None:
+        """Validate an API key with one profile request.
+
+        The parsed profile is cached briefly under a digest of the key, so
+        the first refresh of the new entry does not request it again. Returns
+        an error code, or None if the key is valid.
+        """
+        client = BraiinsPoolApiClient(async_get_clientsession(self.hass), api_key)
+        try:
+            profile = await client.get_user_profile()
+        except BraiinsPoolAuthError:
+            return "invalid_api_key"
+        except (
+            BraiinsPoolApiException,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as err:
+            _LOGGER.debug("Could not validate the Braiins Pool API key: %s", err)
+            return "cannot_connect"
+        probe_cache: TimedCache = self.hass.data.setdefault(
+            DATA_PROFILE_PROBE_CACHE,
+            TimedCache(timedelta(seconds=PROFILE_PROBE_TTL_SECS)),
+        )
+        probe_cache.evict_expired()
+        digest = api_key_digest(api_key)
+        probe_cache.set(digest, profile)
+        self._probed_keys.add(digest)
+        return None
+
+    async def _async_probe_accounts(self, accounts: list[dict]) -> str | None:
+        """Validate the API keys of farm accounts concurrently."""
+        probe_errors = await asyncio.gather(
+            *(self._async_probe_api_key(account[CONF_API_KEY]) for account in accounts)
+        )
+        # An invalid key is reported before an unreachable API
+        for error in ("invalid_api_key", "cannot_connect"):
+            if error in probe_errors:
+                return error
+        return None
+
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]):
+        """Handle an API key the Braiins Pool API no longer accepts."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        """Ask for new API keys and validate them before reloading the entry."""
+        entry = self._get_reauth_entry()
+        farm = entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FARM
+        errors = {}
+        if user_input is not None:
+            if farm:
+                try:
+                    accounts = _parse_farm_accounts(user_input.get(CONF_ACCOUNTS, ""))
+                except ValueError:
+                    errors["base"] = "invalid_farm_api_keys"
+                else:
+                    if error := await self._async_probe_accounts(accounts):
+                        errors["base"] = error
+                    data_updates = {CONF_ACCOUNTS: accounts}
+                    api_keys = [account[CONF_API_KEY] for account in accounts]
+            else:
+                api_key = user_input.get(CONF_API_KEY)
+                if not api_key:
+                    errors["base"] = "invalid_api_key"
+                elif error := await self._async_probe_api_key(api_key):
+                    errors["base"] = error
+                data_updates = {CONF_API_KEY: api_key}
+                api_keys = [api_key]
+
+            if not errors:
+                # A loaded entry is reloaded by its update listener; one whose
+                # setup failed has none. Either way the reloaded entry serves
+                # its first refresh from the profile fetched to validate the
+                # new key.
+                self._hand_over_probed_profiles(api_keys)
+                loaded = entry.state is config_entries.ConfigEntryState.LOADED
+                self.hass.config_entries.async_update_entry(
+                    entry, data={**entry.data, **data_updates}
+                )
+                if not loaded:
+                    self.hass.config_entries.async_schedule_reload(entry.entry_id)
+                return self.async_abort(reason="reauth_successful")
+
+        if farm:
+            data_schema = vol.Schema(
+                {
+                    vol.Required(CONF_ACCOUNTS): TextSelector(
+                        TextSelectorConfig(multiline=True)
+                    )
+                }
+            )
+        else:
+            data_schema = vol.Schema({vol.Required(CONF_API_KEY): str})
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={"name": entry.title},
+        )
+
     def _show_config_form(self, user_input=None, errors=None):
         """Show the configuration form to the user."""
         data_schema = vol.Schema(
@@ -51,8 +253,159 @@ class BraiinsPoolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="account",
+            data_schema=data_schema,
+            errors=errors,
+            last_step=True,
+        )
+
+    async def async_step_farm(self, user_input=None):
+        """Handle setting up a farm of accounts refreshed under one schedule."""
+        errors = {}
+        if user_input is not None:
+            farm_name = user_input.get(CONF_REWARDS_ACCOUNT_NAME)
+            try:
+                accounts = _parse_farm_accounts(user_input.get(CONF_ACCOUNTS, ""))
+            except ValueError:
+                errors["base"] = "invalid_farm_api_keys"
+            if not farm_name:
+                errors["base"] = "invalid_rewards_account_name"
+
+            if not errors:
+                await self.async_set_unique_id(f"{ENTRY_TYPE_FARM}_{farm_name}")
+                self._abort_if_unique_id_configured()
+
+                if error := await self._async_probe_accounts(accounts):
+                    errors["base"] = error
+
+            if not errors:
+                self._hand_over_probed_profiles(
+                    [account[CONF_API_KEY] for account in accounts]
+                )
+                return self.async_create_entry(
+                    title=farm_name,
+                    data={
+                        CONF_ENTRY_TYPE: ENTRY_TYPE_FARM,
+                        CONF_REWARDS_ACCOUNT_NAME: farm_name,
+                        CONF_ACCOUNTS: accounts,
+                    },
+                    options={
+                        CONF_MAX_CONCURRENT_REQUESTS: user_input[
+                            CONF_MAX_CONCURRENT_REQUESTS
+                        ],
+                        CONF_STAGGER_MS: user_input[CONF_STAGGER_MS],
+                    },
+                )
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_REWARDS_ACCOUNT_NAME): str,
+                vol.Required(CONF_ACCOUNTS): TextSelector(
+                    TextSelectorConfig(multiline=True)
+                ),
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_REQUESTS,
+                    default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+                ): FARM_CONCURRENCY_SCHEMA,
+                vol.Optional(
+                    CONF_STAGGER_MS, default=DEFAULT_STAGGER_MS
+                ): FARM_STAGGER_SCHEMA,
+            }
+        )
+        return self.async_show_form(
+            step_id="farm",
             data_schema=data_schema,
             errors=errors,
             last_step=True,
         )
+
+
+class BraiinsPoolOptionsFlow(config_entries.OptionsFlow):
+    """Handle Braiins Pool options."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        errors = {}
+        if user_input is not None:
+            user_input[CONF_COINS] = [
+                coin.strip().lower() for coin in user_input[CONF_COINS] if coin.strip()
+            ]
+            if user_input[CONF_COINS]:
+                return self.async_create_entry(data=user_input)
+            errors["base"] = "invalid_coins"
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_COINS, default=options.get(CONF_COINS, DEFAULT_COINS)
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        options=DEFAULT_COINS, multiple=True, custom_value=True
+                    )
+                ),
+                vol.Optional(
+                    CONF_POOL_STATS_TTL,
+                    default=options.get(
+                        CONF_POOL_STATS_TTL, DEFAULT_POOL_STATS_TTL_MINS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_FETCH_WORKERS,
+                    default=options.get(CONF_FETCH_WORKERS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_HASHRATE_HISTORY,
+                    default=options.get(CONF_HASHRATE_HISTORY, False),
+                ): bool,
+                vol.Optional(
+                    CONF_HEDGE_REQUESTS,
+                    default=options.get(CONF_HEDGE_REQUESTS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_DEDICATED_SESSION,
+                    default=options.get(CONF_DEDICATED_SESSION, False),
+                ): bool,
+                vol.Optional(
+                    CONF_STALE_GRACE_MINS,
+                    default=options.get(
+                        CONF_STALE_GRACE_MINS, DEFAULT_STALE_GRACE_MINS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                vol.Optional(
+                    CONF_ALIGNED_POLLING,
+                    default=options.get(CONF_ALIGNED_POLLING, False),
+                ): bool,
+                vol.Optional(
+                    CONF_POLL_OFFSET_SECS,
+                    default=options.get(
+                        CONF_POLL_OFFSET_SECS, DEFAULT_POLL_OFFSET_SECS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=59)),
+                vol.Optional(
+                    CONF_POLL_JITTER_SECS,
+                    default=options.get(
+                        CONF_POLL_JITTER_SECS, DEFAULT_POLL_JITTER_SECS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=30)),
+            }
+        )
+        if self.config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FARM:
+            data_schema = data_schema.extend(
+                {
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): FARM_CONCURRENCY_SCHEMA,
+                    vol.Optional(
+                        CONF_STAGGER_MS,
+                        default=options.get(CONF_STAGGER_MS, DEFAULT_STAGGER_MS),
+                    ): FARM_STAGGER_SCHEMA,
+                }
+            )
+        return self.async_show_form(
+            step_id="init", data_schema=data_schema, errors=errors
+        )
@@ -3,6 +3,71 @@
 DOMAIN = "braiins_pool"
 CONF_API_KEY = "api_key"
 CONF_REWARDS_ACCOUNT_NAME = "rewards_account_name"
+CONF_POOL_STATS_TTL = "pool_stats_ttl"
+CONF_COINS = "coins"
+CONF_ENTRY_TYPE = "entry_type"
+CONF_ACCOUNTS = "accounts"
+CONF_ACCOUNT_NAME = "name"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_STAGGER_MS = "stagger_ms"
+CONF_ALIGNED_POLLING = "aligned_polling"
+CONF_POLL_OFFSET_SECS = "poll_offset_secs"
+CONF_POLL_JITTER_SECS = "poll_jitter_secs"
+CONF_FETCH_WORKERS = "fetch_workers"
+CONF_HASHRATE_HISTORY = "hashrate_history"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+CONF_DEDICATED_SESSION = "dedicated_session"
+CONF_STALE_GRACE_MINS = "stale_grace_mins"
+
+ENTRY_TYPE_ACCOUNT = "account"
+ENTRY_TYPE_FARM = "farm"
+
 DEFAULT_SCAN_INTERVAL_MINS = 1
+DEFAULT_POOL_STATS_TTL_MINS = 10
+DEFAULT_COINS = ["btc"]
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_STAGGER_MS = 250
+DEFAULT_POLL_OFFSET_SECS = 15
+DEFAULT_POLL_JITTER_SECS = 10
+# 0 disables serving the last good data after a failed update
+DEFAULT_STALE_GRACE_MINS = 0
+
+# today_reward resets at UTC midnight; refresh this many seconds before and
+# after it to capture the day's final figures and pick up the reset promptly.
+DAY_ROLLOVER_REFRESH_SECS = 30
+# How long after UTC midnight an unchanged today_reward is still considered
+# to belong to the previous day because Braiins has not reset it yet.
+DAY_ROLLOVER_GRACE_MINS = 60
+
+# On-demand refreshes requested within this many seconds share one refresh,
+# and refreshes requested through the refresh service start at least this
+# many seconds apart.
+REFRESH_COALESCE_SECS = 2
+REFRESH_MIN_SPACING_SECS = 30
+
+# Keys for integration-wide objects shared by all config entries in hass.data
+DATA_POOL_STATS_CACHE = f"{DOMAIN}_pool_stats_cache"
+DATA_PROFILE_PROBE_CACHE = f"{DOMAIN}_profile_probe_cache"
+
+# How long the profile fetched to validate an API key in the config flow is
+# kept for the first refresh of the new entry.
+PROFILE_PROBE_TTL_SECS = 120
+
+# Directory of the hash rate history, inside the configuration directory
+HISTORY_DIR = f"{DOMAIN}_history"
+
+# Choices of the export_history and profile_updates services. They live here
+# so registering the services does not import export.py and profiling.py,
+# which are only loaded once a service is called.
+EXPORT_PAYOUTS = "payouts"
+EXPORT_BLOCK_REWARDS = "block_rewards"
+EXPORT_DAILY_REWARDS = "daily_rewards"
+EXPORT_TYPES = (EXPORT_PAYOUTS, EXPORT_BLOCK_REWARDS, EXPORT_DAILY_REWARDS)
+MODE_CPROFILE = "cprofile"
+MODE_TRACEMALLOC = "tracemalloc"
+PROFILE_MODES = (MODE_CPROFILE, MODE_TRACEMALLOC)
+
+# Replaces the API key in traces and cassettes
+REDACTED = "**REDACTED**"
 
 SATOSHIS_PER_BTC = 100000000
@@ -2,25 +2,265 @@
 
 import aiohttp
 import asyncio
-from datetime import timedelta, datetime, timezone
+from collections.abc import Awaitable, Callable, Coroutine
+from datetime import time, timedelta, datetime, timezone
+from typing import Any
 from decimal import Decimal
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_utc_time_change
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 import logging
 
-from .api import BraiinsPoolApiClient
+from .api import (
+    BraiinsPoolApiClient,
+    BraiinsPoolApiException,
+    BraiinsPoolAuthError,
+    DEFAULT_COIN,
+)
+from .cache import TimedCache
+from .demand import (
+    DATA_GROUP_POOL_STATS,
+    DATA_GROUP_PROFILE,
+    DATA_GROUP_WORKERS,
+    DataDemand,
+)
+from .metrics import ApiMetrics
+from .scheduler import RefreshCoalescer, next_aligned_time
+from .session import PREWARM_LEAD_SECS
 from .const import (
     DOMAIN,
     CONF_API_KEY,
+    DATA_POOL_STATS_CACHE,
+    DAY_ROLLOVER_GRACE_MINS,
+    DAY_ROLLOVER_REFRESH_SECS,
+    DEFAULT_POOL_STATS_TTL_MINS,
+    REFRESH_COALESCE_SECS,
+    REFRESH_MIN_SPACING_SECS,
     SATOSHIS_PER_BTC,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 
-# Import the actual API client
-class BraiinsDataUpdateCoordinator(DataUpdateCoordinator[dict]):
+class BraiinsBaseUpdateCoordinator(DataUpdateCoordinator[dict]):
+    """Base coordinator that can align its polls to wall-clock boundaries.
+
+    By default polls are scheduled relative to when Home Assistant started,
+    like any DataUpdateCoordinator. With aligned polling enabled, every poll
+    lands a fixed offset after a multiple of the update interval, i.e. just
+    after the pool has recomputed its figures instead of just before.
+    """
+
+    poll_offset: float | None = None
+    # Which data groups have a consumer; shared by a farm and its accounts
+    demand: DataDemand
+    # Opens the connections of the next poll ahead of time, if set
+    prewarm: Callable[[], Coroutine[Any, Any, None]] | None = None
+    _unsub_prewarm: CALLBACK_TYPE | None = None
+    # How long the last good data is served after updates start failing;
+    # None fails the update right away.
+    stale_grace: timedelta | None = None
+    # When the current data was fetched, and whether it is served stale
+    data_time: datetime | None = None
+    stale: bool = False
+    _refresh_coalescer: RefreshCoalescer | None = None
+    _closed: bool = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the coordinator."""
+        super().__init__(*args, **kwargs)
+        self.demand = DataDemand()
+
+    def set_aligned_polling(self, offset: timedelta) -> None:
+        """Poll offset after every multiple of the update interval."""
+        self.poll_offset = offset.total_seconds()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule a refresh, aligned to the wall clock if enabled."""
+        if self.poll_offset is None or self.update_interval is None:
+            super()._schedule_refresh()
+            if self.update_interval is not None:
+                self._schedule_prewarm(self.update_interval.total_seconds())
+            return
+
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        self._async_unsub_refresh()
+        now = dt_util.utcnow().timestamp()
+        next_refresh = next_aligned_time(
+            now, self.update_interval.total_seconds(), self.poll_offset
+        )
+        loop = self.hass.loop
+        self._unsub_refresh = loop.call_at(
+            loop.time() + next_refresh - now, self._handle_aligned_refresh
+        ).cancel
+        self._schedule_prewarm(next_refresh - now)
+
+    @callback
+    def _schedule_prewarm(self, seconds_to_refresh: float) -> None:
+        """Pre-warm PREWARM_LEAD_SECS before the refresh just scheduled."""
+        self._async_unsub_prewarm()
+        if self.prewarm is None or self._unsub_refresh is None:
+            return
+        self._unsub_prewarm = self.hass.loop.call_later(
+            max(seconds_to_refresh - PREWARM_LEAD_SECS, 0), self._handle_prewarm
+        ).cancel
+
+    @callback
+    def _handle_prewarm(self) -> None:
+        self._unsub_prewarm = None
+        self.hass.async_create_background_task(
+            self.prewarm(), name=f"{self.name} - prewarm"
+        )
+
+    @callback
+    def _async_unsub_prewarm(self) -> None:
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+
+    async def async_request_coalesced_refresh(self) -> None:
+        """Refresh on demand, sharing the refresh with concurrent requests.
+
+        Unlike async_request_refresh, a burst of requests causes one refresh
+        after a short window, and these refreshes are spaced out from each
+        other and from the last fetch of a regular poll.
+        """
+        if self._refresh_coalescer is None:
+            self._refresh_coalescer = RefreshCoalescer(
+                self.async_refresh,
+                REFRESH_COALESCE_SECS,
+                REFRESH_MIN_SPACING_SECS,
+                self._seconds_since_fetch,
+            )
+        await self._refresh_coalescer.async_request()
+
+    def _seconds_since_fetch(self) -> float | None:
+        """Return how long ago the current data was fetched, if it was."""
+        if self.data_time is None:
+            return None
+        return (dt_util.utcnow() - self.data_time).total_seconds()
+
+    @callback
+    def _unschedule_refresh(self) -> None:
+        """Unschedule the next refresh and its pre-warm."""
+        super()._unschedule_refresh()
+        self._async_unsub_prewarm()
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call, ignore new runs and release resources.
+
+        Runs once: Home Assistant shuts down every coordinator created during
+        entry setup when the entry unloads, farm accounts included, and a
+        farm also shuts down its accounts.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        await super().async_shutdown()
+        self._async_unsub_prewarm()
+        if self._refresh_coalescer is not None:
+            self._refresh_coalescer.cancel()
+        await self._async_release()
+
+    async def _async_release(self) -> None:
+        """Release what the coordinator holds once it is shut down."""
+
+    @callback
+    def async_track_day_rollover(self) -> CALLBACK_TYPE:
+        """Refresh just before and just after every UTC midnight.
+
+        The first refresh captures the final figures of the ending day, the
+        second picks up the reset of today_reward without waiting for the
+        next regular poll. Returns a callback that stops the tracking.
+        """
+        unsubs = [
+            async_track_utc_time_change(
+                self.hass,
+                self._async_handle_day_boundary,
+                hour=23,
+                minute=59,
+                second=60 - DAY_ROLLOVER_REFRESH_SECS,
+            ),
+            async_track_utc_time_change(
+                self.hass,
+                self._async_handle_day_boundary,
+                hour=0,
+                minute=0,
+                second=DAY_ROLLOVER_REFRESH_SECS,
+            ),
+        ]
+
+        @callback
+        def _unsub() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return _unsub
+
+    def _fresh(self, data: dict) -> dict:
+        """Record that data was just fetched and return it."""
+        self.data_time = dt_util.utcnow()
+        self.stale = False
+        return data
+
+    def _stale_or_raise(self, message: str, cause: Exception | None = None) -> dict:
+        """Return the last good data while within the grace period.
+
+        Serving it keeps the update successful, so entities stay available
+        and the next scheduled poll revalidates in the background. Outside
+        the grace period, UpdateFailed is raised with the given message.
+        """
+        if (
+            self.stale_grace is None
+            or self.data is None
+            or self.data_time is None
+            or dt_util.utcnow() - self.data_time > self.stale_grace
+        ):
+            raise UpdateFailed(message) from cause
+        _LOGGER.warning(
+            "%s; serving the data fetched at %s until it is %s old",
+            message,
+            self.data_time.isoformat(),
+            self.stale_grace,
+        )
+        self.stale = True
+        return self.data
+
+    @property
+    def auth_failed(self) -> bool:
+        """Return whether polling stopped because the API rejected the key."""
+        return isinstance(self.last_exception, ConfigEntryAuthFailed)
+
+    async def _async_handle_day_boundary(self, _now: datetime) -> None:
+        """Refresh around the UTC day boundary."""
+        if not self.auth_failed:
+            await self.async_refresh()
+
+    @callback
+    def _handle_aligned_refresh(self) -> None:
+        """Handle an aligned refresh occurrence."""
+        if self.config_entry:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._handle_refresh_interval(),
+                name=f"{self.name} - {self.config_entry.title} - refresh",
+                eager_start=True,
+            )
+        else:
+            self.hass.async_create_background_task(
+                self._handle_refresh_interval(),
+                name=f"{self.name} - refresh",
+                eager_start=True,
+            )
+
+
+class BraiinsDataUpdateCoordinator(BraiinsBaseUpdateCoordinator):
     """Coordinate updates from the Braiins Pool API."""
 
     def __init__(
@@ -28,6 +268,9 @@ class BraiinsDataUpdateCoordinator(DataUpdateCoordinator[dict]):
         hass: HomeAssistant,
         api_client: BraiinsPoolApiClient,
         update_interval: timedelta,
+        pool_stats_ttl: timedelta = timedelta(minutes=DEFAULT_POOL_STATS_TTL_MINS),
+        coins: list[str] | None = None,
+        fetch_workers: bool = False,
     ):
         """Initialize the coordinator."""
         super().__init__(
@@ -37,63 +280,390 @@ class BraiinsDataUpdateCoordinator(DataUpdateCoordinator[dict]):
             update_interval=update_interval,
         )
         self.api_client = api_client
+        # The client records its requests into the same metrics as the
+        # coordinator records its cache lookups.
+        self.metrics = ApiMetrics()
+        api_client.metrics = self.metrics
+        self.coins = coins or [DEFAULT_COIN]
+        self.fetch_workers = fetch_workers
+        # HashrateHistory of the account, if the entry keeps one
+        self.history = None
+        # Profiles already fetched elsewhere, served instead of the next request
+        self._seeded_profiles: dict[str, dict] = {}
+        self.pool_stats_ttl = pool_stats_ttl
+        # Pool statistics are identical for every account, so all entries share
+        # one cache and only the first entry to find it expired hits the API.
+        self.pool_stats_cache: TimedCache = hass.data.setdefault(
+            DATA_POOL_STATS_CACHE, TimedCache(pool_stats_ttl)
+        )
 
-    async def _async_update_data(self) -> dict:
-        """Fetch data from the API."""
-        _LOGGER.debug("Fetching and processing data for Braiins Pool integration.")
-        processed_data: dict = {}
-        today = datetime.now(timezone.utc).date()
+    async def _async_get_pool_stats(self, coin: str) -> dict:
+        """Return pool-wide statistics from the shared cache.
 
-        try:
-            user_profile_data = await self.api_client.get_user_profile()
-            # user_profile_data is already processed by the API client
-            # and contains Decimal types for monetary values.
+        Pool statistics only add context to the account figures, so a failure
+        keeps the previous values instead of failing the whole update.
+        """
+        fetched = False
+
+        async def fetch() -> dict:
+            nonlocal fetched
+            fetched = True
+            return await self.api_client.get_account_stats(coin)
 
-            processed_data["user_profile_data"] = (
-                user_profile_data  # Store raw data for debugging or future use
+        try:
+            return await self.pool_stats_cache.async_get_or_fetch(
+                coin, fetch, self.pool_stats_ttl
             )
+        except BraiinsPoolAuthError:
+            # A rejected key has to reach _async_update_data to start reauth
+            raise
+        except (
+            BraiinsPoolApiException,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as err:
+            _LOGGER.warning("Error fetching Braiins Pool %s statistics: %s", coin, err)
+            return self._previous_coin_data(coin).get("pool_stats", {})
+        finally:
+            cache_metrics = self.metrics.cache("pool_stats")
+            if fetched:
+                cache_metrics.misses += 1
+            else:
+                cache_metrics.hits += 1
+
+    def seed_profile(self, coin: str, profile: dict) -> None:
+        """Serve the next profile request of a coin from an already parsed profile.
+
+        The config flow fetches the profile to validate the API key; seeding
+        it saves the first refresh of the new entry the same request.
+        """
+        self._seeded_profiles[coin] = profile
+
+    def _profile_request(self, coin: str) -> Awaitable[dict]:
+        """Return the awaitable processed profile of a coin.
+
+        The API request is issued right away; a seeded profile is returned
+        through a zero-length sleep instead.
+        """
+        if (profile := self._seeded_profiles.pop(coin, None)) is None:
+            return self.api_client.get_user_profile(coin)
+        self.metrics.cache("profile").hits += 1
+        return asyncio.sleep(0, profile)
+
+    async def _async_get_workers(self, coin: str) -> dict:
+        """Return the per-worker data of a coin, keyed by worker name.
+
+        Like pool statistics, a failure keeps the previous values.
+        """
+        try:
+            return await self.api_client.get_workers(coin)
+        except BraiinsPoolAuthError:
+            raise
+        except (
+            BraiinsPoolApiException,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as err:
+            _LOGGER.warning("Error fetching Braiins Pool %s workers: %s", coin, err)
+            return self._previous_coin_data(coin).get("workers", {})
+
+    async def _async_release(self) -> None:
+        """Cancel requests in flight and flush the history."""
+        await self.api_client.async_close()
+        if self.history is not None:
+            await self.history.async_flush()
 
-            # Directly use the values, assuming api_client returns them with correct types or defaults
-            # The .get() with a default is a fallback, though api_client should handle defaults.
-            current_balance = user_profile_data.get("current_balance", Decimal("0"))
-            today_reward = user_profile_data.get("today_reward", Decimal("0"))
-            all_time_reward = user_profile_data.get("all_time_reward", Decimal("0"))
-            ok_workers = user_profile_data.get("ok_workers", 0)  # int
-            pool_5m_hash_rate = user_profile_data.get("pool_5m_hash_rate", 0.0)  # float
+    def _previous_coin_data(self, coin: str) -> dict:
+        """Return the data of the last successful update for a coin."""
+        return ((self.data or {}).get("coins") or {}).get(coin, {})
 
-            processed_data["current_balance"] = current_balance
-            processed_data["today_reward"] = today_reward
-            processed_data["all_time_reward"] = all_time_reward
-            processed_data["ok_workers"] = ok_workers
-            processed_data["pool_5m_hash_rate"] = pool_5m_hash_rate
+    async def _async_fetch_coin(self, coin: str) -> dict:
+        """Fetch and process all endpoints of a single coin concurrently.
 
+        Endpoints whose data group has no consumer are not requested; their
+        values are left out rather than reported as zero.
+        """
+        wants = self.demand.wants
+        profile_wanted = wants(DATA_GROUP_PROFILE)
+        requests = [
+            (self._profile_request(coin) if profile_wanted else asyncio.sleep(0, {})),
+            (
+                self._async_get_pool_stats(coin)
+                if wants(DATA_GROUP_POOL_STATS)
+                else asyncio.sleep(0, {})
+            ),
+        ]
+        if self.fetch_workers and wants(DATA_GROUP_WORKERS):
+            requests.append(self._async_get_workers(coin))
+        user_profile_data, pool_stats, *workers = await asyncio.gather(*requests)
+        # user_profile_data is already processed by the API client
+        # and contains Decimal types for monetary values.
+        coin_data: dict = {
+            "user_profile_data": user_profile_data,  # Store raw data for debugging or future use
+            "pool_stats": pool_stats,
+        }
+        if workers:
+            coin_data["workers"] = workers[0]
+        if not profile_wanted:
+            # Zeros would read as a real balance and reward of nothing
+            return coin_data
+
+        # Directly use the values, assuming api_client returns them with correct types or defaults
+        # The .get() with a default is a fallback, though api_client should handle defaults.
+        current_balance = user_profile_data.get("current_balance", Decimal("0"))
+        today_reward = user_profile_data.get("today_reward", Decimal("0"))
+        all_time_reward = user_profile_data.get("all_time_reward", Decimal("0"))
+        ok_workers = user_profile_data.get("ok_workers", 0)  # int
+        pool_5m_hash_rate = user_profile_data.get("pool_5m_hash_rate", 0.0)  # float
+
+        coin_data["current_balance"] = current_balance
+        coin_data["today_reward"] = today_reward
+        coin_data["all_time_reward"] = all_time_reward
+        coin_data["ok_workers"] = ok_workers
+        coin_data["pool_5m_hash_rate"] = pool_5m_hash_rate
+
+        if coin == DEFAULT_COIN:
             # Calculate satoshi values
-            processed_data["current_balance_satoshi"] = int(
+            coin_data["current_balance_satoshi"] = int(
                 current_balance * SATOSHIS_PER_BTC
             )
-            processed_data["today_reward_satoshi"] = int(
-                today_reward * SATOSHIS_PER_BTC
-            )
-            processed_data["all_time_reward_satoshi"] = int(
+            coin_data["today_reward_satoshi"] = int(today_reward * SATOSHIS_PER_BTC)
+            coin_data["all_time_reward_satoshi"] = int(
                 all_time_reward * SATOSHIS_PER_BTC
             )
+        return coin_data
+
+    def _apply_day_rollover(self, coin: str, coin_data: dict, now: datetime) -> None:
+        """Track the UTC day that today_reward belongs to.
+
+        Sets ``day_start`` (the last reset of the daily sensors) and, once the
+        day has rolled over, keeps the final figures of the previous day as a
+        small precomputed record instead of deriving them from history.
+        """
+        previous = self._previous_coin_data(coin)
+        day_start = datetime.combine(now.date(), time.min, timezone.utc)
+        previous_day_start = previous.get("day_start")
+        for key in ("previous_day", "previous_day_reward"):
+            if key in previous:
+                coin_data[key] = previous[key]
+
+        if previous_day_start is None or previous_day_start == day_start:
+            coin_data["day_start"] = day_start
+            return
+
+        final_reward = previous.get("today_reward")
+        if (
+            now - day_start < timedelta(minutes=DAY_ROLLOVER_GRACE_MINS)
+            and final_reward
+            and coin_data.get("today_reward", 0) >= final_reward
+        ):
+            # Braiins has not reset today_reward yet. Keep attributing it to
+            # the previous day rather than counting it twice.
+            coin_data["day_start"] = previous_day_start
+            return
+
+        coin_data["day_start"] = day_start
+        coin_data["previous_day"] = previous_day_start.date()
+        if final_reward is None:
+            # The profile was not fetched on that day, so its reward is unknown
+            coin_data.pop("previous_day_reward", None)
+        else:
+            coin_data["previous_day_reward"] = final_reward
+        _LOGGER.debug(
+            "Braiins Pool %s day %s closed with a reward of %s",
+            coin,
+            previous_day_start.date(),
+            final_reward,
+        )
+
+    async def _async_update_data(self) -> dict:
+        """Fetch data from the API."""
+        _LOGGER.debug("Fetching and processing data for Braiins Pool integration.")
+        now = dt_util.utcnow()
+
+        # All coins are fetched at the same time, so adding a coin does not
+        # add to the update latency.
+        results = await asyncio.gather(
+            *(self._async_fetch_coin(coin) for coin in self.coins),
+            return_exceptions=True,
+        )
+
+        coins_data: dict = {}
+        errors: dict = {}
+        for coin, result in zip(self.coins, results):
+            if isinstance(result, asyncio.CancelledError):
+                # The API client was closed while the entry unloads
+                raise result
+            if isinstance(result, BraiinsPoolAuthError):
+                # Polling stops until a new key is entered in the reauth flow
+                self._async_unsub_prewarm()
+                raise ConfigEntryAuthFailed(
+                    f"Braiins Pool API rejected the API key: {result}"
+                ) from result
+            if isinstance(result, Exception):
+                errors[coin] = result
+                # Keep the last known values of a failing coin while the
+                # other coins keep updating.
+                if previous := self._previous_coin_data(coin):
+                    coins_data[coin] = previous
+            else:
+                self._apply_day_rollover(coin, result, now)
+                coins_data[coin] = result
 
-            return processed_data
-        except Exception as err:  # Catch any exception during fetching or processing
+        if len(errors) == len(self.coins):
+            err = next(iter(errors.values()))
             _LOGGER.error(
                 "Error fetching or processing data from Braiins Pool API: %s", err
             )
-            # Set default values using appropriate types
-            processed_data["current_balance"] = Decimal("0")
-            processed_data["today_reward"] = Decimal("0")
-            processed_data["all_time_reward"] = Decimal("0")
-            processed_data["ok_workers"] = 0
-            processed_data["current_balance_satoshi"] = 0
-            processed_data["today_reward_satoshi"] = 0
-            processed_data["all_time_reward_satoshi"] = 0
-            processed_data["pool_5m_hash_rate"] = 0.0
-            # Store the raw (empty or partial) data if an error occurred after fetching user_profile_data
-            processed_data["user_profile_data"] = (
-                user_profile_data if "user_profile_data" in locals() else {}
+            return self._stale_or_raise(f"Error updating data: {err}", err)
+        for coin, err in errors.items():
+            _LOGGER.warning(
+                "Error fetching or processing Braiins Pool %s data: %s", coin, err
+            )
+
+        # The default coin's values stay at the top level for the original,
+        # coin-less sensors.
+        processed_data: dict = dict(coins_data.get(DEFAULT_COIN, {}))
+        processed_data["coins"] = coins_data
+        return self._fresh(processed_data)
+
+
+# Per-coin values that are added up across the accounts of a farm
+FARM_SUMMED_KEYS = (
+    "current_balance",
+    "today_reward",
+    "all_time_reward",
+    "ok_workers",
+    "pool_5m_hash_rate",
+    "current_balance_satoshi",
+    "today_reward_satoshi",
+    "all_time_reward_satoshi",
+    "previous_day_reward",
+)
+
+
+class BraiinsFarmUpdateCoordinator(BraiinsBaseUpdateCoordinator):
+    """Coordinate updates of many Braiins Pool accounts under one schedule.
+
+    Every account keeps its own BraiinsDataUpdateCoordinator, but without an
+    update interval of its own: the farm refreshes them all in one cycle,
+    with at most ``max_concurrent`` accounts in flight and consecutive
+    account refreshes started at least ``stagger`` apart.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        accounts: dict[str, BraiinsDataUpdateCoordinator],
+        update_interval: timedelta,
+        max_concurrent: int,
+        stagger: timedelta,
+        coins: list[str] | None = None,
+    ):
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_farm",
+            update_interval=update_interval,
+        )
+        self.accounts = accounts
+        # The farm's entities decide what its accounts fetch
+        for account in accounts.values():
+            account.demand = self.demand
+        self.coins = coins or [DEFAULT_COIN]
+        self.max_concurrent = max_concurrent
+        self.stagger = stagger.total_seconds()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._start_lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    @property
+    def metrics(self) -> ApiMetrics:
+        """Return the request and cache metrics summed over all accounts."""
+        return ApiMetrics.combine(
+            [account.metrics for account in self.accounts.values()]
+        )
+
+    async def _async_release(self) -> None:
+        """Shut down every account."""
+        await asyncio.gather(
+            *(account.async_shutdown() for account in self.accounts.values())
+        )
+
+    async def _async_refresh_account(
+        self, account: BraiinsDataUpdateCoordinator
+    ) -> None:
+        """Refresh one account within the concurrency and stagger limits."""
+        async with self._semaphore:
+            async with self._start_lock:
+                loop = asyncio.get_running_loop()
+                delay = self._next_start - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._next_start = loop.time() + self.stagger
+            await account.async_refresh()
+
+    async def _async_update_data(self) -> dict:
+        """Refresh all accounts and aggregate their data.
+
+        Accounts whose key was rejected are no longer refreshed; their first
+        rejection already started the reauth flow of the farm entry.
+        """
+        _LOGGER.debug("Refreshing %s Braiins Pool farm accounts.", len(self.accounts))
+        await asyncio.gather(
+            *(
+                self._async_refresh_account(account)
+                for account in self.accounts.values()
+                if not account.auth_failed
+            )
+        )
+        if all(account.auth_failed for account in self.accounts.values()):
+            self._async_unsub_prewarm()
+            raise ConfigEntryAuthFailed(
+                "Braiins Pool API rejected the API keys of all farm accounts"
             )
-            raise UpdateFailed(f"Error updating data: {err}")
+
+        accounts_ok = sum(
+            account.last_update_success for account in self.accounts.values()
+        )
+        if not accounts_ok:
+            return self._stale_or_raise("Error updating data: all farm accounts failed")
+
+        # Accounts that failed this cycle still hold their last good data,
+        # which keeps the farm totals from dipping on a single account error.
+        accounts_data = {
+            name: account.data
+            for name, account in self.accounts.items()
+            if account.data is not None
+        }
+        coins_data = {
+            coin: self._aggregate_coin(coin, accounts_data.values())
+            for coin in self.coins
+        }
+
+        processed_data: dict = dict(coins_data.get(DEFAULT_COIN, {}))
+        processed_data["coins"] = coins_data
+        processed_data["accounts"] = accounts_data
+        processed_data["accounts_ok"] = accounts_ok
+        processed_data["accounts_total"] = len(self.accounts)
+        return self._fresh(processed_data)
+
+    @staticmethod
+    def _aggregate_coin(coin: str, accounts_data) -> dict:
+        """Add up the per-coin values of all accounts."""
+        totals: dict = {}
+        for account_data in accounts_data:
+            coin_data = (account_data.get("coins") or {}).get(coin)
+            if not coin_data:
+                continue
+            for key in FARM_SUMMED_KEYS:
+                if coin_data.get(key) is not None:
+                    totals[key] = totals.get(key, 0) + coin_data[key]
+            # Pool statistics and the UTC day are the same for every account.
+            if coin_data.get("pool_stats"):
+                totals.setdefault("pool_stats", coin_data["pool_stats"])
+            for key in ("day_start", "previous_day"):
+                if key in coin_data:
+                    totals[key] = max(totals.get(key, coin_data[key]), coin_data[key])
+        return totals
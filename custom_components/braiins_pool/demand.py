@@ -0,0 +1,60 @@
+"""Track which data of a Braiins Pool entry is actually consumed.
+
+Every endpoint the coordinator polls feeds one data group. Entities hold
+a demand for the group they show while they are enabled, and other
+consumers, such as the hash rate history, hold one while they run.
+Pull-based consumers like the metrics endpoint cannot hold a demand, so
+each of their reads leases the groups for a while instead.
+"""
+
+from collections import Counter
+from collections.abc import Callable
+import time
+
+DATA_GROUP_PROFILE = "profile"
+DATA_GROUP_POOL_STATS = "pool_stats"
+DATA_GROUP_WORKERS = "workers"
+DATA_GROUPS = (DATA_GROUP_PROFILE, DATA_GROUP_POOL_STATS, DATA_GROUP_WORKERS)
+
+
+class DataDemand:
+    """Demand for the data groups of one entry.
+
+    Until tracking starts, e.g. during the first refresh before any entity
+    exists, every group is wanted.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.tracking = False
+        self._holders: Counter[str] = Counter()
+        self._leases: dict[str, float] = {}
+
+    def start(self) -> None:
+        """Fetch only the groups with a consumer from now on."""
+        self.tracking = True
+
+    def add(self, group: str) -> Callable[[], None]:
+        """Hold a demand for a group; returns a callback that releases it."""
+        self._holders[group] += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self._holders[group] -= 1
+
+        return release
+
+    def lease(self, groups: tuple[str, ...], seconds: float) -> None:
+        """Want groups for the next seconds."""
+        until = time.monotonic() + seconds
+        for group in groups:
+            self._leases[group] = max(self._leases.get(group, 0.0), until)
+
+    def wants(self, group: str) -> bool:
+        """Return whether a group has a consumer."""
+        if not self.tracking or self._holders[group] > 0:
+            return True
+        return self._leases.get(group, 0.0) > time.monotonic()
@@ -0,0 +1,45 @@
+"""Diagnostics support for the Braiins Pool integration."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_KEY, DOMAIN
+from .coordinator import BraiinsFarmUpdateCoordinator
+
+TO_REDACT = {CONF_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    diagnostics = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "coins": coordinator.coins,
+        },
+        "metrics": coordinator.metrics.as_dict(),
+    }
+    if isinstance(coordinator, BraiinsFarmUpdateCoordinator):
+        # Farm entries also list the metrics of every account.
+        diagnostics["accounts"] = {
+            name: {
+                "last_update_success": account.last_update_success,
+                "metrics": account.metrics.as_dict(),
+                "trace": account.api_client.tracer.dump(),
+            }
+            for name, account in coordinator.accounts.items()
+        }
+    else:
+        # Recorded while debug logging is enabled for the integration
+        diagnostics["trace"] = coordinator.api_client.tracer.dump()
+    return diagnostics
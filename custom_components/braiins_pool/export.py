@@ -0,0 +1,167 @@
+"""Export of payout and reward history to CSV files.
+
+The Braiins Pool API returns each history endpoint as a single JSON
+document, so a long range is requested in windows of a few days. The records
+of every window are written out and dropped before the next window is
+requested, which keeps memory flat however long the exported range is.
+"""
+
+import csv
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+import logging
+import os
+from typing import IO
+
+from homeassistant.core import HomeAssistant
+
+from .api import BraiinsPoolApiClient
+from .const import EXPORT_BLOCK_REWARDS, EXPORT_DAILY_REWARDS, EXPORT_PAYOUTS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Days requested per API call of the ranged endpoints
+EXPORT_CHUNK_DAYS = 7
+
+# Columns of each export type, after the account and coin columns
+EXPORT_FIELDS = {
+    EXPORT_PAYOUTS: (
+        "requested_at",
+        "resolved_at",
+        "status",
+        "amount",
+        "fee",
+        "tx_id",
+        "address",
+    ),
+    EXPORT_BLOCK_REWARDS: (
+        "block_found_at",
+        "block_value",
+        "fee",
+        "user_reward",
+        "pool_scoring_hash_rate",
+        "user_scoring_hash_rate",
+    ),
+    EXPORT_DAILY_REWARDS: (
+        "date",
+        "total_reward",
+        "mining_reward",
+        "bos_plus_reward",
+        "referral_bonus",
+        "referral_reward",
+    ),
+}
+
+
+def _format_record(record, fields: tuple[str, ...]) -> dict:
+    """Return the CSV columns of a record; times are written as ISO 8601 UTC."""
+    row = {}
+    for field in fields:
+        value = getattr(record, field)
+        row[field] = value.isoformat() if isinstance(value, datetime) else value
+    return row
+
+
+def _chunks(start: date, end: date) -> Iterator[tuple[date, date]]:
+    """Split an inclusive date range into windows of EXPORT_CHUNK_DAYS."""
+    while start <= end:
+        window_end = min(start + timedelta(days=EXPORT_CHUNK_DAYS - 1), end)
+        yield start, window_end
+        start = window_end + timedelta(days=1)
+
+
+class HistoryExporter:
+    """Write the history of one or more accounts to a CSV file."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        export_type: str,
+        start: date,
+        end: date,
+        name: str,
+    ):
+        """Initialize."""
+        self.hass = hass
+        self.export_type = export_type
+        self.start = start
+        self.end = end
+        self.path = hass.config.path(
+            f"braiins_pool_{export_type}_{name}_{start.isoformat()}_{end.isoformat()}.csv"
+        )
+        self.records = 0
+        self._file: IO[str] | None = None
+        self._writer: csv.DictWriter | None = None
+
+    def _open(self) -> None:
+        # Written under a temporary name, so a failed export leaves no
+        # truncated file that looks complete.
+        self._file = open(f"{self.path}.part", "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(
+            self._file,
+            ("account", "coin", *EXPORT_FIELDS[self.export_type]),
+            extrasaction="ignore",
+        )
+        self._writer.writeheader()
+
+    def _write(self, rows: list[dict]) -> None:
+        self._writer.writerows(rows)
+
+    def _close(self, success: bool) -> None:
+        self._file.close()
+        if success:
+            os.replace(f"{self.path}.part", self.path)
+        else:
+            os.remove(f"{self.path}.part")
+
+    async def async_export(
+        self, accounts: dict[str, BraiinsPoolApiClient], coin: str
+    ) -> int:
+        """Export the records of every account; return the number written."""
+        await self.hass.async_add_executor_job(self._open)
+        success = False
+        try:
+            fields = EXPORT_FIELDS[self.export_type]
+            for account, api_client in accounts.items():
+                async for records in self._async_fetch(api_client, coin):
+                    rows = [
+                        {
+                            "account": account,
+                            "coin": coin,
+                            **_format_record(record, fields),
+                        }
+                        for record in records
+                    ]
+                    await self.hass.async_add_executor_job(self._write, rows)
+                    self.records += len(rows)
+            success = True
+        finally:
+            await self.hass.async_add_executor_job(self._close, success)
+        _LOGGER.info(
+            "Exported %s Braiins Pool %s records to %s",
+            self.records,
+            self.export_type,
+            self.path,
+        )
+        return self.records
+
+    async def _async_fetch(self, api_client: BraiinsPoolApiClient, coin: str):
+        """Yield the records of the exported range, one API response at a time."""
+        if self.export_type == EXPORT_DAILY_REWARDS:
+            # The endpoint has no range parameters and returns the whole
+            # history in one response; only the requested days are kept.
+            records = await api_client.get_daily_rewards(coin)
+            yield [
+                record
+                for record in records
+                if self.start <= record.date.date() <= self.end
+            ]
+            return
+
+        fetch = (
+            api_client.get_payouts
+            if self.export_type == EXPORT_PAYOUTS
+            else api_client.get_block_rewards
+        )
+        for window_start, window_end in _chunks(self.start, self.end):
+            yield await fetch(window_start.isoformat(), window_end.isoformat(), coin)
@@ -0,0 +1,156 @@
+"""Runtime metrics of the Braiins Pool API client and coordinators."""
+
+import bisect
+from collections import Counter
+from dataclasses import dataclass, field
+
+# Upper bounds of the latency histogram buckets, in milliseconds. Requests
+# slower than the last bound are counted in an extra overflow bucket.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass
+class EndpointMetrics:
+    """Counters for one API endpoint."""
+
+    requests: int = 0
+    latency_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+    response_bytes_total: int = 0
+    decode_ms_total: float = 0.0
+    decoded: int = 0
+    # Second requests sent because the first one was slow
+    hedged: int = 0
+    errors: Counter = field(default_factory=Counter)
+
+    def observe_response(self, latency_ms: float, response_bytes: int) -> None:
+        """Record a received response."""
+        self.requests += 1
+        self.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.latency_ms_total += latency_ms
+        self.latency_ms_max = max(self.latency_ms_max, latency_ms)
+        self.response_bytes_total += response_bytes
+
+    def observe_decode(self, decode_ms: float) -> None:
+        """Record the time spent decoding a response body."""
+        self.decoded += 1
+        self.decode_ms_total += decode_ms
+
+    def observe_error(self, error: BaseException) -> None:
+        """Record a failed request by its error class."""
+        self.errors[type(error).__name__] += 1
+
+    @property
+    def latency_ms_mean(self) -> float | None:
+        if not self.requests:
+            return None
+        return self.latency_ms_total / self.requests
+
+    def latency_ms_percentile(self, percentile: float) -> float | None:
+        """Return the bucket bound the given percentile of latencies falls under."""
+        if not self.requests:
+            return None
+        rank = self.requests * percentile / 100
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.latency_buckets):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return self.latency_ms_max
+
+    def merge(self, other: "EndpointMetrics") -> None:
+        """Add the counters of another endpoint to these."""
+        self.requests += other.requests
+        self.latency_buckets = [
+            mine + theirs
+            for mine, theirs in zip(self.latency_buckets, other.latency_buckets)
+        ]
+        self.latency_ms_total += other.latency_ms_total
+        self.latency_ms_max = max(self.latency_ms_max, other.latency_ms_max)
+        self.response_bytes_total += other.response_bytes_total
+        self.decode_ms_total += other.decode_ms_total
+        self.decoded += other.decoded
+        self.hedged += other.hedged
+        self.errors.update(other.errors)
+
+    def as_dict(self) -> dict:
+        """Return the counters in a JSON-serializable form."""
+        return {
+            "requests": self.requests,
+            "latency_ms_mean": self.latency_ms_mean,
+            "latency_ms_p95": self.latency_ms_percentile(95),
+            "latency_ms_max": self.latency_ms_max,
+            "latency_histogram_ms": {
+                **{
+                    f"le_{bound}": count
+                    for bound, count in zip(LATENCY_BUCKETS_MS, self.latency_buckets)
+                },
+                "inf": self.latency_buckets[-1],
+            },
+            "response_bytes_total": self.response_bytes_total,
+            "decode_ms_mean": (
+                self.decode_ms_total / self.decoded if self.decoded else None
+            ),
+            "hedged": self.hedged,
+            "errors": dict(self.errors),
+        }
+
+
+@dataclass
+class CacheMetrics:
+    """Hit and miss counters of a cache lookup."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float | None:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hit_ratio}
+
+
+@dataclass
+class ApiMetrics:
+    """Metrics of one API client, by endpoint and by cache."""
+
+    endpoints: dict[str, EndpointMetrics] = field(default_factory=dict)
+    caches: dict[str, CacheMetrics] = field(default_factory=dict)
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        """Return the counters of an endpoint, creating them on first use."""
+        if name not in self.endpoints:
+            self.endpoints[name] = EndpointMetrics()
+        return self.endpoints[name]
+
+    def cache(self, name: str) -> CacheMetrics:
+        """Return the counters of a cache, creating them on first use."""
+        if name not in self.caches:
+            self.caches[name] = CacheMetrics()
+        return self.caches[name]
+
+    @classmethod
+    def combine(cls, metrics: list["ApiMetrics"]) -> "ApiMetrics":
+        """Return the sum of several clients' metrics."""
+        combined = cls()
+        for client_metrics in metrics:
+            for name, endpoint in client_metrics.endpoints.items():
+                combined.endpoint(name).merge(endpoint)
+            for name, cache in client_metrics.caches.items():
+                combined.cache(name).hits += cache.hits
+                combined.cache(name).misses += cache.misses
+        return combined
+
+    def as_dict(self) -> dict:
+        """Return the metrics in a JSON-serializable form."""
+        return {
+            "endpoints": {
+                name: endpoint.as_dict() for name, endpoint in self.endpoints.items()
+            },
+            "caches": {name: cache.as_dict() for name, cache in self.caches.items()},
+        }
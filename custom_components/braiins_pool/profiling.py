@@ -0,0 +1,154 @@
+"""On-demand profiling of coordinator update cycles.
+
+While a profile is running, the coordinator's update method is replaced by
+a wrapper on the instance; when it finishes the wrapper is removed again,
+so a coordinator that is not being profiled runs exactly the same code as
+before. Unloading the entry mid-profile removes the wrapper as well, and
+tracemalloc only runs while some profile needs it.
+"""
+
+import cProfile
+import logging
+import tracemalloc
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import MODE_CPROFILE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of allocation sites written to a tracemalloc report
+TRACEMALLOC_TOP_STATS = 100
+
+# tracemalloc is process-wide: it is started for the first profiler that
+# needs it and stopped once the last one is done, unless it was already
+# tracing before, e.g. through PYTHONTRACEMALLOC.
+_tracemalloc_users = 0
+_tracemalloc_started = False
+
+
+def _acquire_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_started
+    if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracemalloc_started = True
+    _tracemalloc_users += 1
+
+
+def _release_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_started
+    _tracemalloc_users -= 1
+    if _tracemalloc_users == 0 and _tracemalloc_started:
+        tracemalloc.stop()
+        _tracemalloc_started = False
+
+
+class UpdateProfiler:
+    """Profile the next update cycles of one coordinator."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: DataUpdateCoordinator,
+        name: str,
+        mode: str,
+        cycles: int,
+    ):
+        """Initialize."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.mode = mode
+        self.remaining = cycles
+        suffix = "prof" if mode == MODE_CPROFILE else "txt"
+        timestamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%S")
+        self.path = hass.config.path(f"braiins_pool_{mode}_{name}_{timestamp}.{suffix}")
+        self._profile: cProfile.Profile | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._tracing = False
+        self._writing = False
+
+    @staticmethod
+    def is_active(coordinator: DataUpdateCoordinator) -> bool:
+        """Return whether a coordinator is currently being profiled."""
+        return "_async_update_data" in vars(coordinator)
+
+    async def async_start(self) -> None:
+        """Wrap the coordinator's update method until the cycles are done."""
+        if self.mode == MODE_CPROFILE:
+            self._profile = cProfile.Profile()
+        else:
+            _acquire_tracemalloc()
+            self._tracing = True
+            # Snapshots walk the whole heap, so they are taken off the loop
+            self._snapshot = await self.hass.async_add_executor_job(
+                tracemalloc.take_snapshot
+            )
+        update = self.coordinator._async_update_data
+
+        async def _async_profiled_update():
+            profiling = False
+            if self._profile is not None:
+                # Everything that runs on the event loop meanwhile is included
+                try:
+                    self._profile.enable()
+                    profiling = True
+                except ValueError:
+                    _LOGGER.warning(
+                        "Another profiler is active, not profiling this update"
+                    )
+            try:
+                return await update()
+            finally:
+                if profiling:
+                    self._profile.disable()
+                self.remaining -= 1
+                if self.remaining <= 0:
+                    self._restore()
+                    self._writing = True
+                    self.hass.async_create_task(
+                        self._async_write(), f"braiins_pool profile {self.path}"
+                    )
+
+        self.coordinator._async_update_data = _async_profiled_update
+
+    def cancel(self) -> None:
+        """Stop profiling without writing a report, e.g. when the entry unloads.
+
+        A report that is already being written is finished.
+        """
+        self._restore()
+        if not self._writing:
+            self._release()
+
+    def _restore(self) -> None:
+        """Remove the wrapper, so the coordinator runs its own update again."""
+        self.coordinator.__dict__.pop("_async_update_data", None)
+
+    def _release(self) -> None:
+        if self._tracing:
+            self._tracing = False
+            _release_tracemalloc()
+
+    async def _async_write(self) -> None:
+        """Write the results."""
+        try:
+            if self._profile is not None:
+                await self.hass.async_add_executor_job(
+                    self._profile.dump_stats, self.path
+                )
+            else:
+                await self.hass.async_add_executor_job(self._write_tracemalloc)
+        finally:
+            self._release()
+        _LOGGER.info("Braiins Pool update profile written to %s", self.path)
+
+    def _write_tracemalloc(self) -> None:
+        stats = tracemalloc.take_snapshot().compare_to(self._snapshot, "lineno")
+        with open(self.path, "w", encoding="utf-8") as report:
+            report.write(
+                f"Allocation growth over {self.coordinator.name} update cycles\n"
+            )
+            for stat in stats[:TRACEMALLOC_TOP_STATS]:
+                report.write(f"{stat}\n")
@@ -0,0 +1,238 @@
+"""OpenMetrics exposition of the Braiins Pool data for Prometheus.
+
+The view renders the data every coordinator already holds, so a scrape never
+causes a Braiins Pool API call. A scrape does keep all data groups fetched
+for a while, even if their entities are disabled. The lines of each account are rendered once
+per coordinator update and reused by later scrapes, which keeps scraping
+cheap even with many thousands of worker series.
+"""
+
+from collections.abc import Iterator
+from decimal import Decimal
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_REWARDS_ACCOUNT_NAME, DOMAIN
+from .coordinator import BraiinsFarmUpdateCoordinator
+from .demand import DATA_GROUPS
+
+METRICS_URL = "/api/braiins_pool/metrics"
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# How long a scrape keeps every data group fetched
+SCRAPE_DEMAND_SECS = 600
+
+# Metric family, help text and coordinator data key, per account and coin
+ACCOUNT_METRICS = (
+    ("braiins_pool_current_balance", "Current balance", "current_balance"),
+    ("braiins_pool_today_reward", "Reward of the current UTC day", "today_reward"),
+    ("braiins_pool_all_time_reward", "All time reward", "all_time_reward"),
+    ("braiins_pool_ok_workers", "Workers in the ok state", "ok_workers"),
+    (
+        "braiins_pool_hash_rate_5m_ghs",
+        "Account hash rate over 5 minutes in Gh/s",
+        "pool_5m_hash_rate",
+    ),
+)
+# Pool-wide statistics, per coin
+POOL_METRICS = (
+    (
+        "braiins_pool_pool_hash_rate_5m_ghs",
+        "Pool hash rate over 5 minutes in Gh/s",
+        "hash_rate_5m",
+    ),
+    (
+        "braiins_pool_pool_hash_rate_24h_ghs",
+        "Pool hash rate over 24 hours in Gh/s",
+        "hash_rate_24h",
+    ),
+    (
+        "braiins_pool_pool_active_workers",
+        "Active workers in the pool",
+        "active_workers",
+    ),
+    ("braiins_pool_pool_luck_b10", "Pool luck over 10 blocks", "luck_b10"),
+    ("braiins_pool_pool_luck_b50", "Pool luck over 50 blocks", "luck_b50"),
+    ("braiins_pool_pool_luck_b250", "Pool luck over 250 blocks", "luck_b250"),
+    ("braiins_pool_pool_last_block_height", "Last block found", "last_block_height"),
+)
+# Per worker, from the workers endpoint
+WORKER_METRICS = (
+    (
+        "braiins_pool_worker_hash_rate_5m_ghs",
+        "Worker hash rate over 5 minutes in Gh/s",
+        "hash_rate_5m",
+    ),
+    (
+        "braiins_pool_worker_hash_rate_60m_ghs",
+        "Worker hash rate over 60 minutes in Gh/s",
+        "hash_rate_60m",
+    ),
+    (
+        "braiins_pool_worker_hash_rate_24h_ghs",
+        "Worker hash rate over 24 hours in Gh/s",
+        "hash_rate_24h",
+    ),
+    (
+        "braiins_pool_worker_last_share_timestamp_seconds",
+        "Time of the worker's last share",
+        "last_share",
+    ),
+)
+WORKER_UP = "braiins_pool_worker_up"
+LAST_UPDATE_SUCCESS = "braiins_pool_last_update_success"
+DATA_STALE = "braiins_pool_data_stale"
+DATA_TIMESTAMP = "braiins_pool_data_timestamp_seconds"
+
+FAMILIES = (
+    (LAST_UPDATE_SUCCESS, "Whether the last update of the account succeeded"),
+    (DATA_STALE, "Whether the samples of the account are kept from an earlier update"),
+    (DATA_TIMESTAMP, "Time the samples of the account were fetched"),
+    *((name, help_text) for name, help_text, _ in ACCOUNT_METRICS),
+    *((name, help_text) for name, help_text, _ in POOL_METRICS),
+    (WORKER_UP, "Whether the worker is in the ok state"),
+    *((name, help_text) for name, help_text, _ in WORKER_METRICS),
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value) -> str | None:
+    """Format a sample value, or return None if it is not a number."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, (float, Decimal)):
+        return repr(float(value))
+    if isinstance(value, str):
+        try:
+            return repr(float(value))
+        except ValueError:
+            return None
+    return None
+
+
+def _render_account(account: str, data: dict, coordinator) -> dict[str, list[str]]:
+    """Render the samples of one account, grouped by metric family.
+
+    Data served stale after a failed update is still exported, flagged by
+    braiins_pool_data_stale and dated by braiins_pool_data_timestamp_seconds.
+    """
+    lines: dict[str, list[str]] = {name: [] for name, _ in FAMILIES}
+    account_label = f'account="{_escape(account)}"'
+    lines[LAST_UPDATE_SUCCESS].append(
+        f"{LAST_UPDATE_SUCCESS}{{{account_label}}} "
+        f"{int(coordinator.last_update_success)}"
+    )
+    lines[DATA_STALE].append(
+        f"{DATA_STALE}{{{account_label}}} {int(coordinator.stale)}"
+    )
+    if coordinator.data_time is not None:
+        lines[DATA_TIMESTAMP].append(
+            f"{DATA_TIMESTAMP}{{{account_label}}} "
+            f"{_number(coordinator.data_time.timestamp())}"
+        )
+    for coin, coin_data in (data.get("coins") or {}).items():
+        labels = f'{account_label},coin="{_escape(coin)}"'
+        for name, _, key in ACCOUNT_METRICS:
+            value = _number(coin_data.get(key))
+            if value is not None:
+                lines[name].append(f"{name}{{{labels}}} {value}")
+        for worker, worker_data in (coin_data.get("workers") or {}).items():
+            worker_labels = f'{labels},worker="{_escape(worker)}"'
+            up = int(worker_data.state == "ok")
+            lines[WORKER_UP].append(f"{WORKER_UP}{{{worker_labels}}} {up}")
+            for name, _, key in WORKER_METRICS:
+                value = _number(getattr(worker_data, key))
+                if value is not None:
+                    lines[name].append(f"{name}{{{worker_labels}}} {value}")
+    return lines
+
+
+def _render_pool(coin: str, pool_stats: dict) -> dict[str, list[str]]:
+    lines: dict[str, list[str]] = {}
+    labels = f'coin="{_escape(coin)}"'
+    for name, _, key in POOL_METRICS:
+        value = _number(pool_stats.get(key))
+        if value is not None:
+            lines[name] = [f"{name}{{{labels}}} {value}"]
+    return lines
+
+
+class OpenMetricsRenderer:
+    """Render all entries' data, reusing the lines of unchanged accounts."""
+
+    def __init__(self):
+        """Initialize."""
+        # (entry ID, account) -> (data, success and staleness the lines were
+        # rendered from, lines by family)
+        self._cache: dict[tuple[str, str], tuple[dict, tuple, dict]] = {}
+
+    def _accounts(self, hass: HomeAssistant) -> Iterator[tuple[str, str, object]]:
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items():
+            if isinstance(coordinator, BraiinsFarmUpdateCoordinator):
+                for name, account in coordinator.accounts.items():
+                    yield entry_id, name, account
+                continue
+            entry = hass.config_entries.async_get_entry(entry_id)
+            name = entry_id
+            if entry is not None:
+                name = entry.data.get(CONF_REWARDS_ACCOUNT_NAME) or entry.title
+            yield entry_id, name, coordinator
+
+    def render(self, hass: HomeAssistant) -> str:
+        """Return the OpenMetrics text of every loaded entry."""
+        rendered = []
+        pool: dict[str, dict[str, list[str]]] = {}
+        cache = {}
+        for entry_id, name, coordinator in self._accounts(hass):
+            coordinator.demand.lease(DATA_GROUPS, SCRAPE_DEMAND_SECS)
+            data = coordinator.data or {}
+            state = (coordinator.last_update_success, coordinator.stale)
+            key = (entry_id, name)
+            cached = self._cache.get(key)
+            if cached is None or cached[0] is not data or cached[1] != state:
+                cached = (data, state, _render_account(name, data, coordinator))
+            cache[key] = cached
+            rendered.append(cached[2])
+            for coin, coin_data in (data.get("coins") or {}).items():
+                # Pool statistics are the same for every account
+                if coin not in pool and coin_data.get("pool_stats"):
+                    pool[coin] = _render_pool(coin, coin_data["pool_stats"])
+        # Drop the lines of entries that were unloaded
+        self._cache = cache
+
+        output = []
+        for name, help_text in FAMILIES:
+            output.append(f"# TYPE {name} gauge")
+            output.append(f"# HELP {name} {help_text}")
+            for lines in rendered:
+                output.extend(lines[name])
+            for lines in pool.values():
+                output.extend(lines.get(name, ()))
+        output.append("# EOF\n")
+        return "\n".join(output)
+
+
+class BraiinsPoolMetricsView(HomeAssistantView):
+    """Serve the Braiins Pool data in OpenMetrics text format."""
+
+    url = METRICS_URL
+    name = "api:braiins_pool:metrics"
+
+    def __init__(self):
+        """Initialize."""
+        self._renderer = OpenMetricsRenderer()
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Handle a scrape."""
+        hass = request.app[KEY_HASS]
+        return web.Response(
+            body=self._renderer.render(hass).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
@@ -0,0 +1,101 @@
+"""Poll scheduling helpers for the Braiins Pool integration."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import math
+import zlib
+
+
+def entry_jitter(key: str, max_jitter: float) -> float:
+    """Return a deterministic jitter in [0, max_jitter) seconds for key.
+
+    The same key always gets the same jitter, so an entry keeps its slot
+    across restarts while different entries are spread out.
+    """
+    if max_jitter <= 0:
+        return 0.0
+    return zlib.crc32(key.encode()) / 2**32 * max_jitter
+
+
+def next_aligned_time(now: float, interval: float, offset: float) -> float:
+    """Return the first time after now that is offset seconds past a boundary.
+
+    Boundaries are the multiples of interval since the Unix epoch, which
+    line up with the pool's recompute boundaries whenever the interval
+    divides, or is a multiple of, the recompute period.
+    """
+    boundary = math.floor((now - offset) / interval) * interval
+    return boundary + offset + interval
+
+
+class RefreshCoalescer:
+    """Collapse on-demand refresh requests into as few refreshes as possible.
+
+    A request starts a window of ``window`` seconds; every request arriving
+    before the window closes shares the one refresh that follows it.
+    Refreshes also start at least ``min_spacing`` seconds apart, so a burst
+    of requests right after a refresh waits for the next slot instead of
+    causing another request to the API straight away. With
+    ``since_last_fetch``, which returns the seconds since the data was last
+    fetched by any means, the spacing also counts from that fetch.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[], Awaitable[None]],
+        window: float,
+        min_spacing: float,
+        since_last_fetch: Callable[[], float | None] | None = None,
+    ) -> None:
+        """Initialize."""
+        self._refresh = refresh
+        self.window = window
+        self.min_spacing = min_spacing
+        self._since_last_fetch = since_last_fetch
+        self.refreshes = 0
+        self._pending: asyncio.Future[None] | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._last_start: float | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def async_request(self) -> None:
+        """Wait for a refresh that starts after this request."""
+        if self._pending is None:
+            loop = asyncio.get_running_loop()
+            self._pending = loop.create_future()
+            now = loop.time()
+            start = now + self.window
+            if self._last_start is not None:
+                start = max(start, self._last_start + self.min_spacing)
+            if self._since_last_fetch is not None and (
+                (elapsed := self._since_last_fetch()) is not None
+            ):
+                start = max(start, now + self.min_spacing - elapsed)
+            self._timer = loop.call_at(start, self._start)
+        # One caller giving up must not cancel the refresh of the others
+        await asyncio.shield(self._pending)
+
+    def _start(self) -> None:
+        """Start the refresh the pending requests wait for."""
+        future, self._pending, self._timer = self._pending, None, None
+        self._last_start = asyncio.get_running_loop().time()
+        self.refreshes += 1
+        task = asyncio.get_running_loop().create_task(self._async_run(future))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_run(self, future: asyncio.Future[None]) -> None:
+        try:
+            await self._refresh()
+        except Exception as err:  # noqa: BLE001 - handed to the waiting callers
+            future.set_exception(err)
+        finally:
+            if not future.done():
+                future.set_result(None)
+
+    def cancel(self) -> None:
+        """Drop the pending refresh; its callers return without one."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._pending.set_result(None)
+            self._pending = self._timer = None
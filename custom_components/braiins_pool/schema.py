@@ -0,0 +1,372 @@
+"""Typed decoders of the Braiins Pool API responses.
+
+Each endpoint's fields are declared once, with the key they are read from
+and the converter they go through. A decoder walks the decoded JSON once
+and builds compact named-tuple records or the flat dicts the coordinator
+merges into its data. A value that is missing or has an unexpected type
+raises SchemaError naming where in the response it was found, instead of
+surfacing later as a sensor with a wrong or missing state.
+"""
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, NamedTuple, TypedDict
+
+# Default of a field that has to be present
+REQUIRED = object()
+
+
+class SchemaError(ValueError):
+    """A response does not have the expected structure."""
+
+
+# Converters raise TypeError for a value of the wrong JSON type and
+# ValueError for a string that does not parse. JSON true and false are
+# never accepted as numbers, although bool is an int in Python.
+
+
+def _check_number(value: Any) -> None:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError(f"expected a number, got {type(value).__name__}")
+
+
+def text(value: Any) -> str:
+    """Accept a string only."""
+    if not isinstance(value, str):
+        raise TypeError(f"expected a string, got {type(value).__name__}")
+    return value
+
+
+def number(value: Any) -> float:
+    """Convert a JSON number, or a string holding one, to a float."""
+    _check_number(value)
+    return float(value)
+
+
+def integer(value: Any) -> int:
+    """Convert a JSON integer, or a string holding one, to an int."""
+    _check_number(value)
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"expected an integer, got {value!r}")
+    return int(value)
+
+
+def amount(value: Any) -> Decimal:
+    """Convert a monetary amount to a Decimal.
+
+    A JSON float goes through its shortest text form, so 0.1 becomes
+    Decimal("0.1") rather than the binary value closest to it.
+    """
+    _check_number(value)
+    return Decimal(value if isinstance(value, str) else str(value))
+
+
+def timestamp(value: Any) -> datetime:
+    """Convert a Unix timestamp to an aware UTC datetime."""
+    return datetime.fromtimestamp(integer(value), timezone.utc)
+
+
+def optional(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Wrap a converter so it passes None through."""
+
+    def _convert(value: Any) -> Any:
+        return None if value is None else convert(value)
+
+    return _convert
+
+
+class Field(NamedTuple):
+    """A field of a record: its name, source key, converter and default."""
+
+    name: str
+    key: str
+    convert: Callable[[Any], Any]
+    default: Any
+
+
+def field(
+    name: str,
+    convert: Callable[[Any], Any],
+    default: Any = REQUIRED,
+    key: str | None = None,
+) -> Field:
+    """Declare a field; it is read from its name unless a key is given."""
+    return Field(name, name if key is None else key, convert, default)
+
+
+def _decode_fields(raw: Any, fields: tuple[Field, ...]) -> list[Any]:
+    """Return the converted values of fields, in order."""
+    if not isinstance(raw, dict):
+        raise SchemaError(f"expected an object, got {type(raw).__name__}")
+    values = []
+    for _, key, convert, default in fields:
+        value = raw.get(key, default)
+        if value is REQUIRED:
+            raise SchemaError(f"missing {key!r}")
+        try:
+            values.append(convert(value))
+        except (TypeError, ValueError, ArithmeticError, OSError) as err:
+            raise SchemaError(f"unexpected value of {key!r}: {value!r}") from err
+    return values
+
+
+def _decode_dict(raw: Any, fields: tuple[Field, ...], path: str) -> dict:
+    """Decode a single object into a dict keyed by field name."""
+    try:
+        values = _decode_fields(raw, fields)
+    except SchemaError as err:
+        raise SchemaError(f"{path}: {err}") from err
+    return dict(zip((name for name, *_ in fields), values))
+
+
+def _coin_section(data: Any, coin: str) -> dict | None:
+    """Return the part of a response that belongs to a coin, if any."""
+    if not isinstance(data, dict):
+        raise SchemaError(f"expected an object, got {type(data).__name__}")
+    section = data.get(coin)
+    if section is not None and not isinstance(section, dict):
+        raise SchemaError(f"{coin}: expected an object, got {type(section).__name__}")
+    return section
+
+
+def _member(section: dict | None, key: str, empty: Any) -> Any:
+    """Return a member of a coin section; empty if it is missing or null."""
+    value = None if section is None else section.get(key)
+    return empty if value is None else value
+
+
+def _decode_list(data: Any, coin: str, key: str, record_type: type) -> list:
+    """Decode the list of records a history endpoint returns for a coin."""
+    section = _coin_section(data, coin)
+    raw_records = _member(section, key, [])
+    if not isinstance(raw_records, list):
+        raise SchemaError(f"{coin}.{key}: expected a list")
+    fields = record_type.FIELDS
+    records = []
+    # The path of a record is only formatted once it turned out to be wrong.
+    index = 0
+    try:
+        for index, raw in enumerate(raw_records):
+            records.append(record_type(*_decode_fields(raw, fields)))
+    except SchemaError as err:
+        raise SchemaError(f"{coin}.{key}[{index}]: {err}") from err
+    return records
+
+
+class UserProfile(TypedDict):
+    """Figures of an account, from the profile endpoint."""
+
+    current_balance: Decimal
+    today_reward: Decimal
+    all_time_reward: Decimal
+    ok_workers: int
+    pool_5m_hash_rate: float
+
+
+# Missing figures count as zero, as a new account has none yet.
+PROFILE_FIELDS = (
+    field("current_balance", amount, "0"),
+    field("today_reward", amount, "0"),
+    field("all_time_reward", amount, "0"),
+    field("ok_workers", integer, 0),
+    field("pool_5m_hash_rate", number, "0", key="hash_rate_5m"),
+)
+
+
+def decode_profile(data: Any, coin: str) -> UserProfile | dict:
+    """Decode a profile response; empty if it has no data for the coin."""
+    section = _coin_section(data, coin)
+    if section is None:
+        return {}
+    return _decode_dict(section, PROFILE_FIELDS, coin)
+
+
+class PoolStats(TypedDict, total=False):
+    """Pool-wide statistics; the last block is absent while none is listed."""
+
+    hash_rate_5m: float
+    hash_rate_60m: float
+    hash_rate_24h: float
+    active_workers: int
+    luck_b10: float
+    luck_b50: float
+    luck_b250: float
+    recent_blocks: int
+    last_block_height: int
+    last_block_found: datetime
+    last_block_value: Decimal
+
+
+POOL_STATS_FIELDS = (
+    field("hash_rate_5m", number, 0, key="pool_5m_hash_rate"),
+    field("hash_rate_60m", number, 0, key="pool_60m_hash_rate"),
+    field("hash_rate_24h", number, 0, key="pool_24h_hash_rate"),
+    field("active_workers", integer, 0, key="pool_active_workers"),
+    field("luck_b10", number, 0),
+    field("luck_b50", number, 0),
+    field("luck_b250", number, 0),
+)
+BLOCK_FIELDS = (
+    field("last_block_found", timestamp, 0, key="date_found"),
+    field("last_block_value", amount, "0", key="value"),
+)
+
+
+def decode_pool_stats(data: Any, coin: str) -> PoolStats | dict:
+    """Decode a pool statistics response; empty if it has no data for the coin."""
+    section = _coin_section(data, coin)
+    if section is None:
+        return {}
+    stats = _decode_dict(section, POOL_STATS_FIELDS, coin)
+    blocks = _member(section, "blocks", {})
+    if not isinstance(blocks, dict):
+        raise SchemaError(f"{coin}.blocks: expected an object")
+    stats["recent_blocks"] = len(blocks)
+    if blocks:
+        try:
+            last_height = max(blocks, key=int)
+        except ValueError as err:
+            raise SchemaError(f"{coin}.blocks: non-numeric block height") from err
+        stats["last_block_height"] = int(last_height)
+        stats.update(
+            _decode_dict(
+                blocks[last_height], BLOCK_FIELDS, f"{coin}.blocks.{last_height}"
+            )
+        )
+    return stats
+
+
+class Worker(NamedTuple):
+    """State and hash rates of a worker; hash rates are in Gh/s.
+
+    last_share stays a Unix timestamp: the metrics endpoint exports it as
+    such, and converting every worker of a large farm would be wasted work.
+    """
+
+    state: str
+    last_share: int | None
+    hash_rate_scoring: float
+    hash_rate_5m: float
+    hash_rate_60m: float
+    hash_rate_24h: float
+
+    FIELDS = (
+        field("state", text),
+        field("last_share", optional(integer), None),
+        field("hash_rate_scoring", number, 0),
+        field("hash_rate_5m", number),
+        field("hash_rate_60m", number, 0),
+        field("hash_rate_24h", number, 0),
+    )
+
+
+def decode_workers(data: Any, coin: str) -> dict[str, Worker]:
+    """Decode a workers response into records keyed by worker name."""
+    section = _coin_section(data, coin)
+    raw_workers = _member(section, "workers", {})
+    if not isinstance(raw_workers, dict):
+        raise SchemaError(f"{coin}.workers: expected an object")
+    fields = Worker.FIELDS
+    workers = {}
+    name = None
+    try:
+        for name, raw in raw_workers.items():
+            workers[name] = Worker(*_decode_fields(raw, fields))
+    except SchemaError as err:
+        raise SchemaError(f"{coin}.workers[{name!r}]: {err}") from err
+    return workers
+
+
+class DailyReward(NamedTuple):
+    """Rewards of an account for one UTC day."""
+
+    date: datetime
+    total_reward: Decimal
+    mining_reward: Decimal
+    bos_plus_reward: Decimal
+    referral_bonus: Decimal
+    referral_reward: Decimal
+
+    FIELDS = (
+        field("date", timestamp),
+        field("total_reward", amount),
+        field("mining_reward", amount, "0"),
+        field("bos_plus_reward", amount, "0"),
+        field("referral_bonus", amount, "0"),
+        field("referral_reward", amount, "0"),
+    )
+
+
+def decode_daily_rewards(data: Any, coin: str) -> list[DailyReward]:
+    """Decode a daily rewards response."""
+    return _decode_list(data, coin, "daily_rewards", DailyReward)
+
+
+class DailyHashrate(NamedTuple):
+    """Average hash rate of one UTC day, in Gh/s."""
+
+    date: datetime
+    hash_rate_24h: float
+
+    FIELDS = (
+        field("date", timestamp),
+        field("hash_rate_24h", number),
+    )
+
+
+def decode_daily_hashrate(data: Any, coin: str) -> list[DailyHashrate]:
+    """Decode a daily hash rate response."""
+    return _decode_list(data, coin, "daily_hash_rate", DailyHashrate)
+
+
+class BlockReward(NamedTuple):
+    """Reward of an account for one block found by the pool."""
+
+    block_found_at: datetime
+    block_value: Decimal
+    fee: Decimal
+    user_reward: Decimal
+    pool_scoring_hash_rate: float | None
+    user_scoring_hash_rate: float | None
+
+    FIELDS = (
+        field("block_found_at", timestamp),
+        field("block_value", amount),
+        field("fee", amount, "0"),
+        field("user_reward", amount),
+        field("pool_scoring_hash_rate", optional(number), None),
+        field("user_scoring_hash_rate", optional(number), None),
+    )
+
+
+def decode_block_rewards(data: Any, coin: str) -> list[BlockReward]:
+    """Decode a block rewards response."""
+    return _decode_list(data, coin, "block_rewards", BlockReward)
+
+
+class Payout(NamedTuple):
+    """A payout; resolved_at and tx_id are None until it is sent."""
+
+    requested_at: datetime
+    resolved_at: datetime | None
+    status: str
+    amount: Decimal
+    fee: Decimal
+    tx_id: str | None
+    address: str | None
+
+    FIELDS = (
+        field("requested_at", timestamp),
+        field("resolved_at", optional(timestamp), None),
+        field("status", text),
+        field("amount", amount),
+        field("fee", amount, "0"),
+        field("tx_id", optional(text), None),
+        field("address", optional(text), None),
+    )
+
+
+def decode_payouts(data: Any, coin: str) -> list[Payout]:
+    """Decode a payouts response."""
+    return _decode_list(data, coin, "payouts", Payout)
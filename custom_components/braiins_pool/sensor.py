@@ -1,6 +1,8 @@
 """Sensor entities for the Braiins Pool integration."""
 
+import dataclasses
 import logging
+from dataclasses import dataclass
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -8,11 +10,14 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfDataRate
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfDataRate, UnitOfTime
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_REWARDS_ACCOUNT_NAME
+from .api import DEFAULT_COIN
+from .const import DOMAIN, CONF_ENTRY_TYPE, CONF_REWARDS_ACCOUNT_NAME, ENTRY_TYPE_FARM
 from .coordinator import BraiinsDataUpdateCoordinator
+from .demand import DATA_GROUP_POOL_STATS, DATA_GROUP_PROFILE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +30,13 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
         state_class=SensorStateClass.TOTAL,
         device_class=SensorDeviceClass.MONETARY,
     ),
+    SensorEntityDescription(
+        key="previous_day_reward",
+        name="Braiins Pool Previous Day's Reward",
+        icon="mdi:bitcoin",
+        native_unit_of_measurement="BTC",
+        device_class=SensorDeviceClass.MONETARY,
+    ),
     SensorEntityDescription(
         key="current_balance",
         name="Braiins Pool Current Balance",
@@ -81,34 +93,214 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
     ),
 )
 
+# Sensors that reset at the UTC day boundary and report it as their last_reset
+DAILY_SENSOR_KEYS = ("today_reward", "today_reward_satoshi")
+
+# Pool-wide statistics, shared by every account and read from the pool stats cache.
+POOL_STATS_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="hash_rate_5m",
+        name="Braiins Pool Total 5m Hash Rate",
+        icon="mdi:gauge",
+        native_unit_of_measurement="Gh/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_RATE,
+    ),
+    SensorEntityDescription(
+        key="hash_rate_24h",
+        name="Braiins Pool Total 24h Hash Rate",
+        icon="mdi:gauge",
+        native_unit_of_measurement="Gh/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DATA_RATE,
+    ),
+    SensorEntityDescription(
+        key="active_workers",
+        name="Braiins Pool Total Active Workers",
+        icon="mdi:worker",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="luck_b10",
+        name="Braiins Pool Luck (10 Blocks)",
+        icon="mdi:clover",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="luck_b50",
+        name="Braiins Pool Luck (50 Blocks)",
+        icon="mdi:clover",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="luck_b250",
+        name="Braiins Pool Luck (250 Blocks)",
+        icon="mdi:clover",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="last_block_height",
+        name="Braiins Pool Last Block Height",
+        icon="mdi:cube-outline",
+    ),
+    SensorEntityDescription(
+        key="last_block_found",
+        name="Braiins Pool Last Block Found",
+        icon="mdi:cube-outline",
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+)
+
+# Farm entries sum their accounts into SENSOR_TYPES and add these on top.
+FARM_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="accounts_ok",
+        name="Braiins Pool Farm Accounts Online",
+        icon="mdi:account-multiple-check",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="accounts_total",
+        name="Braiins Pool Farm Accounts",
+        icon="mdi:account-multiple",
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class BraiinsPoolMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor reading the integration's own metrics."""
+
+    metric_group: str
+    metric_name: str
+
+
+def _metric_descriptions(endpoint: str, title: str):
+    return (
+        BraiinsPoolMetricSensorEntityDescription(
+            key=f"{endpoint}_latency",
+            name=f"Braiins Pool {title} Latency",
+            icon="mdi:timer-outline",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.DURATION,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            metric_group=endpoint,
+            metric_name="latency",
+        ),
+        BraiinsPoolMetricSensorEntityDescription(
+            key=f"{endpoint}_errors",
+            name=f"Braiins Pool {title} Errors",
+            icon="mdi:alert-circle-outline",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            metric_group=endpoint,
+            metric_name="errors",
+        ),
+    )
+
+
+# Diagnostics about the integration itself, disabled by default.
+METRIC_SENSOR_TYPES: tuple[BraiinsPoolMetricSensorEntityDescription, ...] = (
+    *_metric_descriptions("profile", "Profile Request"),
+    *_metric_descriptions("pool_stats", "Pool Stats Request"),
+    BraiinsPoolMetricSensorEntityDescription(
+        key="pool_stats_cache_hit_ratio",
+        name="Braiins Pool Pool Stats Cache Hit Ratio",
+        icon="mdi:cached",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        metric_group="pool_stats",
+        metric_name="cache_hit_ratio",
+    ),
+)
+
+
+def _coin_description(description, coin):
+    """Return a copy of a sensor description for a coin other than the default."""
+    unit = description.native_unit_of_measurement
+    return dataclasses.replace(
+        description,
+        name=description.name.replace("Braiins Pool", f"Braiins Pool {coin.upper()}"),
+        native_unit_of_measurement=coin.upper() if unit == "BTC" else unit,
+    )
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the sensor platform."""
     coordinator: BraiinsDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     rewards_account_name = config_entry.data.get(CONF_REWARDS_ACCOUNT_NAME)
 
-    entities = [
-        BraiinsPoolSensor(coordinator, description, config_entry)
-        for description in SENSOR_TYPES
-    ]
+    entities = []
+    for coin in coordinator.coins:
+        if coin == DEFAULT_COIN:
+            # The default coin keeps its original names and unique IDs.
+            entities.extend(
+                BraiinsPoolSensor(coordinator, description, config_entry)
+                for description in SENSOR_TYPES
+            )
+            entities.extend(
+                BraiinsPoolStatsSensor(coordinator, description, config_entry)
+                for description in POOL_STATS_SENSOR_TYPES
+            )
+            continue
+        # Satoshi conversions only make sense for bitcoin.
+        entities.extend(
+            BraiinsPoolSensor(
+                coordinator, _coin_description(description, coin), config_entry, coin
+            )
+            for description in SENSOR_TYPES
+            if not description.key.endswith("_satoshi")
+        )
+        entities.extend(
+            BraiinsPoolStatsSensor(
+                coordinator, _coin_description(description, coin), config_entry, coin
+            )
+            for description in POOL_STATS_SENSOR_TYPES
+        )
+    if config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_FARM:
+        entities.extend(
+            BraiinsPoolSensor(coordinator, description, config_entry)
+            for description in FARM_SENSOR_TYPES
+        )
+    entities.extend(
+        BraiinsPoolMetricSensor(coordinator, description, config_entry)
+        for description in METRIC_SENSOR_TYPES
+    )
     async_add_entities(entities)
 
 
 class BraiinsPoolSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Braiins Pool sensor."""
 
+    # The data group this sensor shows, fetched while the sensor is enabled
+    _data_group: str | None = DATA_GROUP_PROFILE
+
     def __init__(
-        self, coordinator, entity_description, config_entry
+        self, coordinator, entity_description, config_entry, coin=DEFAULT_COIN
     ):  # Add config_entry
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.entity_description = entity_description
         self._config_entry = config_entry
+        self._coin = coin
         self._attr_name = entity_description.name
         self._attr_unique_id = (
             f"{self._config_entry.entry_id}_{self.entity_description.key}"
+            if coin == DEFAULT_COIN
+            else f"{self._config_entry.entry_id}_{coin}_{self.entity_description.key}"
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates and demand this sensor's data group."""
+        await super().async_added_to_hass()
+        if self._data_group is not None:
+            self.async_on_remove(self.coordinator.demand.add(self._data_group))
+
     @property
     def device_info(self):
         """Return device information."""
@@ -122,7 +314,97 @@ class BraiinsPoolSensor(CoordinatorEntity, SensorEntity):
             "entry_type": "service",  # Or remove if not applicable
         }
 
+    def _coin_data(self) -> dict:
+        """Return the coordinator data of this sensor's coin."""
+        if self._coin == DEFAULT_COIN:
+            return self.coordinator.data
+        return (self.coordinator.data.get("coins") or {}).get(self._coin) or {}
+
     @property
     def native_value(self):
         """Return the state of the sensor, handling potential missing data."""
-        return self.coordinator.data.get(self.entity_description.key, None)
+        return self._coin_data().get(self.entity_description.key, None)
+
+    @property
+    def last_reset(self):
+        """Return the start of the UTC day for sensors that reset daily."""
+        if self.entity_description.key in DAILY_SENSOR_KEYS:
+            return self._coin_data().get("day_start")
+        return None
+
+    @property
+    def extra_state_attributes(self):
+        """Return how old the data is, if the entry serves stale data."""
+        coordinator = self.coordinator
+        if coordinator.stale_grace is None or coordinator.data_time is None:
+            return None
+        return {
+            "data_age": int((dt_util.utcnow() - coordinator.data_time).total_seconds()),
+            "stale": coordinator.stale,
+        }
+
+
+class BraiinsPoolStatsSensor(BraiinsPoolSensor):
+    """Representation of a pool-wide Braiins Pool statistic."""
+
+    _data_group = DATA_GROUP_POOL_STATS
+
+    def __init__(
+        self, coordinator, entity_description, config_entry, coin=DEFAULT_COIN
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator, entity_description, config_entry, coin)
+        prefix = "" if coin == DEFAULT_COIN else f"{coin}_"
+        self._attr_unique_id = (
+            f"{self._config_entry.entry_id}_{prefix}pool_stats_"
+            f"{self.entity_description.key}"
+        )
+
+    @property
+    def native_value(self):
+        """Return the statistic from the shared pool stats snapshot."""
+        pool_stats = self._coin_data().get("pool_stats") or {}
+        return pool_stats.get(self.entity_description.key)
+
+
+class BraiinsPoolMetricSensor(BraiinsPoolSensor):
+    """Diagnostic sensor reporting request and cache metrics."""
+
+    entity_description: BraiinsPoolMetricSensorEntityDescription
+    # Metrics come from the requests made for the other sensors
+    _data_group = None
+
+    @property
+    def native_value(self):
+        """Return the metric, or None until it has been observed."""
+        description = self.entity_description
+        metrics = self.coordinator.metrics
+        if description.metric_name == "cache_hit_ratio":
+            cache = metrics.caches.get(description.metric_group)
+            if cache is None or cache.hit_ratio is None:
+                return None
+            return round(cache.hit_ratio * 100, 1)
+        endpoint = metrics.endpoints.get(description.metric_group)
+        if endpoint is None:
+            return None
+        if description.metric_name == "errors":
+            return sum(endpoint.errors.values())
+        mean = endpoint.latency_ms_mean
+        return None if mean is None else round(mean, 1)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the details behind the metric."""
+        description = self.entity_description
+        metrics = self.coordinator.metrics
+        if description.metric_name == "cache_hit_ratio":
+            cache = metrics.caches.get(description.metric_group)
+            return None if cache is None else cache.as_dict()
+        endpoint = metrics.endpoints.get(description.metric_group)
+        if endpoint is None:
+            return None
+        if description.metric_name == "errors":
+            return {"errors": dict(endpoint.errors)}
+        return {
+            key: value for key, value in endpoint.as_dict().items() if key != "errors"
+        }
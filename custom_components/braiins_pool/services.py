@@ -0,0 +1,198 @@
+"""Services of the Braiins Pool integration."""
+
+import asyncio
+
+import aiohttp
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .api import BraiinsPoolApiException
+from .const import (
+    CONF_ENTRY_TYPE,
+    CONF_REWARDS_ACCOUNT_NAME,
+    DOMAIN,
+    ENTRY_TYPE_ACCOUNT,
+    ENTRY_TYPE_FARM,
+    EXPORT_TYPES,
+    MODE_CPROFILE,
+    PROFILE_MODES,
+)
+from .coordinator import BraiinsFarmUpdateCoordinator
+
+SERVICE_PROFILE_UPDATES = "profile_updates"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_MODE = "mode"
+ATTR_CYCLES = "cycles"
+SERVICE_EXPORT_HISTORY = "export_history"
+ATTR_DATA_TYPE = "data_type"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_COIN = "coin"
+SERVICE_REFRESH = "refresh"
+ATTR_ENTRY_TYPE = "entry_type"
+
+PROFILE_UPDATES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_MODE, default=MODE_CPROFILE): vol.In(PROFILE_MODES),
+        vol.Optional(ATTR_CYCLES, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_DATA_TYPE): vol.In(EXPORT_TYPES),
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_COIN): cv.string,
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_ENTRY_TYPE): vol.In([ENTRY_TYPE_ACCOUNT, ENTRY_TYPE_FARM]),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str):
+    """Return the coordinator of a loaded config entry."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+    if coordinator is None:
+        raise ServiceValidationError(
+            f"No loaded Braiins Pool config entry with ID {entry_id}"
+        )
+    return coordinator
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def async_profile_updates(call: ServiceCall) -> None:
+        # Loaded on first use, like the exporter below
+        from .profiling import UpdateProfiler
+
+        entry_id = call.data[ATTR_ENTRY_ID]
+        coordinator = _get_coordinator(hass, entry_id)
+        if UpdateProfiler.is_active(coordinator):
+            raise ServiceValidationError(
+                f"Braiins Pool config entry {entry_id} is already being profiled"
+            )
+        profiler = UpdateProfiler(
+            hass, coordinator, entry_id, call.data[ATTR_MODE], call.data[ATTR_CYCLES]
+        )
+        await profiler.async_start()
+        # Unloading the entry mid-profile must not leave the wrapper or
+        # tracemalloc behind.
+        if entry := hass.config_entries.async_get_entry(entry_id):
+            entry.async_on_unload(profiler.cancel)
+
+    async def async_export_history(call: ServiceCall) -> ServiceResponse:
+        from .export import HistoryExporter
+
+        entry_id = call.data[ATTR_ENTRY_ID]
+        coordinator = _get_coordinator(hass, entry_id)
+        start = call.data[ATTR_START_DATE]
+        end = call.data.get(ATTR_END_DATE) or dt_util.utcnow().date()
+        if start > end:
+            raise ServiceValidationError(
+                "The start date must not be after the end date"
+            )
+        if isinstance(coordinator, BraiinsFarmUpdateCoordinator):
+            accounts = {
+                name: account.api_client
+                for name, account in coordinator.accounts.items()
+            }
+        else:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            name = entry.data.get(CONF_REWARDS_ACCOUNT_NAME) or entry.title
+            accounts = {name: coordinator.api_client}
+        exporter = HistoryExporter(
+            hass, call.data[ATTR_DATA_TYPE], start, end, entry_id
+        )
+        try:
+            records = await exporter.async_export(
+                accounts, call.data.get(ATTR_COIN) or coordinator.coins[0]
+            )
+        except (
+            BraiinsPoolApiException,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+        ) as err:
+            raise HomeAssistantError(
+                f"Error exporting Braiins Pool history: {err}"
+            ) from err
+        return {"path": exporter.path, "records": records}
+
+    async def async_refresh(call: ServiceCall) -> None:
+        if ATTR_ENTRY_ID in call.data:
+            coordinators = {
+                entry_id: _get_coordinator(hass, entry_id)
+                for entry_id in call.data[ATTR_ENTRY_ID]
+            }
+        else:
+            coordinators = dict(hass.data.get(DOMAIN, {}))
+        if entry_type := call.data.get(ATTR_ENTRY_TYPE):
+            coordinators = {
+                entry_id: coordinator
+                for entry_id, coordinator in coordinators.items()
+                if hass.config_entries.async_get_entry(entry_id).data.get(
+                    CONF_ENTRY_TYPE, ENTRY_TYPE_ACCOUNT
+                )
+                == entry_type
+            }
+        # Entries whose key was rejected wait for reauthentication instead
+        coordinators = {
+            entry_id: coordinator
+            for entry_id, coordinator in coordinators.items()
+            if not coordinator.auth_failed
+        }
+        if not coordinators:
+            raise ServiceValidationError("No Braiins Pool config entry to refresh")
+        await asyncio.gather(
+            *(
+                coordinator.async_request_coalesced_refresh()
+                for coordinator in coordinators.values()
+            )
+        )
+        if failed := [
+            entry_id
+            for entry_id, coordinator in coordinators.items()
+            # Data served stale means the fetch failed within the grace period
+            if not coordinator.last_update_success or coordinator.stale
+        ]:
+            raise HomeAssistantError(
+                f"Error refreshing Braiins Pool config entries {', '.join(failed)}"
+            )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_UPDATES,
+        async_profile_updates,
+        schema=PROFILE_UPDATES_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        async_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA
+    )
@@ -0,0 +1,66 @@
+"""Dedicated HTTP session of the integration, tuned for pool.braiins.com.
+
+Home Assistant's shared session is tuned for many hosts. This one keeps
+connections to the pool alive between polls, caches its DNS lookups and
+asks for compressed responses, and it can open the connections a few
+seconds before a poll so the poll does not pay for the TLS handshake.
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+from aiohttp.compression_utils import HAS_BROTLI
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+from homeassistant.util import ssl as ssl_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Connections opened to the pool at the same time, at most
+CONNECTIONS_PER_HOST = 8
+# Longer than the default polling interval, so connections survive between polls
+KEEPALIVE_SECS = 90
+DNS_CACHE_SECS = 600
+# Brotli is only requested when aiohttp can decode it
+ACCEPT_ENCODING = "gzip, br" if HAS_BROTLI else "gzip"
+# How long before a scheduled poll its connections are opened
+PREWARM_LEAD_SECS = 5
+PREWARM_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+
+def async_create_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Create a session with a connector tuned for polling a single host.
+
+    The caller owns the session and has to close it.
+    """
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_SECS,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_SECS,
+        ssl=ssl_util.get_default_context(),
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={
+            aiohttp.hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING,
+            aiohttp.hdrs.USER_AGENT: f"HomeAssistant/{HA_VERSION} braiins_pool",
+        },
+    )
+
+
+async def async_prewarm(
+    session: aiohttp.ClientSession, url: str, connections: int = 1
+) -> None:
+    """Open connections to a host ahead of a poll, ignoring any errors."""
+
+    async def _async_open() -> None:
+        try:
+            async with session.head(url, timeout=PREWARM_TIMEOUT):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Could not pre-warm a connection to %s: %s", url, err)
+
+    await asyncio.gather(*(_async_open() for _ in range(connections)))
@@ -0,0 +1,311 @@
+"""Compact on-disk history of account and worker hash rates.
+
+Every series lives in two append-only files. The data file holds one
+fixed-width record per point: the seconds since the previous point and the
+change of the value, in thousandths of the unit. The index file holds one
+entry per block of records with the record number, timestamp and value the
+block starts from, so a range query only decodes from the block before its
+start instead of from the beginning of the file. Reads go through a memory
+map of the data file; the small index is kept in memory.
+"""
+
+import asyncio
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+import mmap
+import os
+from pathlib import Path
+import struct
+import threading
+from urllib.parse import quote, unquote
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .demand import DATA_GROUP_PROFILE, DATA_GROUP_WORKERS
+
+# Seconds since the previous point, change of the scaled value
+RECORD = struct.Struct("<Ii")
+# First record number, timestamp and scaled value of a block
+INDEX_ENTRY = struct.Struct("<IIq")
+# Records per block; a block also starts early when a change does not fit
+BLOCK_RECORDS = 1024
+# Values are stored as integers in thousandths of their unit
+VALUE_SCALE = 1000
+_INT32_MIN = -(2**31)
+_INT32_MAX = 2**31 - 1
+
+DATA_SUFFIX = ".dat"
+INDEX_SUFFIX = ".idx"
+
+
+class TimeSeries:
+    """One append-only series of (Unix timestamp, value) points."""
+
+    def __init__(self, path: Path):
+        """Initialize."""
+        self._data_path = path.with_name(path.name + DATA_SUFFIX)
+        self._index_path = path.with_name(path.name + INDEX_SUFFIX)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._block_records: list[int] = []
+        self._block_times: list[int] = []
+        self._block_values: list[int] = []
+        self._count = 0
+        self._last_time: int | None = None
+        self._last_value: int | None = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return self._count
+
+    def _load(self) -> None:
+        """Read the index and the last point, once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        index = self._index_path.read_bytes() if self._index_path.exists() else b""
+        index = index[: len(index) - len(index) % INDEX_ENTRY.size]
+        for record, timestamp, value in INDEX_ENTRY.iter_unpack(index):
+            self._block_records.append(record)
+            self._block_times.append(timestamp)
+            self._block_values.append(value)
+        size = self._data_path.stat().st_size if self._data_path.exists() else 0
+        self._count = size // RECORD.size
+        # Index entries are written before their records, so after a crash
+        # there may be entries of blocks whose records were never written.
+        while self._block_records and self._block_records[-1] >= self._count:
+            del self._block_records[-1], self._block_times[-1], self._block_values[-1]
+        if not self._block_records:
+            self._count = 0
+        else:
+            first, last = self._block_bounds(len(self._block_records) - 1)
+            with open(self._data_path, "rb") as data:
+                data.seek(first * RECORD.size)
+                chunk = data.read((last - first) * RECORD.size)
+            for self._last_time, self._last_value in self._decode(
+                len(self._block_records) - 1, chunk
+            ):
+                pass
+        # Drop what the next append would otherwise write after
+        if size != self._count * RECORD.size:
+            with open(self._data_path, "r+b") as data:
+                data.truncate(self._count * RECORD.size)
+        if len(index) != len(self._block_records) * INDEX_ENTRY.size:
+            with open(self._index_path, "r+b") as index_file:
+                index_file.truncate(len(self._block_records) * INDEX_ENTRY.size)
+
+    def _block_bounds(self, block: int) -> tuple[int, int]:
+        """Return the first record of a block and the first one after it."""
+        if block + 1 < len(self._block_records):
+            return self._block_records[block], self._block_records[block + 1]
+        return self._block_records[block], self._count
+
+    def _decode(self, block: int, chunk: bytes) -> Iterator[tuple[int, int]]:
+        """Yield the points of a block's records with their scaled values."""
+        timestamp = self._block_times[block]
+        value = self._block_values[block]
+        for time_delta, value_delta in RECORD.iter_unpack(chunk):
+            timestamp += time_delta
+            value += value_delta
+            yield timestamp, value
+
+    def extend(self, points: Iterable[tuple[int, float]]) -> int:
+        """Append points in time order; return how many were appended.
+
+        Points not newer than the last stored one are skipped.
+        """
+        records = bytearray()
+        index = bytearray()
+        with self._lock:
+            self._load()
+            for timestamp, value in points:
+                timestamp = int(timestamp)
+                scaled = round(value * VALUE_SCALE)
+                if self._last_time is not None and timestamp <= self._last_time:
+                    continue
+                if (
+                    not self._block_records
+                    or self._count - self._block_records[-1] >= BLOCK_RECORDS
+                    or not _INT32_MIN <= scaled - self._last_value <= _INT32_MAX
+                    or timestamp - self._last_time > 2**32 - 1
+                ):
+                    self._block_records.append(self._count)
+                    self._block_times.append(timestamp)
+                    self._block_values.append(scaled)
+                    index += INDEX_ENTRY.pack(self._count, timestamp, scaled)
+                    records += RECORD.pack(0, 0)
+                else:
+                    records += RECORD.pack(
+                        timestamp - self._last_time, scaled - self._last_value
+                    )
+                self._count += 1
+                self._last_time = timestamp
+                self._last_value = scaled
+            if not records:
+                return 0
+            self._data_path.parent.mkdir(parents=True, exist_ok=True)
+            # Index entries before their records, see _load
+            if index:
+                with open(self._index_path, "ab") as index_file:
+                    index_file.write(index)
+            with open(self._data_path, "ab") as data:
+                data.write(records)
+        return len(records) // RECORD.size
+
+    def append(self, timestamp: int, value: float) -> bool:
+        """Append one point; return whether it was newer than the last one."""
+        return self.extend(((timestamp, value),)) == 1
+
+    def iter_range(self, start: int, end: int) -> Iterator[tuple[int, float]]:
+        """Yield the points with start <= timestamp <= end."""
+        with self._lock:
+            self._load()
+            count = self._count
+            blocks = len(self._block_records)
+            first_block = max(bisect_right(self._block_times, start) - 1, 0)
+        if not count:
+            return
+        with (
+            open(self._data_path, "rb") as data_file,
+            mmap.mmap(
+                data_file.fileno(), count * RECORD.size, access=mmap.ACCESS_READ
+            ) as data,
+        ):
+            for block in range(first_block, blocks):
+                if self._block_times[block] > end:
+                    return
+                first, last = self._block_bounds(block)
+                chunk = data[first * RECORD.size : last * RECORD.size]
+                for timestamp, value in self._decode(block, chunk):
+                    if timestamp > end:
+                        return
+                    if timestamp >= start:
+                        yield timestamp, value / VALUE_SCALE
+
+    def query(self, start: int, end: int) -> list[tuple[int, float]]:
+        """Return the points with start <= timestamp <= end."""
+        return list(self.iter_range(start, end))
+
+    def downsample(
+        self, start: int, end: int, interval: int
+    ) -> list[tuple[int, float]]:
+        """Return the mean of every interval that has points, by interval start.
+
+        Intervals are aligned to multiples of ``interval`` seconds.
+        """
+        buckets = []
+        bucket = None
+        total = 0.0
+        points = 0
+        for timestamp, value in self.iter_range(start, end):
+            bucket_start = timestamp - timestamp % interval
+            if bucket_start != bucket:
+                if points:
+                    buckets.append((bucket, total / points))
+                bucket = bucket_start
+                total = 0.0
+                points = 0
+            total += value
+            points += 1
+        if points:
+            buckets.append((bucket, total / points))
+        return buckets
+
+
+class HashrateHistory:
+    """The hash rate series of one account, one pair of files per series."""
+
+    def __init__(self, directory: Path | str):
+        """Initialize."""
+        self.directory = Path(directory)
+        self._series: dict[str, TimeSeries] = {}
+        self._pending: set[asyncio.Future] = set()
+
+    def __getitem__(self, name: str) -> TimeSeries:
+        if name not in self._series:
+            self._series[name] = TimeSeries(self.directory / quote(name, safe=""))
+        return self._series[name]
+
+    def series(self) -> list[str]:
+        """Return the names of all stored series."""
+        if not self.directory.is_dir():
+            return []
+        return sorted(
+            unquote(file.removesuffix(DATA_SUFFIX))
+            for file in os.listdir(self.directory)
+            if file.endswith(DATA_SUFFIX)
+        )
+
+    def record(self, timestamp: int, values: dict[str, float]) -> None:
+        """Append one point to each of the given series."""
+        for name, value in values.items():
+            self[name].append(timestamp, value)
+
+    @callback
+    def async_record(
+        self, hass: HomeAssistant, timestamp: int, values: dict[str, float]
+    ) -> None:
+        """Record the points in the executor, tracked until written."""
+        future = hass.async_add_executor_job(self.record, timestamp, values)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    async def async_flush(self) -> None:
+        """Wait until every recorded point is written."""
+        if self._pending:
+            await asyncio.wait(self._pending)
+
+
+def hashrate_values(data: dict) -> dict[str, float]:
+    """Return the hash rates in a coordinator's data, by series name.
+
+    Account series are named ``<coin>/account``, worker series
+    ``<coin>/worker/<worker name>``; all values are in Gh/s.
+    """
+    values = {}
+    for coin, coin_data in (data.get("coins") or {}).items():
+        if (hash_rate := coin_data.get("pool_5m_hash_rate")) is not None:
+            values[f"{coin}/account"] = float(hash_rate)
+        for worker, worker_data in (coin_data.get("workers") or {}).items():
+            values[f"{coin}/worker/{worker}"] = worker_data.hash_rate_5m
+    return values
+
+
+@callback
+def async_track_hashrate_history(
+    hass: HomeAssistant, coordinator: DataUpdateCoordinator, history: HashrateHistory
+) -> CALLBACK_TYPE:
+    """Record the hash rates after every successful update of a coordinator.
+
+    The history keeps the account and worker hash rates fetched while it
+    is being recorded. Data served stale after a failed update was already
+    recorded when it was fetched, so it adds no point.
+    """
+
+    @callback
+    def _async_record() -> None:
+        if (
+            not coordinator.last_update_success
+            or coordinator.stale
+            or not coordinator.data
+        ):
+            return
+        history.async_record(
+            hass, int(dt_util.utcnow().timestamp()), hashrate_values(coordinator.data)
+        )
+
+    unsubs = [
+        coordinator.demand.add(DATA_GROUP_PROFILE),
+        coordinator.demand.add(DATA_GROUP_WORKERS),
+        coordinator.async_add_listener(_async_record),
+    ]
+
+    @callback
+    def _async_unsub() -> None:
+        for unsub in unsubs:
+            unsub()
+
+    return _async_unsub
@@ -0,0 +1,79 @@
+"""Bounded, redacted tracing of Braiins Pool API exchanges.
+
+Instead of logging full headers and bodies, the API client keeps its last
+exchanges in a ring buffer while debug logging is enabled for the
+integration. Secrets are redacted and bodies truncated when an exchange is
+recorded, and nothing is recorded or formatted while tracing is off. The
+buffer is included in the config entry diagnostics.
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+from .const import REDACTED
+
+DEFAULT_TRACE_SIZE = 50
+# Characters of each response body kept in the trace
+DEFAULT_TRACE_BODY_LIMIT = 2048
+REDACTED_HEADERS = frozenset({"pool-auth-token", "authorization", "cookie"})
+
+
+class RequestTracer:
+    """Ring buffer of the last API exchanges."""
+
+    def __init__(
+        self,
+        secret: str,
+        size: int = DEFAULT_TRACE_SIZE,
+        body_limit: int = DEFAULT_TRACE_BODY_LIMIT,
+    ):
+        """Initialize."""
+        self._secret = secret
+        self._body_limit = body_limit
+        self._exchanges: deque[dict] = deque(maxlen=size)
+
+    def _redact(self, text: str) -> str:
+        return text.replace(self._secret, REDACTED) if self._secret else text
+
+    def _redact_headers(self, headers: Mapping[str, str]) -> dict[str, str]:
+        return {
+            key: REDACTED if key.lower() in REDACTED_HEADERS else self._redact(value)
+            for key, value in headers.items()
+        }
+
+    def record(
+        self,
+        url: str,
+        request_headers: Mapping[str, str],
+        status: int | None = None,
+        response_headers: Mapping[str, str] | None = None,
+        body: str | None = None,
+        elapsed_ms: float | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record one exchange, redacted and with its body truncated."""
+        exchange = {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "url": self._redact(url),
+            "request_headers": self._redact_headers(request_headers),
+            "status": status,
+            "elapsed_ms": elapsed_ms,
+        }
+        if response_headers is not None:
+            exchange["response_headers"] = self._redact_headers(response_headers)
+        if body is not None:
+            exchange["body_length"] = len(body)
+            exchange["body"] = self._redact(body[: self._body_limit])
+            exchange["body_truncated"] = len(body) > self._body_limit
+        if error is not None:
+            exchange["error"] = self._redact(f"{type(error).__name__}: {error}")
+        self._exchanges.append(exchange)
+
+    def dump(self) -> list[dict]:
+        """Return the recorded exchanges, oldest first."""
+        return list(self._exchanges)
+
+    def clear(self) -> None:
+        """Forget all recorded exchanges."""
+        self._exchanges.clear()
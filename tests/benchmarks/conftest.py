@@ -0,0 +1,67 @@
+"""Fixtures for the request/parse/process micro-benchmarks.
+
+Benchmarks are disabled by default and then run each function once as a
+smoke test. Run them for real and store the results with:
+
+    pytest tests/benchmarks --benchmark-enable --benchmark-autosave
+
+and compare two builds with ``--benchmark-compare``. Besides timings, each
+benchmark records the peak memory allocated by one run of its stage in
+``extra_info["peak_alloc_bytes"]``.
+"""
+
+import asyncio
+import contextlib
+import tracemalloc
+
+import aiohttp
+import pytest
+
+from tests.fake_braiins import FakeBraiinsApi
+
+
+@pytest.fixture
+def fake_server(hass, socket_enabled):
+    """Serve the fake API and yield it with its base URL and a session.
+
+    Benchmarks drive the event loop themselves, so this is a synchronous
+    fixture that starts the server on the loop used by the stages.
+    """
+    fake = FakeBraiinsApi()
+    stack = contextlib.AsyncExitStack()
+
+    async def start():
+        base_url = await stack.enter_async_context(fake.serve())
+        session = await stack.enter_async_context(aiohttp.ClientSession())
+        return base_url, session
+
+    base_url, session = hass.loop.run_until_complete(start())
+    yield fake, base_url, session
+    hass.loop.run_until_complete(stack.aclose())
+
+
+@pytest.fixture
+def run_stage(hass, benchmark):
+    """Benchmark one stage given as a function or coroutine function.
+
+    The stage runs once under tracemalloc to record its peak allocations,
+    then as many rounds as pytest-benchmark decides on. Coroutine functions
+    are driven on the Home Assistant loop, so their timings include one
+    run_until_complete. Returns the result of the last run.
+    """
+
+    def run(stage):
+        if asyncio.iscoroutinefunction(stage):
+            func = lambda: hass.loop.run_until_complete(stage())
+        else:
+            func = stage
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_alloc_bytes"] = peak
+        return benchmark(func)
+
+    return run
@@ -0,0 +1,133 @@
+"""Benchmarks of the API client: read, decode, request and convert stages."""
+
+import json
+
+import pytest
+
+from custom_components.braiins_pool.api import (
+    API_HEADERS,
+    API_URL_BLOCK_REWARDS,
+    API_URL_PAYOUTS,
+    API_URL_POOL_STATS,
+    API_URL_USER_PROFILE,
+    API_URL_WORKERS,
+    BraiinsPoolApiClient,
+)
+from tests.fake_braiins import (
+    FAKE_API_KEY,
+    block_rewards_payload,
+    payouts_payload,
+    pool_stats_payload,
+    profile_payload,
+    workers_payload,
+)
+
+# (endpoint, size) -> path on the fake server and the payload it serves
+PAYLOADS = {
+    ("profile", 1): (API_URL_USER_PROFILE.format("btc"), lambda: profile_payload()),
+    ("pool_stats", 15): (
+        API_URL_POOL_STATS.format("btc"),
+        lambda: pool_stats_payload(),
+    ),
+    **{
+        ("workers", size): (
+            API_URL_WORKERS.format("btc"),
+            lambda size=size: workers_payload(workers=size),
+        )
+        for size in (10, 1_000, 10_000)
+    },
+    **{
+        ("block_rewards", days): (
+            API_URL_BLOCK_REWARDS.format("btc", "2024-01-01", to_date),
+            lambda to_date=to_date: block_rewards_payload("2024-01-01", to_date),
+        )
+        for days, to_date in (
+            (1, "2024-01-01"),
+            (30, "2024-01-30"),
+            (365, "2024-12-30"),
+        )
+    },
+    **{
+        ("payouts", days): (
+            API_URL_PAYOUTS.format("btc", "2024-01-01", to_date),
+            lambda to_date=to_date: payouts_payload("2024-01-01", to_date),
+        )
+        for days, to_date in (
+            (7, "2024-01-07"),
+            (90, "2024-03-30"),
+            (365, "2024-12-30"),
+        )
+    },
+}
+HEADERS = {key: value.format(FAKE_API_KEY) for key, value in API_HEADERS.items()}
+
+
+def _workers_for(endpoint, size):
+    return size if endpoint == "workers" else 10
+
+
+@pytest.mark.parametrize("endpoint,size", list(PAYLOADS))
+def test_read(fake_server, run_stage, endpoint, size):
+    """Time reading a response body off the wire."""
+    fake, base_url, session = fake_server
+    fake.workers = _workers_for(endpoint, size)
+    path, _ = PAYLOADS[endpoint, size]
+
+    async def stage():
+        async with session.get(base_url + path, headers=HEADERS) as response:
+            return await response.text()
+
+    body = run_stage(stage)
+    assert json.loads(body)
+
+
+@pytest.mark.parametrize("endpoint,size", list(PAYLOADS))
+def test_decode(run_stage, endpoint, size):
+    """Time decoding a response body into Python objects."""
+    _, payload = PAYLOADS[endpoint, size]
+    body = json.dumps(payload())
+
+    def stage():
+        return json.loads(body)
+
+    assert run_stage(stage) == json.loads(body)
+
+
+@pytest.mark.parametrize("endpoint,size", list(PAYLOADS))
+def test_request(fake_server, run_stage, endpoint, size):
+    """Time the full _request path: read and decode."""
+    fake, base_url, session = fake_server
+    fake.workers = _workers_for(endpoint, size)
+    path, _ = PAYLOADS[endpoint, size]
+    client = BraiinsPoolApiClient(session, FAKE_API_KEY, base_url=base_url)
+
+    async def stage():
+        return await client._request(base_url + path)
+
+    assert run_stage(stage)
+
+
+@pytest.mark.parametrize(
+    "method,payload",
+    [
+        ("get_user_profile", profile_payload()),
+        ("get_account_stats", pool_stats_payload()),
+        ("get_workers", workers_payload(workers=10_000)),
+        ("get_payouts", payouts_payload("2024-01-01", "2024-12-30")),
+    ],
+)
+def test_convert(run_stage, method, payload):
+    """Time converting decoded data into the values the coordinator uses."""
+    client = BraiinsPoolApiClient(None, FAKE_API_KEY)
+
+    async def request(url, endpoint="other"):
+        return payload
+
+    client._request = request
+
+    args = ("2024-01-01", "2024-12-30") if method == "get_payouts" else ()
+
+    async def stage():
+        return await getattr(client, method)(*args)
+
+    assert run_stage(stage)
@@ -0,0 +1,42 @@
+"""Benchmarks of the coordinator build stage."""
+
+from datetime import timedelta
+
+import pytest
+
+from custom_components.braiins_pool.coordinator import BraiinsDataUpdateCoordinator
+from custom_components.braiins_pool.api import (
+    API_URL_POOL_STATS,
+    API_URL_USER_PROFILE,
+    BraiinsPoolApiClient,
+)
+from tests.fake_braiins import FAKE_API_KEY, pool_stats_payload, profile_payload
+
+
+class StaticApiClient(BraiinsPoolApiClient):
+    """API client that serves decoded fixed payloads without any I/O."""
+
+    def __init__(self, coins):
+        super().__init__(None, FAKE_API_KEY)
+        self._payloads = {}
+        for coin in coins:
+            self._payloads[API_URL_USER_PROFILE.format(coin)] = profile_payload(coin)
+            self._payloads[API_URL_POOL_STATS.format(coin)] = pool_stats_payload(coin)
+
+    async def _request(self, url, endpoint="other"):
+        return self._payloads[url.removeprefix(self._base_url)]
+
+
+@pytest.mark.parametrize("coins", [["btc"], ["btc", "zec", "ltc"]])
+def test_coordinator_build(hass, run_stage, coins):
+    """Time building the coordinator data from converted API results."""
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass,
+        StaticApiClient(coins),
+        timedelta(minutes=1),
+        coins=coins,
+    )
+
+    data = run_stage(coordinator._async_update_data)
+
+    assert set(data["coins"]) == set(coins)
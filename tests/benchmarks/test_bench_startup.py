@@ -0,0 +1,74 @@
+"""Benchmarks of the integration's share of Home Assistant startup time."""
+
+import subprocess
+import sys
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.braiins_pool.const import (
+    CONF_API_KEY,
+    CONF_REWARDS_ACCOUNT_NAME,
+    DOMAIN,
+)
+from tests.fake_braiins import FAKE_API_KEY, FakeBraiinsApi
+
+# Times the import alone; the modules Home Assistant has loaded before any
+# integration are imported first.
+IMPORT_SCRIPT = """
+import time
+import homeassistant.components.http
+import homeassistant.components.sensor
+import homeassistant.helpers.aiohttp_client
+import homeassistant.helpers.update_coordinator
+started = time.perf_counter()
+import custom_components.braiins_pool
+print(time.perf_counter() - started)
+"""
+
+
+def test_import(run_stage, benchmark):
+    """Time importing the integration in a fresh interpreter.
+
+    The benchmark timing includes starting the interpreter; the import
+    alone is recorded in ``extra_info["import_seconds"]``.
+    """
+
+    def stage():
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        return float(result.stdout.splitlines()[-1])
+
+    benchmark.extra_info["import_seconds"] = run_stage(stage)
+
+
+def test_setup_entry(hass, run_stage):
+    """Time setting up and unloading an entry, first refresh included."""
+    fake = FakeBraiinsApi()
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_API_KEY: FAKE_API_KEY, CONF_REWARDS_ACCOUNT_NAME: "Benchmark"},
+    )
+    entry.add_to_hass(hass)
+    # Set up the platforms the entry depends on outside of the measurement
+    assert hass.loop.run_until_complete(async_setup_component(hass, "sensor", {}))
+
+    async def stage():
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert entry.state is ConfigEntryState.LOADED
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    with patch(
+        "custom_components.braiins_pool.async_get_clientsession",
+        return_value=fake.session(),
+    ):
+        run_stage(stage)
+    assert entry.state is ConfigEntryState.NOT_LOADED
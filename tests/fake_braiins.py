@@ -0,0 +1,500 @@
+"""Local stand-in for the Braiins Pool API.
+
+Serves every endpoint used by ``api.py`` with deterministic, realistic
+payloads so the client can be tested and measured offline through its real
+``_request`` path: real HTTP, headers, status codes and slow responses.
+
+    fake = FakeBraiinsApi(workers=10_000)
+    async with fake.serve() as base_url:
+        client = BraiinsPoolApiClient(session, FAKE_API_KEY, base_url=base_url)
+
+For many requests without sockets, ``fake.session()`` returns an
+in-process stand-in for ``aiohttp.ClientSession``.
+
+Faults are injected per request:
+
+    fake.latency = 0.2                       # seconds, every request
+    fake.path_latency["/accounts/workers"] = 1.0
+    fake.inject(429, retry_after=30)         # next request is rate limited
+    fake.inject(503, count=3, path="/accounts/profile")
+    fake.truncate(fraction=0.5)              # next body is cut off mid-stream
+    fake.stall(30)                           # next response takes 30 s longer
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+
+from aiohttp import ClientPayloadError, ClientResponseError, web
+from aiohttp.test_utils import TestServer
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+FAKE_API_KEY = "fake_api_key"
+FAKE_USERNAME = "fakeminer"
+# Fixed "now" so generated payloads do not depend on when the tests run
+FAKE_NOW = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def _btc(satoshi: int) -> str:
+    """Format satoshis the way the API formats BTC amounts."""
+    return f"{satoshi / 100_000_000:.8f}"
+
+
+def _ts(moment: datetime) -> int:
+    return int(moment.timestamp())
+
+
+def _days(from_date: str, to_date: str) -> list[date]:
+    start = date.fromisoformat(from_date)
+    end = date.fromisoformat(to_date)
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def profile_payload(coin: str = "btc", workers: int = 10, seed: int = 0) -> dict:
+    """Return a user profile response."""
+    rng = random.Random(f"profile-{coin}-{seed}")
+    hash_rate = workers * rng.uniform(90_000, 110_000)
+    return {
+        "username": FAKE_USERNAME,
+        coin: {
+            "all_time_reward": _btc(rng.randint(10**8, 10**10)),
+            "hash_rate_unit": "Gh/s",
+            "hash_rate_5m": round(hash_rate, 4),
+            "hash_rate_60m": round(hash_rate * rng.uniform(0.95, 1.05), 4),
+            "hash_rate_24h": round(hash_rate * rng.uniform(0.95, 1.05), 4),
+            "hash_rate_yesterday": round(hash_rate * rng.uniform(0.9, 1.1), 4),
+            "low_workers": 0,
+            "off_workers": workers // 20,
+            "ok_workers": workers - workers // 20,
+            "dis_workers": 0,
+            "current_balance": _btc(rng.randint(0, 10**7)),
+            "today_reward": _btc(rng.randint(0, 10**6)),
+            "estimated_reward": _btc(rng.randint(0, 10**6)),
+            "shares_5m": rng.randint(10**6, 10**8),
+            "shares_60m": rng.randint(10**7, 10**9),
+            "shares_24h": rng.randint(10**8, 10**10),
+            "shares_yesterday": rng.randint(10**8, 10**10),
+        },
+    }
+
+
+def workers_payload(coin: str = "btc", workers: int = 10, seed: int = 0) -> dict:
+    """Return a workers response with the given number of workers."""
+    rng = random.Random(f"workers-{coin}-{seed}")
+    now = _ts(FAKE_NOW)
+    entries = {}
+    for index in range(workers):
+        state = "off" if index % 20 == 19 else "ok"
+        hash_rate = 0.0 if state == "off" else rng.uniform(90_000, 110_000)
+        entries[f"{FAKE_USERNAME}.worker{index:05d}"] = {
+            "state": state,
+            "last_share": now - rng.randint(0, 600 if state == "ok" else 86_400),
+            "hash_rate_unit": "Gh/s",
+            "hash_rate_scoring": round(hash_rate, 4),
+            "hash_rate_5m": round(hash_rate * rng.uniform(0.9, 1.1), 4),
+            "hash_rate_60m": round(hash_rate * rng.uniform(0.95, 1.05), 4),
+            "hash_rate_24h": round(hash_rate * rng.uniform(0.98, 1.02), 4),
+            "shares_5m": rng.randint(0, 10**6),
+            "shares_60m": rng.randint(0, 10**7),
+            "shares_24h": rng.randint(0, 10**8),
+        }
+    return {coin: {"workers": entries}}
+
+
+def pool_stats_payload(coin: str = "btc", blocks: int = 15, seed: int = 0) -> dict:
+    """Return a pool statistics response."""
+    rng = random.Random(f"pool-{coin}-{seed}")
+    found = FAKE_NOW
+    height = 825_000
+    block_entries = {}
+    for _ in range(blocks):
+        duration = rng.randint(600, 20_000)
+        block_entries[str(height)] = {
+            "date_found": _ts(found),
+            "mining_duration": duration,
+            "total_shares": rng.randint(10**12, 10**13),
+            "state": "confirmed" if height < 825_000 else "new",
+            "confirmations_left": 0 if height < 825_000 else 100,
+            "value": _btc(rng.randint(625_000_000, 700_000_000)),
+            "user_reward": _btc(rng.randint(0, 10**5)),
+            "pool_scoring_hash_rate": rng.uniform(4e9, 6e9),
+        }
+        found -= timedelta(seconds=duration)
+        height -= rng.randint(3, 12)
+    hash_rate = rng.uniform(4e9, 6e9)
+    return {
+        coin: {
+            "blocks": block_entries,
+            "luck_b10": f"{rng.uniform(0.5, 1.5):.2f}",
+            "luck_b50": f"{rng.uniform(0.8, 1.2):.2f}",
+            "luck_b250": f"{rng.uniform(0.9, 1.1):.2f}",
+            "fpps_rate": rng.uniform(4e-7, 8e-7),
+            "pool_5m_hash_rate": hash_rate,
+            "pool_60m_hash_rate": hash_rate * rng.uniform(0.98, 1.02),
+            "pool_24h_hash_rate": hash_rate * rng.uniform(0.95, 1.05),
+            "update_ts": _ts(FAKE_NOW),
+            "pool_active_workers": rng.randint(40_000, 60_000),
+            "hash_rate_unit": "Gh/s",
+        }
+    }
+
+
+def daily_rewards_payload(coin: str = "btc", days: int = 30, seed: int = 0) -> dict:
+    """Return a daily rewards response covering the given number of days."""
+    rng = random.Random(f"rewards-{coin}-{seed}")
+    today = datetime.combine(FAKE_NOW.date(), datetime.min.time(), timezone.utc)
+    rewards = []
+    for offset in range(days):
+        mining = rng.randint(10**5, 10**6)
+        bonus = rng.randint(0, 10**4)
+        rewards.append(
+            {
+                "date": _ts(today - timedelta(days=offset)),
+                "total_reward": _btc(mining + bonus),
+                "mining_reward": _btc(mining),
+                "bos_plus_reward": _btc(bonus),
+                "referral_bonus": _btc(0),
+                "referral_reward": _btc(0),
+            }
+        )
+    return {coin: {"daily_rewards": rewards}}
+
+
+def daily_hashrate_payload(
+    group: str = "user", coin: str = "btc", days: int = 30, seed: int = 0
+) -> dict:
+    """Return a daily hash rate response covering the given number of days."""
+    rng = random.Random(f"hashrate-{group}-{coin}-{seed}")
+    today = datetime.combine(FAKE_NOW.date(), datetime.min.time(), timezone.utc)
+    return {
+        coin: {
+            "daily_hash_rate": [
+                {
+                    "date": _ts(today - timedelta(days=offset)),
+                    "hash_rate_unit": "Gh/s",
+                    "hash_rate_24h": round(rng.uniform(9e5, 1.1e6), 4),
+                }
+                for offset in range(days)
+            ]
+        }
+    }
+
+
+def block_rewards_payload(
+    from_date: str, to_date: str, coin: str = "btc", per_day: int = 8, seed: int = 0
+) -> dict:
+    """Return a block rewards response for a date range."""
+    rng = random.Random(f"blocks-{coin}-{from_date}-{to_date}-{seed}")
+    rewards = []
+    for day in _days(from_date, to_date):
+        start = datetime.combine(day, datetime.min.time(), timezone.utc)
+        for block in range(per_day):
+            rewards.append(
+                {
+                    "block_found_at": _ts(start + timedelta(hours=3 * block)),
+                    "pool_scoring_hash_rate": rng.uniform(4e9, 6e9),
+                    "user_scoring_hash_rate": rng.uniform(9e5, 1.1e6),
+                    "block_value": _btc(rng.randint(625_000_000, 700_000_000)),
+                    "fee": _btc(rng.randint(0, 10**4)),
+                    "user_reward": _btc(rng.randint(10**3, 10**5)),
+                }
+            )
+    return {coin: {"block_rewards": rewards}}
+
+
+def payouts_payload(
+    from_date: str, to_date: str, coin: str = "btc", seed: int = 0
+) -> dict:
+    """Return a payouts response for a date range with one payout a day."""
+    rng = random.Random(f"payouts-{coin}-{from_date}-{to_date}-{seed}")
+    payouts = []
+    for day in _days(from_date, to_date):
+        requested = datetime.combine(day, datetime.min.time(), timezone.utc)
+        payouts.append(
+            {
+                "requested_at": _ts(requested + timedelta(hours=1)),
+                "resolved_at": _ts(requested + timedelta(hours=2)),
+                "status": "confirmed",
+                "amount": _btc(rng.randint(10**5, 10**7)),
+                "fee": _btc(0),
+                "tx_id": hashlib.sha256(f"{coin}{day}{seed}".encode()).hexdigest(),
+                "address": "bc1qfakefakefakefakefakefakefakefakefake0",
+            }
+        )
+    return {coin: {"payouts": payouts}}
+
+
+@dataclass
+class Fault:
+    """A fault injected into the next matching responses."""
+
+    status: int | None = None
+    path: str | None = None
+    count: int = 1
+    retry_after: int | None = None
+    truncate_fraction: float | None = None
+    delay: float | None = None
+
+    def matches(self, path: str) -> bool:
+        return self.path is None or path.startswith(self.path)
+
+
+@dataclass
+class FakeResponse:
+    """A response computed by FakeBraiinsApi, independent of the transport."""
+
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    truncate_at: int | None = None
+
+
+@dataclass
+class FakeBraiinsApi:
+    """In-memory Braiins Pool API with latency and fault injection."""
+
+    api_keys: set[str] = field(default_factory=lambda: {FAKE_API_KEY})
+    workers: int = 10
+    seed: int = 0
+    latency: float = 0.0
+    path_latency: dict[str, float] = field(default_factory=dict)
+    etags: bool = True
+    faults: list[Fault] = field(default_factory=list)
+    # Set to False for long runs: only the per-path counts are kept then
+    record_requests: bool = True
+    requests: list[tuple[str, dict[str, str]]] = field(default_factory=list)
+    counts: Counter = field(default_factory=Counter)
+    _body_cache: dict = field(default_factory=dict, repr=False)
+
+    def inject(
+        self,
+        status: int,
+        count: int = 1,
+        path: str | None = None,
+        retry_after: int | None = None,
+    ) -> None:
+        """Answer the next count matching requests with an error status."""
+        self.faults.append(Fault(status, path, count, retry_after))
+
+    def truncate(
+        self, fraction: float = 0.5, count: int = 1, path: str | None = None
+    ) -> None:
+        """Cut off the next count matching bodies after a fraction of bytes."""
+        self.faults.append(Fault(path=path, count=count, truncate_fraction=fraction))
+
+    def stall(self, seconds: float, count: int = 1, path: str | None = None) -> None:
+        """Delay the next count matching responses by extra seconds."""
+        self.faults.append(Fault(path=path, count=count, delay=seconds))
+
+    def request_count(self, path_prefix: str = "") -> int:
+        """Return how many requests were made to paths with a prefix."""
+        return sum(
+            count for path, count in self.counts.items() if path.startswith(path_prefix)
+        )
+
+    def _take_fault(self, path: str) -> Fault | None:
+        for fault in self.faults:
+            if fault.matches(path):
+                fault.count -= 1
+                if fault.count <= 0:
+                    self.faults.remove(fault)
+                return fault
+        return None
+
+    def _body(self, path: str, query: dict[str, str]) -> tuple[bytes, str] | None:
+        """Return the encoded body and ETag for a path, generated once."""
+        key = (path, tuple(sorted(query.items())), self.workers, self.seed)
+        if key not in self._body_cache:
+            payload = self._payload(path, query)
+            if payload is None:
+                return None
+            body = json.dumps(payload).encode()
+            self._body_cache[key] = body, f'"{hashlib.sha1(body).hexdigest()}"'
+        return self._body_cache[key]
+
+    def _payload(self, path: str, query: dict[str, str]) -> dict | None:
+        parts = [part for part in path.split("/") if part]
+        payload = None
+        match parts:
+            case ["stats", "json", coin]:
+                payload = pool_stats_payload(coin, seed=self.seed)
+            case ["accounts", "profile", "json", coin]:
+                payload = profile_payload(coin, self.workers, self.seed)
+            case ["accounts", "workers", "json", coin]:
+                payload = workers_payload(coin, self.workers, self.seed)
+            case ["accounts", "rewards", "json", coin]:
+                payload = daily_rewards_payload(coin, seed=self.seed)
+            case ["accounts", "hash_rate_daily", "json", group, coin]:
+                payload = daily_hashrate_payload(group, coin, seed=self.seed)
+            case ["accounts", "block_rewards", "json", coin]:
+                payload = block_rewards_payload(
+                    query["from"], query["to"], coin, seed=self.seed
+                )
+            case ["accounts", "payouts", "json", coin]:
+                payload = payouts_payload(
+                    query["from"], query["to"], coin, seed=self.seed
+                )
+        return payload
+
+    async def handle(
+        self, path: str, query: dict[str, str], headers: dict[str, str]
+    ) -> FakeResponse:
+        """Compute the response to a GET request."""
+        self.counts[path] += 1
+        if self.record_requests:
+            self.requests.append((path, dict(headers)))
+        fault = self._take_fault(path)
+        delay = self.latency + max(
+            (
+                extra
+                for prefix, extra in self.path_latency.items()
+                if path.startswith(prefix)
+            ),
+            default=0.0,
+        )
+        if fault is not None and fault.delay is not None:
+            delay += fault.delay
+        if delay:
+            await asyncio.sleep(delay)
+
+        if fault is not None and fault.status is not None:
+            fault_headers = {"Content-Type": "text/plain"}
+            if fault.retry_after is not None:
+                fault_headers["Retry-After"] = str(fault.retry_after)
+            return FakeResponse(fault.status, fault_headers, b"Injected fault")
+
+        if headers.get("Pool-Auth-Token") not in self.api_keys:
+            return FakeResponse(403, {"Content-Type": "text/plain"}, b"Forbidden")
+
+        try:
+            cached = self._body(path, query)
+        except (KeyError, ValueError):
+            return FakeResponse(400, {"Content-Type": "text/plain"}, b"Bad Request")
+        if cached is None:
+            return FakeResponse(404, {"Content-Type": "text/plain"}, b"Not Found")
+
+        body, etag = cached
+        response_headers = {"Content-Type": "application/json"}
+        if self.etags:
+            response_headers["ETag"] = etag
+            if headers.get("If-None-Match") == etag:
+                return FakeResponse(304, response_headers, b"")
+
+        truncate_at = None
+        if fault is not None and fault.truncate_fraction is not None:
+            truncate_at = int(len(body) * fault.truncate_fraction)
+        return FakeResponse(200, response_headers, body, truncate_at)
+
+    async def _web_handler(self, request: web.Request) -> web.StreamResponse:
+        result = await self.handle(
+            request.path, dict(request.query), dict(request.headers)
+        )
+        if result.truncate_at is None:
+            return web.Response(
+                status=result.status, headers=result.headers, body=result.body
+            )
+        # Announce the full body, send part of it and drop the connection.
+        response = web.StreamResponse(status=result.status, headers=result.headers)
+        response.content_length = len(result.body)
+        await response.prepare(request)
+        await response.write(result.body[: result.truncate_at])
+        request.transport.close()
+        return response
+
+    def make_app(self) -> web.Application:
+        """Return an aiohttp application serving this fake API."""
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self._web_handler)
+        return app
+
+    @contextlib.asynccontextmanager
+    async def serve(self):
+        """Serve the fake API on a local port and yield its base URL."""
+        server = TestServer(self.make_app(), host="127.0.0.1")
+        await server.start_server()
+        try:
+            yield str(server.make_url("")).rstrip("/")
+        finally:
+            await server.close()
+
+    def session(self) -> "FakeClientSession":
+        """Return an in-process session answering from this fake API.
+
+        Skips sockets and HTTP parsing entirely, for runs that make far more
+        requests than a local server could answer in time.
+        """
+        return FakeClientSession(self)
+
+
+class FakeClientResponse:
+    """The subset of aiohttp.ClientResponse used by the API client."""
+
+    def __init__(self, url: URL, result: FakeResponse) -> None:
+        self.url = url
+        self.status = result.status
+        self.headers = CIMultiDictProxy(CIMultiDict(result.headers))
+        self._result = result
+
+    async def read(self) -> bytes:
+        if self._result.truncate_at is not None:
+            raise ClientPayloadError("Response payload is not completed")
+        return self._result.body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return (await self.read()).decode(encoding)
+
+    async def json(self, **kwargs):
+        return json.loads(await self.read())
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise ClientResponseError(
+                None, (), status=self.status, message="Fake", headers=self.headers
+            )
+
+    def release(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "FakeClientResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+class _FakeRequestContext:
+    def __init__(self, coro) -> None:
+        self._coro = coro
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self) -> FakeClientResponse:
+        return await self._coro
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+class FakeClientSession:
+    """The subset of aiohttp.ClientSession used by the API client."""
+
+    def __init__(self, fake: FakeBraiinsApi) -> None:
+        self._fake = fake
+        self.closed = False
+
+    def get(self, url: str, headers: dict[str, str] | None = None, **kwargs):
+        return _FakeRequestContext(self._get(URL(url), headers or {}))
+
+    async def _get(self, url: URL, headers: dict[str, str]) -> FakeClientResponse:
+        result = await self._fake.handle(url.path, dict(url.query), headers)
+        return FakeClientResponse(url, result)
+
+    async def close(self) -> None:
+        self.closed = True
@@ -0,0 +1,242 @@
+"""Scale and soak test: many entries polling for days on a simulated clock.
+
+Sets up account entries against the in-process fake API and advances a
+frozen clock poll by poll, so simulated days pass in seconds. The defaults
+keep this a quick smoke test; scale it up with environment variables:
+
+    SOAK_ENTRIES=500 SOAK_HOURS=48 SOAK_REPORT=soak.json pytest tests/soak -s
+
+SOAK_TRACEMALLOC=1 additionally traces allocations and reports the source
+lines whose memory grew the most, at the cost of a slower run.
+
+The report covers event-loop lag (how long the loop stays busy handling one
+poll cycle of all entries), request counts by endpoint, memory growth after
+warm-up and state writes per entry.
+"""
+
+import gc
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, time as dt_time, timedelta, timezone
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import RANDOM_MICROSECOND_MAX, RANDOM_MICROSECOND_MIN
+import homeassistant.util.dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_fire_time_changed_exact,
+)
+
+from custom_components.braiins_pool.api import API_URL_POOL_STATS, API_URL_USER_PROFILE
+from custom_components.braiins_pool.const import (
+    CONF_API_KEY,
+    CONF_REWARDS_ACCOUNT_NAME,
+    DAY_ROLLOVER_REFRESH_SECS,
+    DEFAULT_POOL_STATS_TTL_MINS,
+    DEFAULT_SCAN_INTERVAL_MINS,
+    DOMAIN,
+)
+from tests.fake_braiins import FakeBraiinsApi
+
+ENTRIES = int(os.environ.get("SOAK_ENTRIES", "3"))
+HOURS = float(os.environ.get("SOAK_HOURS", "4"))
+REPORT = os.environ.get("SOAK_REPORT")
+TRACE_MEMORY = os.environ.get("SOAK_TRACEMALLOC") == "1"
+
+POLL_INTERVAL = timedelta(minutes=DEFAULT_SCAN_INTERVAL_MINS)
+# Start shortly before a UTC midnight so the day rollover is covered
+START = "2024-01-15 21:00:00+00:00"
+# Fires the day rollover timers of a second, but not its polls
+ROLLOVER_FIRE_DELAY = timedelta(
+    microseconds=(RANDOM_MICROSECOND_MIN + RANDOM_MICROSECOND_MAX) // 2
+)
+
+
+def _wall_clock() -> float:
+    """Return real elapsed time; freezegun patches perf_counter and monotonic."""
+    return time.clock_gettime(time.CLOCK_MONOTONIC)
+
+
+def _rollover_times(start: datetime, end: datetime) -> list[datetime]:
+    """Return the times of the day rollover refreshes after start, up to end."""
+    offset = timedelta(seconds=DAY_ROLLOVER_REFRESH_SECS)
+    midnight = datetime.combine(start.date(), dt_time.min, timezone.utc)
+    times = []
+    while midnight - offset <= end:
+        times.extend((midnight - offset, midnight + offset))
+        midnight += timedelta(days=1)
+    return [moment for moment in times if start < moment <= end]
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[int(len(ordered) * 0.95)],
+        "max": ordered[-1],
+    }
+
+
+async def test_soak(hass, freezer):
+    """Poll ENTRIES accounts for HOURS simulated hours and report."""
+    # The test loop runs in debug mode, which records a traceback for every
+    # callback and task; that would dominate the measured loop lag.
+    hass.loop.set_debug(False)
+    now = datetime.fromisoformat(START)
+    freezer.move_to(now)
+    fake = FakeBraiinsApi(
+        api_keys={f"key{index}" for index in range(ENTRIES)}, record_requests=False
+    )
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                CONF_API_KEY: f"key{index}",
+                CONF_REWARDS_ACCOUNT_NAME: f"account{index}",
+            },
+            unique_id=f"account{index}",
+        )
+        for index in range(ENTRIES)
+    ]
+
+    # Home Assistant spreads timers over the first half second after their
+    # due time at random. Pinning the spread puts the day rollover timers
+    # before ROLLOVER_FIRE_DELAY and the polls after it, so every run
+    # refreshes the same.
+    with (
+        patch(
+            "custom_components.braiins_pool.async_get_clientsession",
+            return_value=fake.session(),
+        ),
+        patch(
+            "homeassistant.helpers.event.randint",
+            return_value=RANDOM_MICROSECOND_MIN,
+        ),
+        patch(
+            "homeassistant.helpers.update_coordinator.randint",
+            return_value=RANDOM_MICROSECOND_MAX,
+        ),
+    ):
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    entity_entries = {
+        entity.entity_id: entity.config_entry_id
+        for entity in registry.entities.values()
+        if entity.platform == DOMAIN and entity.disabled_by is None
+    }
+    sensors = Counter(entity_entries.values())
+    writes = Counter()
+    refresh_times = {entry.entry_id: [] for entry in entries}
+    for entry in entries:
+        times = refresh_times[entry.entry_id]
+        entry.async_on_unload(
+            hass.data[DOMAIN][entry.entry_id].async_add_listener(
+                lambda times=times: times.append(dt_util.utcnow())
+            )
+        )
+
+    @callback
+    def is_ours(event_data) -> bool:
+        return event_data["entity_id"] in entity_entries
+
+    @callback
+    def count_write(event) -> None:
+        writes[entity_entries[event.data["entity_id"]]] += 1
+
+    for event_type in (EVENT_STATE_CHANGED, EVENT_STATE_REPORTED):
+        hass.bus.async_listen(event_type, count_write, event_filter=is_ours)
+
+    steps = int(timedelta(hours=HOURS) / POLL_INTERVAL)
+    warmup_steps = min(steps // 4, int(timedelta(hours=1) / POLL_INTERVAL))
+    lag = []
+    wall_start = _wall_clock()
+    for step in range(steps):
+        if step == warmup_steps:
+            gc.collect()
+            objects_start = len(gc.get_objects())
+            if TRACE_MEMORY:
+                tracemalloc.start()
+                snapshot_start = tracemalloc.take_snapshot()
+        poll_time = now + POLL_INTERVAL
+        cycle_start = _wall_clock()
+        # The day rollover refreshes fall between two polls. Their timers
+        # are fired on their own, before any poll due in the same second.
+        for moment in _rollover_times(now, poll_time):
+            freezer.move_to(moment)
+            async_fire_time_changed_exact(hass, moment + ROLLOVER_FIRE_DELAY)
+            await hass.async_block_till_done(wait_background_tasks=True)
+        freezer.move_to(poll_time)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        now = poll_time
+        lag.append((_wall_clock() - cycle_start) * 1000)
+    wall_seconds = _wall_clock() - wall_start
+
+    gc.collect()
+    memory = {
+        "gc_objects_after_warmup": objects_start,
+        "gc_objects_at_end": len(gc.get_objects()),
+    }
+    memory["gc_object_growth"] = (
+        memory["gc_objects_at_end"] - memory["gc_objects_after_warmup"]
+    )
+    if TRACE_MEMORY:
+        snapshot_end = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        growth = snapshot_end.compare_to(snapshot_start, "lineno")
+        memory["traced_growth_kib"] = sum(stat.size_diff for stat in growth) / 1024
+        memory["top_growth"] = [str(stat) for stat in growth[:10]]
+
+    profile_path = API_URL_USER_PROFILE.format("btc")
+    pool_stats_path = API_URL_POOL_STATS.format("btc")
+    write_counts = [writes[entry.entry_id] for entry in entries]
+    report = {
+        "entries": ENTRIES,
+        "simulated_hours": HOURS,
+        "poll_cycles": steps,
+        "wall_seconds": round(wall_seconds, 3),
+        "loop_lag_ms": _percentiles(lag),
+        "requests": dict(fake.counts),
+        "profile_requests_per_entry": fake.request_count(profile_path) / ENTRIES,
+        "memory": memory,
+        "state_writes_per_entry": {
+            "min": min(write_counts),
+            "mean": statistics.mean(write_counts),
+            "max": max(write_counts),
+        },
+    }
+    print(json.dumps(report, indent=2))
+    if REPORT:
+        with open(REPORT, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # A refresh around midnight postpones the next poll, so it takes the
+    # place of one: every entry refreshes once per cycle plus its first
+    # refresh. Pool stats are fetched once per cache TTL for all entries.
+    assert fake.request_count(profile_path) == ENTRIES * (steps + 1)
+    assert fake.request_count(pool_stats_path) <= (
+        steps // DEFAULT_POOL_STATS_TTL_MINS + 2
+    )
+    rollover_times = _rollover_times(datetime.fromisoformat(START), now)
+    for entry, write_count in zip(entries, write_counts):
+        times = refresh_times[entry.entry_id]
+        assert len(times) == steps
+        assert set(rollover_times) <= set(times)
+        # Every refresh, those around midnight included, writes every sensor
+        assert write_count == steps * sensors[entry.entry_id]
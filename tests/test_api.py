@@ -1,16 +1,30 @@
 import aiohttp
 import asyncio
+import contextlib
 import json
 import logging
+import time
 import pytest
 from aiohttp import ClientError
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from unittest.mock import AsyncMock, patch, MagicMock
 
 from custom_components.braiins_pool.api import (
+    REQUEST_TIMEOUTS,
     BraiinsPoolApiClient,
     BraiinsPoolApiException,
+    BraiinsPoolAuthError,
+    BraiinsPoolSchemaError,
+)
+from custom_components.braiins_pool.schema import BlockReward, DailyReward, Worker
+from custom_components.braiins_pool.tracing import DEFAULT_TRACE_BODY_LIMIT
+from tests.fake_braiins import (
+    FAKE_API_KEY,
+    FakeBraiinsApi,
+    block_rewards_payload,
+    daily_hashrate_payload,
+    payouts_payload,
 )
 
 logging.basicConfig(level=logging.DEBUG)
@@ -75,6 +89,9 @@ class JustAMockResponse:
             raise self._raise_json_error_type("Mocked JSON decode error", "doc", 0)
         return self._json_data
 
+    async def read(self):
+        return self._text_data.encode()
+
     async def text(self):
         return self._text_data
 
@@ -133,27 +150,101 @@ async def test_get_user_profile_success(mock_logger, api_client_fixture):
     mock_session.get.assert_called_once_with(
         "https://pool.braiins.com/accounts/profile/json/btc/",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["profile"],
     )
     assert processed_data == expected_processed_data
     mock_logger.debug.assert_called()
 
 
+async def test_get_user_profile_other_coin(api_client_fixture):
+    api_client, mock_session, api_key = api_client_fixture
+    raw_api_data = {
+        "zec": {
+            "current_balance": "3.5",
+            "today_reward": "0.2",
+            "all_time_reward": "42",
+            "ok_workers": 2,
+            "hash_rate_5m": "100.5",
+        }
+    }
+    mock_session.get.return_value = mock_response_factory(json_data=raw_api_data)
+
+    processed_data = await api_client.get_user_profile("zec")
+
+    mock_session.get.assert_called_once_with(
+        "https://pool.braiins.com/accounts/profile/json/zec/",
+        headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["profile"],
+    )
+    assert processed_data == {
+        "current_balance": Decimal("3.5"),
+        "today_reward": Decimal("0.2"),
+        "all_time_reward": Decimal("42"),
+        "ok_workers": 2,
+        "pool_5m_hash_rate": 100.5,
+    }
+
+
 @patch("custom_components.braiins_pool.api._LOGGER")
 async def test_get_account_stats_success(mock_logger, api_client_fixture):
     api_client, mock_session, api_key = api_client_fixture
-    mock_data = {"test": "data"}
-    mock_session.get.return_value = mock_response_factory(json_data=mock_data)
-    # get_account_stats now calls _request and returns the raw response from _request
+    raw_api_data = {
+        "btc": {
+            "blocks": {
+                "820000": {
+                    "date_found": 1700000000,
+                    "mining_duration": 4200,
+                    "state": "confirmed",
+                    "value": "6.25",
+                },
+                "820010": {
+                    "date_found": 1700003600,
+                    "mining_duration": 3600,
+                    "state": "confirmed",
+                    "value": "6.30000000",
+                },
+            },
+            "luck_b10": "0.73",
+            "luck_b50": "1.11",
+            "luck_b250": "0.99",
+            "pool_5m_hash_rate": 5149358888.125,
+            "pool_60m_hash_rate": 5100000000.0,
+            "pool_24h_hash_rate": 5000000000.5,
+            "pool_active_workers": 42317,
+            "hash_rate_unit": "Gh/s",
+        }
+    }
+    mock_session.get.return_value = mock_response_factory(json_data=raw_api_data)
     data = await api_client.get_account_stats()
 
     mock_session.get.assert_called_once_with(
         "https://pool.braiins.com/stats/json/btc",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["pool_stats"],
     )
-    assert data == mock_data
+    assert data == {
+        "hash_rate_5m": 5149358888.125,
+        "hash_rate_60m": 5100000000.0,
+        "hash_rate_24h": 5000000000.5,
+        "active_workers": 42317,
+        "luck_b10": 0.73,
+        "luck_b50": 1.11,
+        "luck_b250": 0.99,
+        "recent_blocks": 2,
+        "last_block_height": 820010,
+        "last_block_found": datetime(2023, 11, 14, 23, 13, 20, tzinfo=timezone.utc),
+        "last_block_value": Decimal("6.30000000"),
+    }
     mock_logger.debug.assert_called()
 
 
+async def test_get_account_stats_missing_coin(api_client_fixture):
+    api_client, mock_session, _ = api_client_fixture
+    mock_session.get.return_value = mock_response_factory(json_data={"test": "data"})
+
+    assert await api_client.get_account_stats() == {}
+
+
 @patch("custom_components.braiins_pool.api._LOGGER")
 async def test_request_returns_non_json_response_content_type_error(
     mock_logger, api_client_fixture
@@ -209,19 +300,15 @@ async def test_request_returns_non_json_response_json_decode_error(
     assert "Status: 200" in str(excinfo.value)  # Changed to capital S
     assert "{malformed_json"[:100] in str(excinfo.value)
 
-    # Check for debug logs
-    assert any(
-        call.args[0] == "Making API request to: %s, Headers: %s"
+    # Headers and body go to the redacted trace instead of the debug log
+    assert not any(
+        "{malformed_json" in map(str, call.args)
         for call in mock_logger.debug.call_args_list
-    ), "Request URL and headers not logged at DEBUG level"
-    assert any(
-        call.args[0] == "Received API response: Status: %s, Headers: %s"
-        for call in mock_logger.debug.call_args_list
-    ), "Response status and headers not logged at DEBUG level"
-    assert any(
-        call.args[0] == "API Response Body: %s" and call.args[1] == "{malformed_json"
-        for call in mock_logger.debug.call_args_list
-    ), "Response body not logged at DEBUG level or content mismatch"
+    ), "Response body logged at DEBUG level"
+    (exchange,) = api_client.tracer.dump()
+    assert exchange["status"] == 200
+    assert exchange["body"] == "{malformed_json"
+    assert exchange["request_headers"]["Pool-Auth-Token"] == "**REDACTED**"
 
     mock_logger.error.assert_called_once()
     args, kwargs = (
@@ -236,6 +323,34 @@ async def test_request_returns_non_json_response_json_decode_error(
     assert args[3] == "{malformed_json"  # Expected response text
 
 
+@patch("custom_components.braiins_pool.api._LOGGER")
+async def test_non_json_response_body_is_truncated(mock_logger, api_client_fixture):
+    api_client, mock_session, _ = api_client_fixture
+    body = '{"btc": {"workers": {' + "x" * 100_000
+    mock_session.get.return_value = mock_response_factory(
+        status=200, text_data=body, raise_json_error_type=json.JSONDecodeError
+    )
+
+    with pytest.raises(BraiinsPoolApiException) as excinfo:
+        await api_client.get_account_stats()
+
+    assert len(str(excinfo.value)) < DEFAULT_TRACE_BODY_LIMIT + 200
+    assert str(excinfo.value).endswith(f"({len(body)} characters)")
+    args, _ = mock_logger.error.call_args
+    assert args[3] == str(excinfo.value).split("Body: ", 1)[1]
+
+
+async def test_response_size_is_counted_in_bytes(api_client_fixture):
+    api_client, mock_session, _ = api_client_fixture
+    body = '{"btc": {"pool_name": "Braiins Pool ₿"}}'
+    mock_session.get.return_value = mock_response_factory(status=200, text_data=body)
+
+    await api_client.get_account_stats()
+
+    stats = api_client.metrics.endpoints["pool_stats"]
+    assert stats.response_bytes_total == len(body.encode()) > len(body)
+
+
 @patch("custom_components.braiins_pool.api._LOGGER")
 async def test_get_account_stats_401(mock_logger, api_client_fixture):
     api_client, mock_session, api_key = api_client_fixture
@@ -250,6 +365,7 @@ async def test_get_account_stats_401(mock_logger, api_client_fixture):
     mock_session.get.assert_called_once_with(
         "https://pool.braiins.com/stats/json/btc",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["pool_stats"],
     )
     mock_response_obj.raise_for_status.assert_called_once()
     mock_logger.error.assert_called()
@@ -269,6 +385,7 @@ async def test_get_account_stats_other_error(mock_logger, api_client_fixture):
     mock_session.get.assert_called_once_with(
         "https://pool.braiins.com/stats/json/btc",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["pool_stats"],
     )
     mock_response_obj.raise_for_status.assert_called_once()
     mock_logger.error.assert_called()
@@ -277,14 +394,26 @@ async def test_get_account_stats_other_error(mock_logger, api_client_fixture):
 @patch("custom_components.braiins_pool.api._LOGGER")
 async def test_get_daily_rewards_success(mock_logger, api_client_fixture):
     api_client, mock_session, api_key = api_client_fixture
-    mock_data = {"btc": {"daily_rewards": [{"total_reward": "0.12345"}]}}
+    mock_data = {
+        "btc": {"daily_rewards": [{"date": 1704067200, "total_reward": "0.12345"}]}
+    }
     mock_session.get.return_value = mock_response_factory(json_data=mock_data)
     data = await api_client.get_daily_rewards()
     mock_session.get.assert_called_once_with(
         "https://pool.braiins.com/accounts/rewards/json/btc",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["daily_rewards"],
     )
-    assert data == mock_data
+    assert data == [
+        DailyReward(
+            date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            total_reward=Decimal("0.12345"),
+            mining_reward=Decimal("0"),
+            bos_plus_reward=Decimal("0"),
+            referral_bonus=Decimal("0"),
+            referral_reward=Decimal("0"),
+        )
+    ]
     mock_logger.debug.assert_called()
 
 
@@ -302,6 +431,7 @@ async def test_get_daily_rewards_401(mock_logger, api_client_fixture):
     mock_session.get.assert_called_once_with(
         "https://pool.braiins.com/accounts/rewards/json/btc",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["daily_rewards"],
     )
     mock_response_obj.raise_for_status.assert_called_once()
     mock_logger.error.assert_called()
@@ -320,7 +450,9 @@ async def test_get_daily_rewards_client_error(mock_logger, api_client_fixture):
 
     assert "Network issue" in str(excinfo.value)
     mock_session.get.assert_called_once_with(
-        expected_url, headers={"Pool-Auth-Token": api_key, "Accept": "application/json"}
+        expected_url,
+        headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["daily_rewards"],
     )
     mock_logger.debug.assert_called()
     mock_logger.error.assert_not_called()
@@ -329,58 +461,312 @@ async def test_get_daily_rewards_client_error(mock_logger, api_client_fixture):
 @patch("custom_components.braiins_pool.api._LOGGER")
 async def test_get_daily_hashrate_success(mock_logger, api_client_fixture):
     api_client, mock_session, api_key = api_client_fixture
-    mock_data = {"test": "daily_hashrate_data"}
+    mock_data = daily_hashrate_payload(days=2)
     mock_session.get.return_value = mock_response_factory(json_data=mock_data)
     data = await api_client.get_daily_hashrate()
     mock_session.get.assert_called_once_with(
         "https://pool.braiins.com/accounts/hash_rate_daily/json/user/btc",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["daily_hashrate"],
+    )
+    assert [record.date for record in data] == [
+        datetime(2024, 1, 15, tzinfo=timezone.utc),
+        datetime(2024, 1, 14, tzinfo=timezone.utc),
+    ]
+    assert (
+        data[0].hash_rate_24h == mock_data["btc"]["daily_hash_rate"][0]["hash_rate_24h"]
     )
-    assert data == mock_data
     mock_logger.debug.assert_called()
 
 
 @patch("custom_components.braiins_pool.api._LOGGER")
 async def test_get_block_rewards_success(mock_logger, api_client_fixture):
     api_client, mock_session, api_key = api_client_fixture
-    mock_data = {"test": "block_rewards_data"}
     from_date = "2023-10-01"
     to_date = "2023-10-07"
+    mock_data = block_rewards_payload(from_date, to_date)
     mock_session.get.return_value = mock_response_factory(json_data=mock_data)
     data = await api_client.get_block_rewards(from_date, to_date)
     mock_session.get.assert_called_once_with(
         f"https://pool.braiins.com/accounts/block_rewards/json/btc?from={from_date}&to={to_date}",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["daily_rewards"],
+    )
+    assert len(data) == 7 * 8
+    raw = mock_data["btc"]["block_rewards"][0]
+    assert data[0] == BlockReward(
+        block_found_at=datetime(2023, 10, 1, tzinfo=timezone.utc),
+        block_value=Decimal(raw["block_value"]),
+        fee=Decimal(raw["fee"]),
+        user_reward=Decimal(raw["user_reward"]),
+        pool_scoring_hash_rate=raw["pool_scoring_hash_rate"],
+        user_scoring_hash_rate=raw["user_scoring_hash_rate"],
     )
-    assert data == mock_data
     mock_logger.debug.assert_called()
 
 
 @patch("custom_components.braiins_pool.api._LOGGER")
 async def test_get_workers_success(mock_logger, api_client_fixture):
     api_client, mock_session, api_key = api_client_fixture
-    mock_data = {"test": "workers_data"}
+    mock_data = {
+        "btc": {
+            "workers": {
+                "miner.rig1": {
+                    "state": "ok",
+                    "last_share": 1700000000,
+                    "hash_rate_unit": "Gh/s",
+                    "hash_rate_scoring": 101.5,
+                    "hash_rate_5m": "100.25",
+                    "hash_rate_60m": 99,
+                    "hash_rate_24h": 98.5,
+                }
+            }
+        }
+    }
     mock_session.get.return_value = mock_response_factory(json_data=mock_data)
     data = await api_client.get_workers()
     mock_session.get.assert_called_once_with(
         "https://pool.braiins.com/accounts/workers/json/btc/",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["workers"],
     )
-    assert data == mock_data
+    assert data == {"miner.rig1": Worker("ok", 1700000000, 101.5, 100.25, 99.0, 98.5)}
     mock_logger.debug.assert_called()
 
 
 @patch("custom_components.braiins_pool.api._LOGGER")
 async def test_get_payouts_success(mock_logger, api_client_fixture):
     api_client, mock_session, api_key = api_client_fixture
-    mock_data = {"test": "payouts_data"}
     from_date = "2023-10-01"
     to_date = "2023-10-07"
+    mock_data = payouts_payload(from_date, to_date)
+    # A payout still pending has no transaction yet
+    mock_data["btc"]["payouts"][-1].update(resolved_at=None, tx_id=None)
     mock_session.get.return_value = mock_response_factory(json_data=mock_data)
     data = await api_client.get_payouts(from_date, to_date)
     mock_session.get.assert_called_once_with(
         f"https://pool.braiins.com/accounts/payouts/json/btc?from={from_date}&to={to_date}",
         headers={"Pool-Auth-Token": api_key, "Accept": "application/json"},
+        timeout=REQUEST_TIMEOUTS["payouts"],
     )
-    assert data == mock_data
+    assert len(data) == 7
+    assert data[0].requested_at == datetime(2023, 10, 1, 1, tzinfo=timezone.utc)
+    assert data[0].amount == Decimal(mock_data["btc"]["payouts"][0]["amount"])
+    assert data[-1].resolved_at is None
+    assert data[-1].tx_id is None
     mock_logger.debug.assert_called()
+
+
+async def test_unexpected_response_raises_schema_error(api_client_fixture):
+    api_client, mock_session, _ = api_client_fixture
+    mock_session.get.return_value = mock_response_factory(
+        json_data={"btc": {"workers": {"miner.rig1": {"state": "ok"}}}}
+    )
+
+    with pytest.raises(BraiinsPoolSchemaError, match="miner.rig1.*hash_rate_5m"):
+        await api_client.get_workers()
+
+    # Schema errors are API errors, so updates handle them like any other
+    assert issubclass(BraiinsPoolSchemaError, BraiinsPoolApiException)
+
+
+@pytest.fixture
+async def fake_api(socket_enabled):
+    fake = FakeBraiinsApi()
+    async with fake.serve() as base_url, aiohttp.ClientSession() as session:
+        yield fake, BraiinsPoolApiClient(session, FAKE_API_KEY, base_url=base_url)
+
+
+async def test_fake_api_serves_every_endpoint(fake_api):
+    fake, client = fake_api
+
+    profile = await client.get_user_profile()
+    stats = await client.get_account_stats()
+    workers = await client.get_workers()
+    rewards = await client.get_daily_rewards()
+    hashrate = await client.get_daily_hashrate()
+    blocks = await client.get_block_rewards("2024-01-01", "2024-01-07")
+    payouts = await client.get_payouts("2024-01-01", "2024-01-07")
+
+    assert profile["ok_workers"] == 10
+    assert isinstance(profile["current_balance"], Decimal)
+    assert stats["last_block_height"] == 825000
+    assert len(workers) == 10
+    assert len(rewards) == 30
+    assert len(hashrate) == 30
+    assert len(blocks) == 7 * 8
+    assert len(payouts) == 7
+    assert fake.request_count() == 7
+
+
+async def test_fake_api_large_worker_list(fake_api):
+    fake, client = fake_api
+    fake.workers = 10_000
+
+    workers = await client.get_workers()
+
+    assert len(workers) == 10_000
+
+
+async def test_fake_api_rejects_unknown_key(fake_api):
+    fake, client = fake_api
+    fake.api_keys = {"another_key"}
+
+    with pytest.raises(BraiinsPoolAuthError):
+        await client.get_user_profile()
+
+
+@pytest.mark.parametrize("status", [403, 429, 500, 503])
+async def test_fake_api_injected_errors(fake_api, status):
+    fake, client = fake_api
+    fake.inject(status, path="/accounts/profile", retry_after=30)
+
+    expected = BraiinsPoolAuthError if status == 403 else BraiinsPoolApiException
+    with pytest.raises(expected):
+        await client.get_user_profile()
+    # Faults only apply to the configured number of requests
+    assert (await client.get_user_profile())["ok_workers"] == 10
+
+
+async def test_fake_api_truncated_body(fake_api):
+    fake, client = fake_api
+    fake.truncate(fraction=0.5)
+
+    with pytest.raises(ClientError):
+        await client.get_workers()
+
+
+async def test_fake_api_latency(fake_api):
+    fake, client = fake_api
+    fake.path_latency["/accounts/profile"] = 0.05
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await client.get_user_profile()
+
+    assert loop.time() - start >= 0.05
+
+
+async def test_fake_api_etag():
+    fake = FakeBraiinsApi()
+    headers = {"Pool-Auth-Token": FAKE_API_KEY}
+
+    first = await fake.handle("/accounts/profile/json/btc/", {}, headers)
+    second = await fake.handle(
+        "/accounts/profile/json/btc/",
+        {},
+        {**headers, "If-None-Match": first.headers["ETag"]},
+    )
+
+    assert first.status == 200
+    assert second.status == 304
+    assert second.body == b""
+
+
+async def test_request_metrics(fake_api):
+    fake, client = fake_api
+
+    await client.get_user_profile()
+    await client.get_user_profile()
+    fake.inject(503, path="/accounts/workers")
+    with pytest.raises(BraiinsPoolApiException):
+        await client.get_workers()
+
+    profile = client.metrics.endpoints["profile"]
+    assert profile.requests == 2
+    assert profile.decoded == 2
+    assert profile.response_bytes_total > 0
+    assert sum(profile.latency_buckets) == 2
+    assert not profile.errors
+    assert client.metrics.endpoints["workers"].errors == {"BraiinsPoolApiException": 1}
+
+
+async def test_request_tracing_only_with_debug_logging(fake_api, caplog):
+    fake, client = fake_api
+    fake.workers = 1000
+
+    caplog.set_level(logging.INFO, logger="custom_components.braiins_pool.api")
+    await client.get_workers()
+    assert client.tracer.dump() == []
+
+    caplog.set_level(logging.DEBUG, logger="custom_components.braiins_pool.api")
+    await client.get_workers()
+    (exchange,) = client.tracer.dump()
+    assert exchange["body_truncated"]
+    assert len(exchange["body"]) == 2048
+    assert exchange["body_length"] > 2048
+    assert exchange["request_headers"]["Pool-Auth-Token"] == "**REDACTED**"
+    assert FAKE_API_KEY not in str(exchange)
+    # The log only gets a one-line summary, never the body
+    assert all(len(record.getMessage()) < 500 for record in caplog.records)
+
+
+async def test_request_tracing_is_bounded(fake_api, caplog):
+    fake, client = fake_api
+    caplog.set_level(logging.DEBUG, logger="custom_components.braiins_pool.api")
+    fake.inject(503, path="/stats")
+
+    for _ in range(60):
+        with contextlib.suppress(BraiinsPoolApiException):
+            await client.get_account_stats()
+
+    trace = client.tracer.dump()
+    assert len(trace) == 50
+    assert trace[-1]["status"] == 200
+
+
+async def test_request_timeout_budget(fake_api):
+    fake, client = fake_api
+    fake.stall(5, path="/accounts/profile")
+
+    with (
+        patch.dict(REQUEST_TIMEOUTS, {"profile": aiohttp.ClientTimeout(total=0.2)}),
+        pytest.raises(asyncio.TimeoutError),
+    ):
+        await client.get_user_profile()
+
+    assert client.metrics.endpoint("profile").errors
+
+
+async def test_hedged_request_wins_over_stalled_one(fake_api):
+    fake, client = fake_api
+    client.hedge_percentile = 95
+    metrics = client.metrics.endpoint("profile")
+    for _ in range(20):
+        metrics.observe_response(10.0, 100)
+    fake.stall(5, path="/accounts/profile")
+
+    started = time.monotonic()
+    profile = await client.get_user_profile()
+
+    assert time.monotonic() - started < 2
+    assert profile["ok_workers"] >= 0
+    assert fake.request_count("/accounts/profile") == 2
+    assert metrics.hedged == 1
+    assert not metrics.errors
+
+
+async def test_no_hedge_without_latency_history(fake_api):
+    fake, client = fake_api
+    client.hedge_percentile = 95
+
+    await client.get_user_profile()
+
+    assert fake.request_count("/accounts/profile") == 1
+    assert client.metrics.endpoint("profile").hedged == 0
+
+
+async def test_close_cancels_requests_in_flight(fake_api):
+    fake, client = fake_api
+    fake.stall(60, path="/accounts/profile")
+    request = asyncio.create_task(client.get_user_profile())
+    await asyncio.sleep(0.05)
+
+    started = time.monotonic()
+    await client.async_close()
+
+    with pytest.raises(asyncio.CancelledError):
+        await request
+    assert time.monotonic() - started < 1
+    with pytest.raises(BraiinsPoolApiException, match="closed"):
+        await client.get_user_profile()
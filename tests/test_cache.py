@@ -0,0 +1,73 @@
+"""Unit tests for the Braiins Pool caches."""
+
+import asyncio
+import pytest
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from freezegun import freeze_time
+
+from custom_components.braiins_pool.cache import TimedCache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_timed_cache_expires():
+    """Test that values expire after the TTL."""
+    with freeze_time("2023-10-08 12:00:00") as frozen_time:
+        cache = TimedCache(timedelta(minutes=5))
+        cache.set("btc", {"luck_b10": 1.0})
+        assert cache.get("btc") == {"luck_b10": 1.0}
+
+        frozen_time.tick(timedelta(minutes=4))
+        assert cache.get("btc") == {"luck_b10": 1.0}
+        # A caller with a stricter TTL sees the value as expired.
+        assert cache.get("btc", timedelta(minutes=1)) is None
+
+        frozen_time.tick(timedelta(minutes=1))
+        assert cache.get("btc") is None
+
+
+async def test_timed_cache_evict_expired():
+    """Test that expired values are dropped from the cache."""
+    with freeze_time("2023-10-08 12:00:00") as frozen_time:
+        cache = TimedCache(timedelta(minutes=5))
+        cache.set("old", 1)
+        frozen_time.tick(timedelta(minutes=3))
+        cache.set("new", 2)
+        frozen_time.tick(timedelta(minutes=2))
+
+        cache.evict_expired()
+
+        assert cache.pop("old") is None
+        assert cache.get("new") == 2
+
+
+async def test_timed_cache_single_fetch_for_concurrent_callers():
+    """Test that concurrent callers share one fetch."""
+    cache = TimedCache(timedelta(minutes=5))
+    started = asyncio.Event()
+
+    async def slow_fetch():
+        started.set()
+        await asyncio.sleep(0)
+        return {"luck_b10": 1.0}
+
+    fetch = AsyncMock(side_effect=slow_fetch)
+    results = await asyncio.gather(
+        *(cache.async_get_or_fetch("btc", fetch) for _ in range(5))
+    )
+
+    assert results == [{"luck_b10": 1.0}] * 5
+    fetch.assert_awaited_once()
+
+
+async def test_timed_cache_fetch_error_not_cached():
+    """Test that a failed fetch is not cached."""
+    cache = TimedCache(timedelta(minutes=5))
+    fetch = AsyncMock(side_effect=[RuntimeError("boom"), {"luck_b10": 1.0}])
+
+    with pytest.raises(RuntimeError):
+        await cache.async_get_or_fetch("btc", fetch)
+    assert await cache.async_get_or_fetch("btc", fetch) == {"luck_b10": 1.0}
+    assert fetch.await_count == 2
@@ -0,0 +1,149 @@
+import aiohttp
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.braiins_pool.api import (
+    API_BASE_URL,
+    API_URL_WORKERS,
+    BraiinsPoolApiClient,
+    BraiinsPoolApiException,
+    BraiinsPoolAuthError,
+)
+from custom_components.braiins_pool.cassette import (
+    MODE_RECORD,
+    REDACTED,
+    Cassette,
+)
+from tests.fake_braiins import FAKE_API_KEY, FakeBraiinsApi
+
+pytestmark = pytest.mark.asyncio
+
+# Cassettes hold raw responses, so these tests read them undecoded.
+WORKERS_URL = API_BASE_URL + API_URL_WORKERS.format("btc")
+
+
+async def _record(fake, cassette):
+    async with fake.serve() as base_url, aiohttp.ClientSession() as session:
+        client = BraiinsPoolApiClient(
+            session, FAKE_API_KEY, base_url=base_url, cassette=cassette
+        )
+        profile = await client.get_user_profile()
+        workers = await client.get_workers()
+        payouts = await client.get_payouts("2024-01-01", "2024-01-07")
+    return profile, workers, payouts
+
+
+async def test_record_and_replay(socket_enabled, tmp_path):
+    """Test that recorded responses replay without a network."""
+    fake = FakeBraiinsApi()
+    cassette = Cassette(MODE_RECORD)
+    recorded = await _record(fake, cassette)
+    path = str(tmp_path / "braiins.jsonl.gz")
+    cassette.save(path)
+
+    client = BraiinsPoolApiClient(None, FAKE_API_KEY, cassette=Cassette.load(path))
+    replayed = (
+        await client.get_user_profile(),
+        await client.get_workers(),
+        await client.get_payouts("2024-01-01", "2024-01-07"),
+    )
+
+    assert replayed == recorded
+    assert len(cassette.interactions) == 3
+    assert cassette.interactions[0]["url"] == "/accounts/profile/json/btc/"
+    assert cassette.interactions[0]["status"] == 200
+
+
+class EchoResponse:
+    """Response that echoes the API key back, as an error page might."""
+
+    def __init__(self, api_key):
+        self.status = 200
+        self.headers = {"X-Echo": api_key}
+        self._api_key = api_key
+
+    async def text(self):
+        return f'{{"token": "{self._api_key}"}}'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+async def test_record_redacts_api_key(tmp_path):
+    """Test that the API key never reaches the cassette file."""
+    session = MagicMock()
+    session.get.return_value = EchoResponse(FAKE_API_KEY)
+    cassette = Cassette(MODE_RECORD)
+    client = BraiinsPoolApiClient(session, FAKE_API_KEY, cassette=cassette)
+
+    # The live result is returned unredacted
+    assert await client._request(WORKERS_URL) == {"token": FAKE_API_KEY}
+    path = str(tmp_path / "braiins.jsonl")
+    cassette.save(path)
+
+    with open(path, encoding="utf-8") as cassette_file:
+        content = cassette_file.read()
+    assert FAKE_API_KEY not in content
+    assert cassette.interactions[0]["headers"]["X-Echo"] == REDACTED
+
+
+async def test_replay_repeats_last_response():
+    """Test that the last response for a URL is repeated once used up."""
+    cassette = Cassette(
+        interactions=[
+            {
+                "url": "/accounts/workers/json/btc/",
+                "status": 200,
+                "headers": {"Content-Type": "application/json"},
+                "body": body,
+            }
+            for body in ('{"n": 1}', '{"n": 2}')
+        ]
+    )
+    client = BraiinsPoolApiClient(None, "key", cassette=cassette)
+
+    results = [await client._request(WORKERS_URL) for _ in range(3)]
+
+    assert results == [{"n": 1}, {"n": 2}, {"n": 2}]
+
+
+@pytest.mark.parametrize(
+    ("status", "body", "error"),
+    [
+        (403, "Forbidden", BraiinsPoolAuthError),
+        (500, "Internal Server Error", BraiinsPoolApiException),
+    ],
+)
+async def test_replay_error_statuses(status, body, error):
+    """Test that recorded error responses raise like live ones."""
+    cassette = Cassette(
+        interactions=[
+            {
+                "url": "/accounts/profile/json/btc/",
+                "status": status,
+                "headers": {},
+                "body": body,
+            }
+        ]
+    )
+    client = BraiinsPoolApiClient(None, "key", cassette=cassette)
+
+    with pytest.raises(error):
+        await client.get_user_profile()
+
+
+async def test_replay_unrecorded_url():
+    """Test that a URL missing from the cassette fails like a network error."""
+    client = BraiinsPoolApiClient(None, "key", cassette=Cassette())
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await client.get_user_profile()
+
+
+async def test_unknown_mode():
+    """Test that an unknown cassette mode is rejected."""
+    with pytest.raises(ValueError):
+        Cassette("rewind")
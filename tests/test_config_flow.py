@@ -1,5 +1,8 @@
+from decimal import Decimal
+
+import aiohttp
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from homeassistant import config_entries
@@ -7,10 +10,30 @@ from homeassistant.core import HomeAssistant
 from homeassistant.const import CONF_API_KEY
 from homeassistant.data_entry_flow import FlowResultType
 
-from custom_components.braiins_pool.const import DOMAIN, CONF_REWARDS_ACCOUNT_NAME
+from custom_components.braiins_pool.api import (
+    BraiinsPoolApiException,
+    BraiinsPoolAuthError,
+)
+from custom_components.braiins_pool.cache import api_key_digest
+from custom_components.braiins_pool.const import (
+    DOMAIN,
+    CONF_ACCOUNTS,
+    CONF_ALIGNED_POLLING,
+    CONF_COINS,
+    CONF_ENTRY_TYPE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_POOL_STATS_TTL,
+    CONF_REWARDS_ACCOUNT_NAME,
+    CONF_STAGGER_MS,
+    DATA_PROFILE_PROBE_CACHE,
+    DEFAULT_COINS,
+    DEFAULT_POOL_STATS_TTL_MINS,
+    ENTRY_TYPE_FARM,
+)
 
 MOCK_API_KEY = "test_api_key_123"
 MOCK_REWARDS_ACCOUNT_NAME = "My Test Account"
+MOCK_PROFILE = {"current_balance": Decimal("0.001"), "ok_workers": 1}
 
 
 @pytest.fixture(autouse=True)
@@ -22,13 +45,33 @@ def mock_setup_entry():
         yield mock_setup
 
 
-async def test_config_flow_user_step(hass: HomeAssistant):
-    """Test the user config flow."""
+@pytest.fixture(autouse=True)
+def mock_get_user_profile():
+    """Mock the profile request that validates API keys."""
+    with patch(
+        "custom_components.braiins_pool.config_flow.BraiinsPoolApiClient.get_user_profile",
+        AsyncMock(return_value=MOCK_PROFILE),
+    ) as mock_get:
+        yield mock_get
+
+
+async def _async_start_flow(hass: HomeAssistant, menu_option: str):
+    """Start a config flow and pick an option from the initial menu."""
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
-    assert result["type"] == FlowResultType.FORM
+    assert result["type"] == FlowResultType.MENU
     assert result["step_id"] == "user"
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": menu_option}
+    )
+
+
+async def test_config_flow_user_step(hass: HomeAssistant):
+    """Test the user config flow."""
+    result = await _async_start_flow(hass, "account")
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "account"
     assert result["errors"] is None
 
     # Test successful submission
@@ -49,13 +92,53 @@ async def test_config_flow_user_step(hass: HomeAssistant):
     }
     # Unique ID should be set to rewards account name
     assert result2["result"].unique_id == MOCK_REWARDS_ACCOUNT_NAME
+    # The key was validated once and the profile kept for the first refresh
+    assert (
+        hass.data[DATA_PROFILE_PROBE_CACHE].get(api_key_digest(MOCK_API_KEY))
+        == MOCK_PROFILE
+    )
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (BraiinsPoolAuthError("Invalid API key"), "invalid_api_key"),
+        (BraiinsPoolApiException("API error 500"), "cannot_connect"),
+        (aiohttp.ClientConnectionError(), "cannot_connect"),
+    ],
+)
+async def test_config_flow_probe_errors(
+    hass: HomeAssistant, mock_get_user_profile, error, expected
+):
+    """Test that a key the API rejects or cannot check is reported on the form."""
+    mock_get_user_profile.side_effect = error
+    result = await _async_start_flow(hass, "account")
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_API_KEY: MOCK_API_KEY,
+            CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
+        },
+    )
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"]["base"] == expected
+    assert mock_get_user_profile.await_count == 1
+
+    # The form can be submitted again once the API accepts the key
+    mock_get_user_profile.side_effect = None
+    result3 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_API_KEY: MOCK_API_KEY,
+            CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
+        },
+    )
+    assert result3["type"] == FlowResultType.CREATE_ENTRY
 
 
 async def test_config_flow_empty_api_key(hass: HomeAssistant):
     """Test config flow with an empty API key."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
+    result = await _async_start_flow(hass, "account")
     result2 = await hass.config_entries.flow.async_configure(
         result["flow_id"],
         {
@@ -69,9 +152,7 @@ async def test_config_flow_empty_api_key(hass: HomeAssistant):
 
 async def test_config_flow_empty_rewards_name(hass: HomeAssistant):
     """Test config flow with an empty rewards account name."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
+    result = await _async_start_flow(hass, "account")
     result2 = await hass.config_entries.flow.async_configure(
         result["flow_id"],
         {
@@ -97,9 +178,7 @@ async def test_config_flow_already_configured(hass: HomeAssistant):
     )
     mock_entry.add_to_hass(hass)
 
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
+    result = await _async_start_flow(hass, "account")
     # Try to configure a new flow with the same rewards account name
     result2 = await hass.config_entries.flow.async_configure(
         result["flow_id"],
@@ -110,3 +189,195 @@ async def test_config_flow_already_configured(hass: HomeAssistant):
     )
     assert result2["type"] == FlowResultType.ABORT
     assert result2["reason"] == "already_configured"
+
+
+async def test_options_flow(hass: HomeAssistant):
+    """Test configuring the pool statistics cache lifetime."""
+    mock_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=MOCK_REWARDS_ACCOUNT_NAME,
+        data={
+            CONF_API_KEY: MOCK_API_KEY,
+            CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
+        },
+        title=MOCK_REWARDS_ACCOUNT_NAME,
+    )
+    mock_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+    schema_defaults = {str(key): key.default() for key in result["data_schema"].schema}
+    assert schema_defaults[CONF_POOL_STATS_TTL] == DEFAULT_POOL_STATS_TTL_MINS
+    assert schema_defaults[CONF_COINS] == DEFAULT_COINS
+
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_COINS: ["btc", " ZEC "], CONF_POOL_STATS_TTL: 30}
+    )
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert mock_entry.options[CONF_COINS] == ["btc", "zec"]
+    assert mock_entry.options[CONF_POOL_STATS_TTL] == 30
+    assert mock_entry.options[CONF_ALIGNED_POLLING] is False
+
+
+async def test_options_flow_requires_a_coin(hass: HomeAssistant):
+    """Test that the options flow rejects an empty coin list."""
+    mock_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=MOCK_REWARDS_ACCOUNT_NAME,
+        data={
+            CONF_API_KEY: MOCK_API_KEY,
+            CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
+        },
+        title=MOCK_REWARDS_ACCOUNT_NAME,
+    )
+    mock_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_entry.entry_id)
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_COINS: [], CONF_POOL_STATS_TTL: 10}
+    )
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"]["base"] == "invalid_coins"
+
+
+async def test_config_flow_farm(hass: HomeAssistant):
+    """Test setting up a farm with several API keys."""
+    result = await _async_start_flow(hass, "farm")
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "farm"
+
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_REWARDS_ACCOUNT_NAME: "My Farm",
+            CONF_ACCOUNTS: "rig-a = key_a\n\nkey_b\n",
+            CONF_MAX_CONCURRENT_REQUESTS: 2,
+            CONF_STAGGER_MS: 100,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert result2["title"] == "My Farm"
+    assert result2["data"] == {
+        CONF_ENTRY_TYPE: ENTRY_TYPE_FARM,
+        CONF_REWARDS_ACCOUNT_NAME: "My Farm",
+        CONF_ACCOUNTS: [
+            {"name": "rig-a", CONF_API_KEY: "key_a"},
+            {"name": "Account 2", CONF_API_KEY: "key_b"},
+        ],
+    }
+    assert result2["options"] == {
+        CONF_MAX_CONCURRENT_REQUESTS: 2,
+        CONF_STAGGER_MS: 100,
+    }
+    assert result2["result"].unique_id == "farm_My Farm"
+
+
+@pytest.mark.parametrize(
+    "api_keys", ["", "\n  \n", "rig-a=key_a\nrig-a=key_b", "rig-a="]
+)
+async def test_config_flow_farm_invalid_api_keys(hass: HomeAssistant, api_keys):
+    """Test that the farm step rejects missing keys and duplicate names."""
+    result = await _async_start_flow(hass, "farm")
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_REWARDS_ACCOUNT_NAME: "My Farm", CONF_ACCOUNTS: api_keys},
+    )
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"]["base"] == "invalid_farm_api_keys"
+
+
+async def test_config_flow_farm_rejected_api_key(
+    hass: HomeAssistant, mock_get_user_profile
+):
+    """Test that the farm step validates every key."""
+    mock_get_user_profile.side_effect = [
+        MOCK_PROFILE,
+        BraiinsPoolAuthError("Invalid API key"),
+    ]
+    result = await _async_start_flow(hass, "farm")
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_REWARDS_ACCOUNT_NAME: "My Farm", CONF_ACCOUNTS: "key_a\nkey_b"},
+    )
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"]["base"] == "invalid_api_key"
+    assert mock_get_user_profile.await_count == 2
+    probe_cache = hass.data[DATA_PROFILE_PROBE_CACHE]
+    assert probe_cache.get(api_key_digest("key_a")) == MOCK_PROFILE
+    assert probe_cache.get("key_a") is None
+
+    # Abandoning the flow drops the profiles it probed
+    hass.config_entries.flow.async_abort(result["flow_id"])
+    assert probe_cache.get(api_key_digest("key_a")) is None
+
+
+async def test_reauth_flow(hass: HomeAssistant, mock_get_user_profile):
+    """Test that reauth validates the new key and updates the entry."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=MOCK_REWARDS_ACCOUNT_NAME,
+        data={
+            CONF_API_KEY: "revoked_key",
+            CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
+        },
+        title=MOCK_REWARDS_ACCOUNT_NAME,
+    )
+    entry.add_to_hass(hass)
+    result = await entry.start_reauth_flow(hass)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "reauth_confirm"
+
+    mock_get_user_profile.side_effect = BraiinsPoolAuthError("Invalid API key")
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_API_KEY: "still_revoked"}
+    )
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"]["base"] == "invalid_api_key"
+
+    mock_get_user_profile.side_effect = None
+    result3 = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_API_KEY: MOCK_API_KEY}
+    )
+    await hass.async_block_till_done()
+
+    assert result3["type"] == FlowResultType.ABORT
+    assert result3["reason"] == "reauth_successful"
+    assert entry.data == {
+        CONF_API_KEY: MOCK_API_KEY,
+        CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
+    }
+    assert (
+        hass.data[DATA_PROFILE_PROBE_CACHE].get(api_key_digest(MOCK_API_KEY))
+        == MOCK_PROFILE
+    )
+
+
+async def test_reauth_flow_farm(hass: HomeAssistant, mock_get_user_profile):
+    """Test that reauth of a farm replaces the keys of its accounts."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="farm_My Farm",
+        data={
+            CONF_ENTRY_TYPE: ENTRY_TYPE_FARM,
+            CONF_REWARDS_ACCOUNT_NAME: "My Farm",
+            CONF_ACCOUNTS: [{"name": "rig-a", CONF_API_KEY: "revoked_key"}],
+        },
+        title="My Farm",
+    )
+    entry.add_to_hass(hass)
+    result = await entry.start_reauth_flow(hass)
+
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_ACCOUNTS: "rig-a=key_a\nrig-b=key_b"}
+    )
+    await hass.async_block_till_done()
+
+    assert result2["reason"] == "reauth_successful"
+    assert entry.data[CONF_ACCOUNTS] == [
+        {"name": "rig-a", CONF_API_KEY: "key_a"},
+        {"name": "rig-b", CONF_API_KEY: "key_b"},
+    ]
+    assert mock_get_user_profile.await_count == 2
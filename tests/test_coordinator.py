@@ -1,20 +1,33 @@
 """Unit tests for the Braiins Pool coordinator."""
 
 import homeassistant.util.dt as dt_util_real  # Use a different alias to avoid conflict
+import asyncio
 import pytest
 from datetime import timedelta
 from unittest.mock import AsyncMock
 from decimal import Decimal
 
 from aiohttp import ClientError
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import UpdateFailed  # Import UpdateFailed
-from custom_components.braiins_pool.coordinator import BraiinsDataUpdateCoordinator
+from custom_components.braiins_pool.api import (
+    BraiinsPoolApiClient,
+    BraiinsPoolApiException,
+    BraiinsPoolAuthError,
+)
+from custom_components.braiins_pool.coordinator import (
+    BraiinsDataUpdateCoordinator,
+    BraiinsFarmUpdateCoordinator,
+)
 from custom_components.braiins_pool.const import (
     DEFAULT_SCAN_INTERVAL_MINS,
     SATOSHIS_PER_BTC,
 )
 
+from custom_components.braiins_pool.schema import Worker
 from freezegun import freeze_time
+from tests.fake_braiins import FakeBraiinsApi
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 pytestmark = pytest.mark.asyncio
 
@@ -126,6 +139,41 @@ async def test_update_failed_api_error(hass):
     mock_api_client.get_user_profile.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_stale_while_revalidate(hass, freezer):
+    "Test that the last good data is served during the grace period."
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(
+        return_value={"current_balance": Decimal("1")}
+    )
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(minutes=1)
+    )
+    coordinator.stale_grace = timedelta(minutes=5)
+    await coordinator.async_refresh()
+    fetched_at = coordinator.data_time
+
+    mock_api_client.get_user_profile.side_effect = ClientError("blip")
+    freezer.tick(timedelta(minutes=5))
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is True
+    assert coordinator.stale is True
+    assert coordinator.data_time == fetched_at
+    assert coordinator.data["current_balance"] == Decimal("1")
+
+    freezer.tick(timedelta(seconds=1))
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success is False
+
+    mock_api_client.get_user_profile.side_effect = None
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success is True
+    assert coordinator.stale is False
+    assert coordinator.data_time > fetched_at
+
+
 @pytest.mark.asyncio
 async def test_update_failed_parsing_error(hass):
     "Test data update failure due to parsing error."
@@ -237,3 +285,635 @@ async def test_update_failed_missing_new_data_keys(hass):
     assert coordinator.data["current_balance_satoshi"] == 456000000
 
     mock_api_client.get_user_profile.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_shared_between_entries(hass):
+    "Test that pool statistics are fetched once and shared by all coordinators."
+    pool_stats = {"hash_rate_5m": 5e9, "luck_b10": 0.73}
+    coordinators = []
+    api_clients = []
+    for _ in range(3):
+        mock_api_client = AsyncMock()
+        mock_api_client.get_user_profile = AsyncMock(
+            return_value={"current_balance": Decimal("1")}
+        )
+        mock_api_client.get_account_stats = AsyncMock(return_value=pool_stats)
+        api_clients.append(mock_api_client)
+        coordinators.append(
+            BraiinsDataUpdateCoordinator(
+                hass, mock_api_client, timedelta(seconds=DEFAULT_SCAN_INTERVAL_MINS)
+            )
+        )
+
+    for coordinator in coordinators:
+        await coordinator.async_refresh()
+
+    assert sum(client.get_account_stats.await_count for client in api_clients) == 1
+    for coordinator in coordinators:
+        assert coordinator.data["pool_stats"] is pool_stats
+    assert coordinators[0].metrics.cache("pool_stats").misses == 1
+    assert coordinators[1].metrics.cache("pool_stats").hits == 1
+    farm = BraiinsFarmUpdateCoordinator(
+        hass,
+        {str(index): coordinator for index, coordinator in enumerate(coordinators)},
+        timedelta(minutes=1),
+        max_concurrent=1,
+        stagger=timedelta(0),
+    )
+    assert farm.metrics.cache("pool_stats").hit_ratio == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_refetched_after_ttl(hass):
+    "Test that pool statistics are refreshed once the configured TTL expires."
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(return_value={})
+    mock_api_client.get_account_stats = AsyncMock(
+        side_effect=[{"luck_b10": 1.0}, {"luck_b10": 2.0}]
+    )
+
+    with freeze_time("2023-10-08 12:00:00") as frozen_time:
+        coordinator = BraiinsDataUpdateCoordinator(
+            hass,
+            mock_api_client,
+            timedelta(minutes=1),
+            pool_stats_ttl=timedelta(minutes=10),
+        )
+        await coordinator.async_refresh()
+        frozen_time.tick(timedelta(minutes=5))
+        await coordinator.async_refresh()
+        assert coordinator.data["pool_stats"] == {"luck_b10": 1.0}
+
+        frozen_time.tick(timedelta(minutes=5))
+        await coordinator.async_refresh()
+        assert coordinator.data["pool_stats"] == {"luck_b10": 2.0}
+
+    assert mock_api_client.get_account_stats.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_failure_keeps_account_update(hass):
+    "Test that a pool statistics error does not fail the account update."
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(
+        return_value={"current_balance": Decimal("1")}
+    )
+    mock_api_client.get_account_stats = AsyncMock(side_effect=ClientError("down"))
+
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(seconds=DEFAULT_SCAN_INTERVAL_MINS)
+    )
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is True
+    assert coordinator.data["current_balance"] == Decimal("1")
+    assert coordinator.data["pool_stats"] == {}
+
+
+@pytest.mark.asyncio
+async def test_workers_fetched_when_enabled(hass):
+    "Test that per-worker data is fetched on demand and kept on errors."
+    workers = {"miner.rig1": Worker("ok", 1700000000, 100.0, 100.0, 100.0, 100.0)}
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(return_value={})
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    mock_api_client.get_workers = AsyncMock(return_value=workers)
+
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass,
+        mock_api_client,
+        timedelta(seconds=DEFAULT_SCAN_INTERVAL_MINS),
+        fetch_workers=True,
+    )
+    await coordinator.async_refresh()
+    assert coordinator.data["workers"] == workers
+
+    mock_api_client.get_workers.side_effect = ClientError("down")
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success is True
+    assert coordinator.data["workers"] == workers
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fetch_workers", [False, True])
+async def test_auth_error_of_secondary_endpoint_starts_reauth(hass, fetch_workers):
+    "Test that a rejected key is not hidden by the pool statistics or workers fallback."
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(return_value={})
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    mock_api_client.get_workers = AsyncMock(return_value={})
+    rejected = (
+        mock_api_client.get_workers
+        if fetch_workers
+        else mock_api_client.get_account_stats
+    )
+    rejected.side_effect = BraiinsPoolAuthError("Invalid API key")
+
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass,
+        mock_api_client,
+        timedelta(seconds=DEFAULT_SCAN_INTERVAL_MINS),
+        fetch_workers=fetch_workers,
+    )
+    await coordinator.async_refresh()
+
+    assert coordinator.auth_failed
+    assert isinstance(coordinator.last_exception, ConfigEntryAuthFailed)
+
+
+@pytest.mark.asyncio
+async def test_skipped_profile_is_not_reported_as_zero(hass):
+    "Test that an unwanted profile leaves its figures out instead of zeroing them."
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(
+        return_value={"current_balance": Decimal("1"), "today_reward": Decimal("0.1")}
+    )
+    mock_api_client.get_account_stats = AsyncMock(return_value={"luck_b10": 1.0})
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(seconds=DEFAULT_SCAN_INTERVAL_MINS)
+    )
+    coordinator.demand.start()
+    coordinator.demand.add("pool_stats")
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is True
+    mock_api_client.get_user_profile.assert_not_awaited()
+    assert coordinator.data["pool_stats"] == {"luck_b10": 1.0}
+    for key in (
+        "current_balance",
+        "today_reward",
+        "all_time_reward",
+        "ok_workers",
+        "pool_5m_hash_rate",
+        "current_balance_satoshi",
+        "today_reward_satoshi",
+        "all_time_reward_satoshi",
+    ):
+        assert key not in coordinator.data
+
+
+def _multi_coin_api_client(profiles):
+    """Return a mock API client serving the given processed profile per coin."""
+    mock_api_client = AsyncMock()
+
+    async def get_user_profile(coin):
+        profile = profiles[coin]
+        if isinstance(profile, Exception):
+            raise profile
+        return profile
+
+    mock_api_client.get_user_profile = AsyncMock(side_effect=get_user_profile)
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    return mock_api_client
+
+
+@pytest.mark.asyncio
+async def test_multi_coin_update(hass):
+    "Test that every configured coin is fetched and stored separately."
+    mock_api_client = _multi_coin_api_client(
+        {
+            "btc": {"current_balance": Decimal("1.5"), "ok_workers": 3},
+            "zec": {"current_balance": Decimal("7"), "ok_workers": 1},
+        }
+    )
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(minutes=1), coins=["btc", "zec"]
+    )
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is True
+    # The default coin is mirrored at the top level for the original sensors.
+    assert coordinator.data["current_balance"] == Decimal("1.5")
+    assert coordinator.data["current_balance_satoshi"] == 150000000
+    assert coordinator.data["coins"]["zec"]["current_balance"] == Decimal("7")
+    assert coordinator.data["coins"]["zec"]["ok_workers"] == 1
+    assert "current_balance_satoshi" not in coordinator.data["coins"]["zec"]
+    assert {
+        call.args[0] for call in mock_api_client.get_user_profile.await_args_list
+    } == {"btc", "zec"}
+    assert {
+        call.args[0] for call in mock_api_client.get_account_stats.await_args_list
+    } == {"btc", "zec"}
+
+
+@pytest.mark.asyncio
+async def test_multi_coin_fetched_concurrently(hass):
+    "Test that coins are fetched at the same time rather than one after another."
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get_user_profile(coin):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {}
+
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(side_effect=get_user_profile)
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(minutes=1), coins=["btc", "zec", "ltc"]
+    )
+    await coordinator.async_refresh()
+
+    assert max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_multi_coin_partial_failure(hass):
+    "Test that a failing coin keeps its last values while others update."
+    profiles = {
+        "btc": {"current_balance": Decimal("1")},
+        "zec": {"current_balance": Decimal("7")},
+    }
+    mock_api_client = _multi_coin_api_client(profiles)
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(minutes=1), coins=["btc", "zec"]
+    )
+    await coordinator.async_refresh()
+
+    profiles["btc"] = {"current_balance": Decimal("2")}
+    profiles["zec"] = ClientError("zec down")
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is True
+    assert coordinator.data["current_balance"] == Decimal("2")
+    assert coordinator.data["coins"]["zec"]["current_balance"] == Decimal("7")
+
+    profiles["btc"] = ClientError("btc down")
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success is False
+
+
+def _farm_accounts(hass, profiles):
+    """Return timer-less account coordinators serving the given profiles."""
+    accounts = {}
+    for name, profile in profiles.items():
+        mock_api_client = AsyncMock()
+        mock_api_client.get_user_profile = AsyncMock(return_value=profile)
+        mock_api_client.get_account_stats = AsyncMock(return_value={"luck_b10": 1.0})
+        accounts[name] = BraiinsDataUpdateCoordinator(hass, mock_api_client, None)
+    return accounts
+
+
+@pytest.mark.asyncio
+async def test_farm_aggregates_accounts(hass):
+    "Test that the farm adds up the accounts' values in one cycle."
+    accounts = _farm_accounts(
+        hass,
+        {
+            "rig-a": {
+                "current_balance": Decimal("1.5"),
+                "today_reward": Decimal("0.1"),
+                "ok_workers": 3,
+                "pool_5m_hash_rate": 100.0,
+            },
+            "rig-b": {
+                "current_balance": Decimal("0.5"),
+                "today_reward": Decimal("0.2"),
+                "ok_workers": 2,
+                "pool_5m_hash_rate": 50.5,
+            },
+        },
+    )
+    farm = BraiinsFarmUpdateCoordinator(
+        hass,
+        accounts,
+        timedelta(minutes=1),
+        max_concurrent=4,
+        stagger=timedelta(0),
+    )
+    await farm.async_refresh()
+
+    assert farm.last_update_success is True
+    assert farm.data["current_balance"] == Decimal("2.0")
+    assert farm.data["today_reward"] == Decimal("0.3")
+    assert farm.data["today_reward_satoshi"] == 30000000
+    assert farm.data["ok_workers"] == 5
+    assert farm.data["pool_5m_hash_rate"] == 150.5
+    assert farm.data["pool_stats"] == {"luck_b10": 1.0}
+    assert farm.data["accounts_ok"] == 2
+    assert farm.data["accounts_total"] == 2
+    assert farm.data["accounts"]["rig-a"]["ok_workers"] == 3
+
+
+@pytest.mark.asyncio
+async def test_farm_bounds_concurrency_and_staggers(hass):
+    "Test that the farm limits concurrent accounts and spaces their starts."
+    in_flight = 0
+    max_in_flight = 0
+    starts = []
+
+    async def get_user_profile(coin):
+        nonlocal in_flight, max_in_flight
+        starts.append(asyncio.get_running_loop().time())
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return {"ok_workers": 1}
+
+    accounts = _farm_accounts(hass, {f"rig-{i}": {} for i in range(6)})
+    for account in accounts.values():
+        account.api_client.get_user_profile = AsyncMock(side_effect=get_user_profile)
+    farm = BraiinsFarmUpdateCoordinator(
+        hass,
+        accounts,
+        timedelta(minutes=1),
+        max_concurrent=2,
+        stagger=timedelta(milliseconds=20),
+    )
+    await farm.async_refresh()
+
+    assert farm.data["ok_workers"] == 6
+    assert max_in_flight == 2
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.015
+
+
+@pytest.mark.asyncio
+async def test_farm_partial_failure(hass):
+    "Test that a failing account keeps its last values in the farm totals."
+    accounts = _farm_accounts(
+        hass, {"rig-a": {"ok_workers": 3}, "rig-b": {"ok_workers": 2}}
+    )
+    farm = BraiinsFarmUpdateCoordinator(
+        hass, accounts, timedelta(minutes=1), max_concurrent=4, stagger=timedelta(0)
+    )
+    await farm.async_refresh()
+
+    accounts["rig-b"].api_client.get_user_profile.side_effect = ClientError("down")
+    await farm.async_refresh()
+    assert farm.last_update_success is True
+    assert farm.data["ok_workers"] == 5
+    assert farm.data["accounts_ok"] == 1
+
+    accounts["rig-a"].api_client.get_user_profile.side_effect = ClientError("down")
+    await farm.async_refresh()
+    assert farm.last_update_success is False
+
+
+@pytest.mark.asyncio
+async def test_auth_failure_stops_polling(hass, freezer):
+    "Test that a rejected key stops the regular polls and the day rollover."
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(
+        side_effect=BraiinsPoolAuthError("Invalid API key")
+    )
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(minutes=1)
+    )
+    unsub = coordinator.async_add_listener(lambda: None)
+    unsub_rollover = coordinator.async_track_day_rollover()
+
+    for _ in range(3):
+        freezer.tick(timedelta(minutes=1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done(wait_background_tasks=True)
+    freezer.move_to("2030-01-01 00:00:31+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.auth_failed
+    assert isinstance(coordinator.last_exception, ConfigEntryAuthFailed)
+    assert mock_api_client.get_user_profile.await_count == 1
+    unsub_rollover()
+    unsub()
+
+
+@pytest.mark.asyncio
+async def test_farm_skips_rejected_accounts(hass):
+    "Test that the farm stops refreshing accounts whose key was rejected."
+    accounts = _farm_accounts(
+        hass, {"rig-a": {"ok_workers": 3}, "rig-b": {"ok_workers": 2}}
+    )
+    farm = BraiinsFarmUpdateCoordinator(
+        hass, accounts, timedelta(minutes=1), max_concurrent=4, stagger=timedelta(0)
+    )
+    rig_b = accounts["rig-b"].api_client.get_user_profile
+    rig_b.side_effect = BraiinsPoolAuthError("Invalid API key")
+    await farm.async_refresh()
+    await farm.async_refresh()
+
+    assert farm.last_update_success is True
+    assert farm.data["accounts_ok"] == 1
+    assert rig_b.await_count == 1
+
+    accounts["rig-a"].api_client.get_user_profile.side_effect = BraiinsPoolAuthError(
+        "Invalid API key"
+    )
+    await farm.async_refresh()
+    assert farm.auth_failed
+
+
+@pytest.mark.asyncio
+async def test_aligned_polling(hass, freezer):
+    "Test that aligned polling refreshes the offset after the next boundary."
+    freezer.move_to("2023-10-08 12:03:17+00:00")
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(return_value={})
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(minutes=1)
+    )
+    coordinator.set_aligned_polling(timedelta(seconds=20))
+
+    # Adding the first listener schedules the first refresh.
+    unsub = coordinator.async_add_listener(lambda: None)
+
+    async_fire_time_changed(hass, dt_util_real.parse_datetime("2023-10-08 12:03:19Z"))
+    await hass.async_block_till_done()
+    mock_api_client.get_user_profile.assert_not_called()
+
+    async_fire_time_changed(hass, dt_util_real.parse_datetime("2023-10-08 12:03:21Z"))
+    await hass.async_block_till_done()
+    mock_api_client.get_user_profile.assert_called_once()
+    unsub()
+
+
+@pytest.mark.asyncio
+async def test_day_rollover_record(hass):
+    "Test that the previous day's final reward is kept once the day rolls over."
+    rewards = iter(
+        [
+            Decimal("0.5"),  # 23:59:30, final figure of October 8th
+            Decimal("0.5"),  # 00:00:30, Braiins has not reset yet
+            Decimal("0.01"),  # 00:05:00, reset
+            Decimal("0.02"),  # 12:00:00
+        ]
+    )
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(
+        side_effect=lambda coin: {"today_reward": next(rewards)}
+    )
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(minutes=1)
+    )
+    day_8 = dt_util_real.parse_datetime("2023-10-08 00:00:00Z")
+    day_9 = dt_util_real.parse_datetime("2023-10-09 00:00:00Z")
+
+    with freeze_time("2023-10-08 23:59:30") as frozen_time:
+        await coordinator.async_refresh()
+        assert coordinator.data["day_start"] == day_8
+        assert "previous_day_reward" not in coordinator.data
+
+        frozen_time.move_to("2023-10-09 00:00:30")
+        await coordinator.async_refresh()
+        assert coordinator.data["day_start"] == day_8
+        assert "previous_day_reward" not in coordinator.data
+
+        frozen_time.move_to("2023-10-09 00:05:00")
+        await coordinator.async_refresh()
+        assert coordinator.data["day_start"] == day_9
+        assert coordinator.data["today_reward"] == Decimal("0.01")
+        assert coordinator.data["previous_day"] == day_8.date()
+        assert coordinator.data["previous_day_reward"] == Decimal("0.5")
+
+        frozen_time.move_to("2023-10-09 12:00:00")
+        await coordinator.async_refresh()
+        assert coordinator.data["day_start"] == day_9
+        assert coordinator.data["previous_day_reward"] == Decimal("0.5")
+
+
+@pytest.mark.asyncio
+async def test_day_rollover_without_profile(hass):
+    "Test that a day without a fetched profile has no final reward."
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(return_value={})
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(minutes=1)
+    )
+    coordinator.demand.start()
+    coordinator.demand.add("pool_stats")
+    day_8 = dt_util_real.parse_datetime("2023-10-08 00:00:00Z")
+
+    with freeze_time("2023-10-08 12:00:00") as frozen_time:
+        await coordinator.async_refresh()
+        frozen_time.move_to("2023-10-09 00:05:00")
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is True
+    assert coordinator.data["previous_day"] == day_8.date()
+    assert "previous_day_reward" not in coordinator.data
+    assert "previous_day_reward" not in BraiinsFarmUpdateCoordinator._aggregate_coin(
+        "btc", [coordinator.data, {"coins": {"btc": {"previous_day_reward": None}}}]
+    )
+
+
+@pytest.mark.asyncio
+async def test_day_rollover_with_sparse_polling(hass):
+    "Test that the rollover is not held back once the grace period is over."
+    rewards = iter([Decimal("0.5"), Decimal("0.7")])
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(
+        side_effect=lambda coin: {"today_reward": next(rewards)}
+    )
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(
+        hass, mock_api_client, timedelta(minutes=1)
+    )
+
+    with freeze_time("2023-10-08 22:00:00") as frozen_time:
+        await coordinator.async_refresh()
+        frozen_time.move_to("2023-10-09 06:00:00")
+        await coordinator.async_refresh()
+
+    assert coordinator.data["day_start"] == dt_util_real.parse_datetime(
+        "2023-10-09 00:00:00Z"
+    )
+    assert coordinator.data["today_reward"] == Decimal("0.7")
+    assert coordinator.data["previous_day_reward"] == Decimal("0.5")
+
+
+@pytest.mark.asyncio
+async def test_day_rollover_refreshes(hass, freezer):
+    "Test that refreshes are scheduled just before and after UTC midnight."
+    freezer.move_to("2023-10-08 23:58:00+00:00")
+    mock_api_client = AsyncMock()
+    mock_api_client.get_user_profile = AsyncMock(return_value={})
+    mock_api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(hass, mock_api_client, None)
+    unsub = coordinator.async_track_day_rollover()
+
+    # Time change listeners fire up to a second late by design.
+    for moment, expected_calls in (
+        ("2023-10-08 23:59:29Z", 0),
+        ("2023-10-08 23:59:31Z", 1),
+        ("2023-10-09 00:00:29Z", 1),
+        ("2023-10-09 00:00:31Z", 2),
+    ):
+        freezer.move_to(moment)
+        async_fire_time_changed(hass, dt_util_real.parse_datetime(moment))
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert mock_api_client.get_user_profile.await_count == expected_calls
+
+    unsub()
+    freezer.move_to("2023-10-09 23:59:31+00:00")
+    async_fire_time_changed(hass, dt_util_real.parse_datetime("2023-10-09 23:59:31Z"))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_api_client.get_user_profile.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_requests_in_flight(hass):
+    "Test that shutting down does not wait for a stalled request."
+    fake = FakeBraiinsApi(api_keys={"key-a", "key-b"})
+    session = fake.session()
+    stalled = BraiinsDataUpdateCoordinator(
+        hass,
+        BraiinsPoolApiClient(session, "key-a", base_url="http://fake"),
+        timedelta(minutes=1),
+    )
+    other = BraiinsDataUpdateCoordinator(
+        hass,
+        BraiinsPoolApiClient(session, "key-b", base_url="http://fake"),
+        timedelta(minutes=1),
+    )
+    # The first pool stats request stalls while holding the shared cache
+    fake.stall(60, path="/stats")
+    refresh = hass.async_create_task(stalled.async_refresh())
+    other_refresh = hass.async_create_task(other.async_refresh())
+    await asyncio.sleep(0.05)
+
+    started = asyncio.get_running_loop().time()
+    await stalled.async_shutdown()
+    with pytest.raises(asyncio.CancelledError):
+        await refresh
+    await other_refresh
+
+    assert asyncio.get_running_loop().time() - started < 1
+    assert stalled.api_client.closed
+    # The other entry fetched the pool stats itself once the lock was released
+    assert other.last_update_success
+    assert other.data["pool_stats"]
+    with pytest.raises(BraiinsPoolApiException):
+        await stalled.api_client.get_user_profile()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_runs_once(hass):
+    "Test that accounts are released once when both they and the farm shut down."
+    accounts = _farm_accounts(hass, {"rig-a": {}, "rig-b": {}})
+    farm = BraiinsFarmUpdateCoordinator(
+        hass,
+        accounts,
+        timedelta(minutes=1),
+        max_concurrent=4,
+        stagger=timedelta(0),
+    )
+
+    # Home Assistant shuts down every coordinator of the entry on unload
+    await farm.async_shutdown()
+    for account in accounts.values():
+        await account.async_shutdown()
+    await farm.async_shutdown()
+
+    for account in accounts.values():
+        account.api_client.async_close.assert_awaited_once()
@@ -0,0 +1,47 @@
+import time
+from unittest.mock import patch
+
+from custom_components.braiins_pool.demand import (
+    DATA_GROUP_POOL_STATS,
+    DATA_GROUP_PROFILE,
+    DATA_GROUPS,
+    DataDemand,
+)
+
+
+def test_everything_wanted_until_tracking_starts():
+    """Test that the first refresh fetches every group."""
+    demand = DataDemand()
+    assert all(demand.wants(group) for group in DATA_GROUPS)
+
+    demand.start()
+    assert not any(demand.wants(group) for group in DATA_GROUPS)
+
+
+def test_holders():
+    """Test that a group is wanted while at least one consumer holds it."""
+    demand = DataDemand()
+    demand.start()
+    release_a = demand.add(DATA_GROUP_PROFILE)
+    release_b = demand.add(DATA_GROUP_PROFILE)
+
+    release_a()
+    release_a()
+    assert demand.wants(DATA_GROUP_PROFILE)
+    assert not demand.wants(DATA_GROUP_POOL_STATS)
+
+    release_b()
+    assert not demand.wants(DATA_GROUP_PROFILE)
+
+
+def test_lease_expires():
+    """Test that a lease wants its groups for a limited time only."""
+    demand = DataDemand()
+    demand.start()
+    now = time.monotonic()
+    demand.lease(DATA_GROUPS, 60)
+
+    with patch("time.monotonic", return_value=now + 59):
+        assert demand.wants(DATA_GROUP_POOL_STATS)
+    with patch("time.monotonic", return_value=now + 61):
+        assert not demand.wants(DATA_GROUP_POOL_STATS)
@@ -0,0 +1,88 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.braiins_pool.api import BraiinsPoolApiClient
+from custom_components.braiins_pool.const import (
+    CONF_ACCOUNT_NAME,
+    CONF_ACCOUNTS,
+    CONF_API_KEY,
+    CONF_ENTRY_TYPE,
+    CONF_REWARDS_ACCOUNT_NAME,
+    DOMAIN,
+    ENTRY_TYPE_FARM,
+)
+from custom_components.braiins_pool.coordinator import (
+    BraiinsDataUpdateCoordinator,
+    BraiinsFarmUpdateCoordinator,
+)
+from custom_components.braiins_pool.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+def _account_coordinator(hass, api_key="secret"):
+    api_client = BraiinsPoolApiClient(None, api_key)
+    api_client.get_user_profile = AsyncMock(return_value={})
+    api_client.get_account_stats = AsyncMock(return_value={})
+    return BraiinsDataUpdateCoordinator(hass, api_client, timedelta(minutes=1))
+
+
+async def test_account_diagnostics(hass):
+    """Test that diagnostics include metrics and redact the API key."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_API_KEY: "secret", CONF_REWARDS_ACCOUNT_NAME: "Miner"},
+    )
+    coordinator = _account_coordinator(hass)
+    coordinator.metrics.endpoint("profile").observe_response(42.0, 100)
+    coordinator.api_client.tracer.record(
+        "https://pool.braiins.com/x", {"Pool-Auth-Token": "secret"}, 200
+    )
+    await coordinator.async_refresh()
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"][CONF_API_KEY] == "**REDACTED**"
+    assert diagnostics["coordinator"]["last_update_success"] is True
+    assert diagnostics["metrics"]["endpoints"]["profile"]["requests"] == 1
+    assert diagnostics["metrics"]["caches"]["pool_stats"]["misses"] == 1
+    assert "accounts" not in diagnostics
+    assert diagnostics["trace"][0]["request_headers"] == {
+        "Pool-Auth-Token": "**REDACTED**"
+    }
+
+
+async def test_farm_diagnostics(hass):
+    """Test that farm diagnostics list every account and redact all keys."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_ENTRY_TYPE: ENTRY_TYPE_FARM,
+            CONF_REWARDS_ACCOUNT_NAME: "Farm",
+            CONF_ACCOUNTS: [
+                {CONF_ACCOUNT_NAME: "a", CONF_API_KEY: "secret-a"},
+                {CONF_ACCOUNT_NAME: "b", CONF_API_KEY: "secret-b"},
+            ],
+        },
+    )
+    accounts = {
+        "a": _account_coordinator(hass, "secret-a"),
+        "b": _account_coordinator(hass, "secret-b"),
+    }
+    accounts["a"].metrics.endpoint("profile").observe_response(10.0, 100)
+    accounts["b"].metrics.endpoint("profile").observe_response(20.0, 100)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = BraiinsFarmUpdateCoordinator(
+        hass, accounts, timedelta(minutes=1), 2, timedelta(0)
+    )
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert "secret" not in str(diagnostics)
+    assert diagnostics["metrics"]["endpoints"]["profile"]["requests"] == 2
+    assert set(diagnostics["accounts"]) == {"a", "b"}
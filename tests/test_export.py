@@ -0,0 +1,110 @@
+import csv
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from custom_components.braiins_pool.api import (
+    BraiinsPoolApiClient,
+    BraiinsPoolApiException,
+)
+from custom_components.braiins_pool.const import (
+    CONF_API_KEY,
+    CONF_REWARDS_ACCOUNT_NAME,
+    DOMAIN,
+)
+from custom_components.braiins_pool.coordinator import BraiinsDataUpdateCoordinator
+from custom_components.braiins_pool.services import (
+    SERVICE_EXPORT_HISTORY,
+    async_setup_services,
+)
+from tests.fake_braiins import FAKE_API_KEY, FakeBraiinsApi
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def fake_api():
+    return FakeBraiinsApi()
+
+
+@pytest.fixture
+def entry(hass, tmp_path, fake_api):
+    hass.config.config_dir = str(tmp_path)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_API_KEY: FAKE_API_KEY, CONF_REWARDS_ACCOUNT_NAME: "Miner"},
+    )
+    entry.add_to_hass(hass)
+    api_client = BraiinsPoolApiClient(
+        fake_api.session(), FAKE_API_KEY, base_url="http://fake"
+    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = BraiinsDataUpdateCoordinator(
+        hass, api_client, timedelta(minutes=1)
+    )
+    async_setup_services(hass)
+    return entry
+
+
+async def _export(hass, entry, data_type, start, end="2024-03-31"):
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        {
+            "entry_id": entry.entry_id,
+            "data_type": data_type,
+            "start_date": start,
+            "end_date": end,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def test_export_payouts_in_chunks(hass, entry, fake_api):
+    """Test that a long range is requested window by window into one file."""
+    response = await _export(hass, entry, "payouts", "2024-01-01")
+
+    # One payout a day, 91 days, requested in 7-day windows
+    assert response["records"] == 91
+    assert fake_api.request_count("/accounts/payouts") == 13
+    with open(response["path"], encoding="utf-8", newline="") as export:
+        rows = list(csv.DictReader(export))
+    assert len(rows) == 91
+    assert rows[0]["account"] == "Miner"
+    assert rows[0]["coin"] == "btc"
+    assert rows[0]["requested_at"] == "2024-01-01T01:00:00+00:00"
+    assert rows[-1]["requested_at"].startswith("2024-03-31")
+
+
+async def test_export_daily_rewards_filters_range(hass, entry, fake_api):
+    """Test that daily rewards, served as a whole, are cut to the range."""
+    response = await _export(hass, entry, "daily_rewards", "2000-01-01", "2100-01-01")
+    assert response["records"] == 30
+
+    response = await _export(hass, entry, "daily_rewards", "2100-01-01", "2100-01-02")
+    assert response["records"] == 0
+
+
+async def test_export_failure_leaves_no_file(hass, entry, tmp_path):
+    """Test that a failed export raises and removes the partial file."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.api_client.get_block_rewards = AsyncMock(
+        side_effect=[
+            await coordinator.api_client.get_block_rewards("2024-01-01", "2024-01-07"),
+            BraiinsPoolApiException("API error 500"),
+        ]
+    )
+
+    with pytest.raises(HomeAssistantError):
+        await _export(hass, entry, "block_rewards", "2024-01-01", "2024-01-14")
+
+    assert not list(tmp_path.glob("braiins_pool_block_rewards_*"))
+
+
+async def test_export_rejects_reversed_range(hass, entry):
+    """Test that a start date after the end date is rejected."""
+    with pytest.raises(ServiceValidationError):
+        await _export(hass, entry, "payouts", "2024-04-01")
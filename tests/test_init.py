@@ -1,20 +1,64 @@
+from datetime import timedelta
+from decimal import Decimal
+import json
+import os
+import subprocess
+import sys
+import time
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
-from homeassistant.config_entries import ConfigEntryState
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntryState
 from homeassistant.core import HomeAssistant
 from homeassistant.const import CONF_API_KEY
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
-from custom_components.braiins_pool.const import DOMAIN, CONF_REWARDS_ACCOUNT_NAME
-from custom_components.braiins_pool.coordinator import BraiinsDataUpdateCoordinator
-from custom_components.braiins_pool import async_setup_entry, async_unload_entry
+from custom_components.braiins_pool.const import (
+    DOMAIN,
+    CONF_ACCOUNTS,
+    CONF_ALIGNED_POLLING,
+    CONF_ENTRY_TYPE,
+    CONF_HASHRATE_HISTORY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_POLL_JITTER_SECS,
+    CONF_POLL_OFFSET_SECS,
+    CONF_REWARDS_ACCOUNT_NAME,
+    DATA_PROFILE_PROBE_CACHE,
+    ENTRY_TYPE_FARM,
+)
+from custom_components.braiins_pool.cache import TimedCache, api_key_digest
+from custom_components.braiins_pool.coordinator import (
+    BraiinsDataUpdateCoordinator,
+    BraiinsFarmUpdateCoordinator,
+)
+from custom_components.braiins_pool import (
+    async_setup,
+    async_setup_entry,
+    async_unload_entry,
+)
+from custom_components.braiins_pool.api import API_URL_POOL_STATS, API_URL_USER_PROFILE
+from custom_components.braiins_pool.sensor import POOL_STATS_SENSOR_TYPES
+from custom_components.braiins_pool.scheduler import entry_jitter
+from tests.fake_braiins import FAKE_API_KEY, FakeBraiinsApi
 
 MOCK_API_KEY = "test_api_key_456"
 MOCK_REWARDS_ACCOUNT_NAME = "My Pool Account"
 MOCK_ENTRY_ID = "mock_entry_1"
 
 
+def _run_unload_callbacks(entry):
+    """Run the callbacks a mocked entry collected through async_on_unload."""
+    for call in entry.async_on_unload.call_args_list:
+        call.args[0]()
+
+
 @pytest.fixture
 def mock_config_entry():
     """Mock a config entry."""
@@ -23,6 +67,7 @@ def mock_config_entry():
             CONF_API_KEY: MOCK_API_KEY,
             CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
         },
+        options={},
         entry_id=MOCK_ENTRY_ID,
         title=MOCK_REWARDS_ACCOUNT_NAME,
     )
@@ -52,7 +97,7 @@ async def test_async_setup_entry(
 
     assert success is True
     MockBraiinsPoolApiClient.assert_called_once_with(
-        async_get_clientsession(hass), MOCK_API_KEY
+        async_get_clientsession(hass), MOCK_API_KEY, hedge_percentile=None
     )
 
     # Check that coordinator is created and stored
@@ -63,6 +108,141 @@ async def test_async_setup_entry(
 
     mock_first_refresh.assert_called_once()
     mock_forward_setup.assert_called_once_with(mock_config_entry, ["sensor"])
+    _run_unload_callbacks(mock_config_entry)
+
+
+@patch("custom_components.braiins_pool.BraiinsPoolApiClient")
+@patch(
+    "custom_components.braiins_pool.BraiinsDataUpdateCoordinator.async_config_entry_first_refresh",
+    return_value=None,
+)
+@patch("homeassistant.config_entries.ConfigEntries.async_forward_entry_setups")
+async def test_async_setup_entry_aligned_polling(
+    mock_forward_setup,
+    mock_first_refresh,
+    MockBraiinsPoolApiClient,
+    hass: HomeAssistant,
+    mock_config_entry,
+):
+    """Test that aligned polling uses the offset plus the entry's own jitter."""
+    mock_config_entry.options = {
+        CONF_ALIGNED_POLLING: True,
+        CONF_POLL_OFFSET_SECS: 20,
+        CONF_POLL_JITTER_SECS: 10,
+    }
+
+    assert await async_setup_entry(hass, mock_config_entry) is True
+
+    coordinator = hass.data[DOMAIN][MOCK_ENTRY_ID]
+    assert coordinator.poll_offset == pytest.approx(
+        20 + entry_jitter(MOCK_ENTRY_ID, 10), abs=1e-6
+    )
+    _run_unload_callbacks(mock_config_entry)
+
+
+@patch("custom_components.braiins_pool.BraiinsPoolApiClient")
+@patch(
+    "custom_components.braiins_pool.BraiinsDataUpdateCoordinator.async_config_entry_first_refresh",
+    return_value=None,
+)
+@patch("homeassistant.config_entries.ConfigEntries.async_forward_entry_setups")
+async def test_async_setup_entry_hashrate_history(
+    mock_forward_setup,
+    mock_first_refresh,
+    MockBraiinsPoolApiClient,
+    hass: HomeAssistant,
+    mock_config_entry,
+):
+    """Test that the hash rate history is kept in the configuration directory."""
+    mock_config_entry.options = {CONF_HASHRATE_HISTORY: True}
+
+    assert await async_setup_entry(hass, mock_config_entry) is True
+
+    coordinator = hass.data[DOMAIN][MOCK_ENTRY_ID]
+    assert str(coordinator.history.directory) == hass.config.path(
+        "braiins_pool_history", MOCK_ENTRY_ID
+    )
+    _run_unload_callbacks(mock_config_entry)
+
+
+@patch("custom_components.braiins_pool.BraiinsPoolApiClient")
+@patch(
+    "custom_components.braiins_pool.BraiinsDataUpdateCoordinator.async_config_entry_first_refresh",
+    return_value=None,
+)
+@patch("homeassistant.config_entries.ConfigEntries.async_forward_entry_setups")
+async def test_async_setup_entry_uses_probed_profile(
+    mock_forward_setup,
+    mock_first_refresh,
+    MockBraiinsPoolApiClient,
+    hass: HomeAssistant,
+    mock_config_entry,
+):
+    """Test that the first refresh reuses the profile fetched by the config flow."""
+    api_client = MockBraiinsPoolApiClient.return_value
+    api_client.get_user_profile = AsyncMock(
+        return_value={"current_balance": Decimal("2")}
+    )
+    api_client.get_account_stats = AsyncMock(return_value={})
+    probe_cache = hass.data[DATA_PROFILE_PROBE_CACHE] = TimedCache(timedelta(minutes=2))
+    probe_cache.set(api_key_digest(MOCK_API_KEY), {"current_balance": Decimal("1")})
+
+    assert await async_setup_entry(hass, mock_config_entry) is True
+    coordinator = hass.data[DOMAIN][MOCK_ENTRY_ID]
+    # Stands in for the sensors, whose platform setup is mocked
+    coordinator.demand.add("profile")
+
+    await coordinator.async_refresh()
+    assert coordinator.data["coins"]["btc"]["current_balance"] == Decimal("1")
+    api_client.get_user_profile.assert_not_awaited()
+    assert probe_cache.get(api_key_digest(MOCK_API_KEY)) is None
+
+    await coordinator.async_refresh()
+    assert coordinator.data["coins"]["btc"]["current_balance"] == Decimal("2")
+    api_client.get_user_profile.assert_awaited_once()
+    _run_unload_callbacks(mock_config_entry)
+
+
+@patch("custom_components.braiins_pool.BraiinsPoolApiClient")
+@patch(
+    "custom_components.braiins_pool.BraiinsFarmUpdateCoordinator.async_config_entry_first_refresh",
+    return_value=None,
+)
+@patch("homeassistant.config_entries.ConfigEntries.async_forward_entry_setups")
+async def test_async_setup_farm_entry(
+    mock_forward_setup,
+    mock_first_refresh,
+    MockBraiinsPoolApiClient,
+    hass: HomeAssistant,
+):
+    """Test setting up a farm creates one timer-less coordinator per account."""
+    farm_entry = MagicMock(
+        data={
+            CONF_ENTRY_TYPE: ENTRY_TYPE_FARM,
+            CONF_REWARDS_ACCOUNT_NAME: "My Farm",
+            CONF_ACCOUNTS: [
+                {"name": "rig-a", CONF_API_KEY: "key_a"},
+                {"name": "rig-b", CONF_API_KEY: "key_b"},
+            ],
+        },
+        options={CONF_MAX_CONCURRENT_REQUESTS: 3},
+        entry_id="farm_entry",
+        title="My Farm",
+    )
+
+    assert await async_setup_entry(hass, farm_entry) is True
+
+    farm = hass.data[DOMAIN]["farm_entry"]
+    assert isinstance(farm, BraiinsFarmUpdateCoordinator)
+    assert farm.max_concurrent == 3
+    assert list(farm.accounts) == ["rig-a", "rig-b"]
+    assert all(account.update_interval is None for account in farm.accounts.values())
+    assert [call.args[1] for call in MockBraiinsPoolApiClient.call_args_list] == [
+        "key_a",
+        "key_b",
+    ]
+    mock_first_refresh.assert_called_once()
+    _run_unload_callbacks(farm_entry)
 
 
 @patch("homeassistant.config_entries.ConfigEntries.async_unload_platforms")
@@ -74,7 +254,8 @@ async def test_async_unload_entry(
     """Test successful unload of the integration."""
     # Pre-populate hass.data as if setup was successful
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][mock_config_entry.entry_id] = MagicMock()  # Mock coordinator
+    coordinator = MagicMock(async_shutdown=AsyncMock())  # Mock coordinator
+    hass.data[DOMAIN][mock_config_entry.entry_id] = coordinator
     mock_unload_platforms.return_value = True
 
     success = await async_unload_entry(hass, mock_config_entry)
@@ -83,3 +264,190 @@ async def test_async_unload_entry(
     assert success is True
     mock_unload_platforms.assert_called_once_with(mock_config_entry, ["sensor"])
     assert mock_config_entry.entry_id not in hass.data[DOMAIN]
+    # Home Assistant shuts the coordinator down through the entry's unload
+    # callbacks, so unloading the entry must not do it a second time.
+    coordinator.async_shutdown.assert_not_awaited()
+
+
+async def test_async_setup_registers_services(hass: HomeAssistant):
+    """Test that the integration's services are registered on setup."""
+    assert await async_setup_component(hass, "http", {})
+    assert await async_setup(hass, {})
+
+    assert hass.services.has_service(DOMAIN, "profile_updates")
+    assert hass.services.has_service(DOMAIN, "export_history")
+    assert hass.services.has_service(DOMAIN, "refresh")
+
+
+async def test_rejected_key_stops_polling_until_reauth(hass: HomeAssistant, freezer):
+    """Test that a rejected key stops polling and reauth resumes it."""
+    fake = FakeBraiinsApi()
+    profile_path = API_URL_USER_PROFILE.format("btc")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_API_KEY: FAKE_API_KEY,
+            CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
+        },
+        unique_id=MOCK_REWARDS_ACCOUNT_NAME,
+    )
+    entry.add_to_hass(hass)
+    with (
+        patch(
+            "custom_components.braiins_pool.async_get_clientsession",
+            return_value=fake.session(),
+        ),
+        patch(
+            "custom_components.braiins_pool.config_flow.async_get_clientsession",
+            return_value=fake.session(),
+        ),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        fake.api_keys = {"new_key"}
+        for _ in range(3):
+            freezer.tick(timedelta(minutes=1))
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        # One rejected poll, then no more requests
+        assert fake.request_count(profile_path) == 2
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        assert coordinator.auth_failed
+        flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+        assert [flow["context"]["source"] for flow in flows] == [SOURCE_REAUTH]
+
+        result = await hass.config_entries.flow.async_configure(
+            flows[0]["flow_id"], {CONF_API_KEY: "new_key"}
+        )
+        await hass.async_block_till_done()
+
+        assert result["reason"] == "reauth_successful"
+        assert entry.data[CONF_API_KEY] == "new_key"
+        assert entry.state is ConfigEntryState.LOADED
+        # The reloaded entry started from the profile fetched by the flow
+        assert fake.request_count(profile_path) == 3
+        assert hass.data[DOMAIN][entry.entry_id].data["current_balance"] > 0
+
+        freezer.tick(timedelta(minutes=1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert fake.request_count(profile_path) == 4
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_disabled_sensors_stop_their_requests(hass: HomeAssistant, freezer):
+    """Test that an endpoint whose sensors are all disabled is no longer polled."""
+    fake = FakeBraiinsApi()
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_API_KEY: FAKE_API_KEY,
+            CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
+        },
+        unique_id=MOCK_REWARDS_ACCOUNT_NAME,
+    )
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    for description in POOL_STATS_SENSOR_TYPES:
+        registry.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            f"{entry.entry_id}_pool_stats_{description.key}",
+            config_entry=entry,
+            disabled_by=er.RegistryEntryDisabler.USER,
+        )
+
+    with patch(
+        "custom_components.braiins_pool.async_get_clientsession",
+        return_value=fake.session(),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        for _ in range(15):
+            freezer.tick(timedelta(minutes=1))
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done(wait_background_tasks=True)
+
+        # Only the first refresh, made before any sensor existed
+        assert fake.request_count(API_URL_POOL_STATS.format("btc")) == 1
+        assert fake.request_count(API_URL_USER_PROFILE.format("btc")) == 16
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+# Home Assistant startup time is tracked, so importing the integration and
+# setting up an entry have to stay lean. The budgets are generous to leave
+# headroom for slow CI machines, where they can be raised further through the
+# environment; a regression that loads a heavy module eagerly or does work
+# on the setup path scales well past them. Detailed timings are measured by
+# tests/benchmarks/test_bench_startup.py.
+IMPORT_BUDGET_SECS = float(os.environ.get("BRAIINS_POOL_IMPORT_BUDGET_SECS", "0.5"))
+SETUP_ENTRY_BUDGET_SECS = float(
+    os.environ.get("BRAIINS_POOL_SETUP_ENTRY_BUDGET_SECS", "1")
+)
+# Modules of features that are off by default or run on demand
+LAZY_MODULES = (
+    "custom_components.braiins_pool.cassette",
+    "custom_components.braiins_pool.export",
+    "custom_components.braiins_pool.profiling",
+    "custom_components.braiins_pool.timeseries",
+    "cProfile",
+    "csv",
+    "tracemalloc",
+)
+IMPORT_SCRIPT = """
+import json, sys, time
+# Loaded by Home Assistant before any integration
+import homeassistant.components.http
+import homeassistant.components.sensor
+import homeassistant.helpers.aiohttp_client
+import homeassistant.helpers.update_coordinator
+started = time.perf_counter()
+import custom_components.braiins_pool
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def test_import_time_budget():
+    """Test that importing the integration is fast and skips optional modules."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    measured = json.loads(result.stdout.splitlines()[-1])
+
+    assert measured["elapsed"] < IMPORT_BUDGET_SECS
+    assert not set(LAZY_MODULES) & set(measured["modules"])
+
+
+async def test_setup_entry_time_budget(hass: HomeAssistant):
+    """Test that setting up an entry, first refresh included, is fast."""
+    fake = FakeBraiinsApi()
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_API_KEY: FAKE_API_KEY,
+            CONF_REWARDS_ACCOUNT_NAME: MOCK_REWARDS_ACCOUNT_NAME,
+        },
+    )
+    entry.add_to_hass(hass)
+    # Set up the platforms the entry depends on outside of the measurement
+    assert await async_setup_component(hass, "sensor", {})
+
+    with patch(
+        "custom_components.braiins_pool.async_get_clientsession",
+        return_value=fake.session(),
+    ):
+        started = time.perf_counter()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - started
+
+        assert entry.state is ConfigEntryState.LOADED
+        assert elapsed < SETUP_ENTRY_BUDGET_SECS
+        assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,57 @@
+from aiohttp import ClientError
+
+from custom_components.braiins_pool.metrics import (
+    LATENCY_BUCKETS_MS,
+    ApiMetrics,
+    EndpointMetrics,
+)
+
+
+def test_endpoint_metrics():
+    """Test the latency histogram and derived values."""
+    metrics = EndpointMetrics()
+    for latency in (10, 60, 60, 20000):
+        metrics.observe_response(latency, 100)
+    metrics.observe_decode(2.0)
+    metrics.observe_error(ClientError())
+
+    assert metrics.requests == 4
+    assert metrics.latency_buckets[0] == 1
+    assert metrics.latency_buckets[1] == 2
+    assert metrics.latency_buckets[len(LATENCY_BUCKETS_MS)] == 1
+    assert metrics.latency_ms_mean == (10 + 60 + 60 + 20000) / 4
+    assert metrics.latency_ms_percentile(50) == 100
+    assert metrics.latency_ms_percentile(100) == 20000
+    assert metrics.as_dict()["decode_ms_mean"] == 2.0
+    assert metrics.as_dict()["errors"] == {"ClientError": 1}
+    assert metrics.as_dict()["latency_histogram_ms"]["inf"] == 1
+
+
+def test_empty_metrics():
+    """Test that metrics without observations have no derived values."""
+    metrics = ApiMetrics()
+
+    assert metrics.endpoint("profile").latency_ms_mean is None
+    assert metrics.endpoint("profile").latency_ms_percentile(95) is None
+    assert metrics.cache("pool_stats").hit_ratio is None
+
+
+def test_combine():
+    """Test that the metrics of several clients add up."""
+    first, second = ApiMetrics(), ApiMetrics()
+    first.endpoint("profile").observe_response(30, 10)
+    second.endpoint("profile").observe_response(300, 20)
+    second.endpoint("profile").observe_error(ClientError())
+    first.cache("pool_stats").misses += 1
+    second.cache("pool_stats").hits += 3
+
+    combined = ApiMetrics.combine([first, second])
+
+    profile = combined.endpoints["profile"]
+    assert profile.requests == 2
+    assert profile.response_bytes_total == 30
+    assert profile.latency_ms_max == 300
+    assert profile.errors == {"ClientError": 1}
+    assert combined.caches["pool_stats"].hit_ratio == 0.75
+    # Combining does not change the originals
+    assert first.endpoints["profile"].requests == 1
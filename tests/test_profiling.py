@@ -0,0 +1,124 @@
+import pstats
+import tracemalloc
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.braiins_pool.const import DOMAIN
+from custom_components.braiins_pool.coordinator import BraiinsDataUpdateCoordinator
+from custom_components.braiins_pool.profiling import UpdateProfiler
+from custom_components.braiins_pool.services import (
+    SERVICE_PROFILE_UPDATES,
+    async_setup_services,
+)
+
+pytestmark = pytest.mark.asyncio
+
+ENTRY_ID = "profiled_entry"
+
+
+@pytest.fixture
+def coordinator(hass, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    api_client = AsyncMock()
+    api_client.get_user_profile = AsyncMock(return_value={})
+    api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(hass, api_client, timedelta(minutes=1))
+    hass.data.setdefault(DOMAIN, {})[ENTRY_ID] = coordinator
+    async_setup_services(hass)
+    return coordinator
+
+
+@pytest.mark.parametrize("mode,suffix", [("cprofile", "prof"), ("tracemalloc", "txt")])
+async def test_profile_updates(hass, tmp_path, coordinator, mode, suffix):
+    """Test that the next cycles are profiled and profiling then turns off."""
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE_UPDATES,
+        {"entry_id": ENTRY_ID, "mode": mode, "cycles": 2},
+        blocking=True,
+    )
+    assert UpdateProfiler.is_active(coordinator)
+
+    await coordinator.async_refresh()
+    assert UpdateProfiler.is_active(coordinator)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert not UpdateProfiler.is_active(coordinator)
+    assert coordinator.last_update_success
+    (report,) = tmp_path.glob(f"braiins_pool_{mode}_{ENTRY_ID}_*.{suffix}")
+    if mode == "cprofile":
+        stats = pstats.Stats(str(report))
+        assert any(function == "_async_update_data" for _, _, function in stats.stats)
+    else:
+        assert report.read_text().startswith("Allocation growth")
+
+
+async def test_profile_updates_unknown_entry(hass, coordinator):
+    """Test that profiling an entry that is not loaded is rejected."""
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_PROFILE_UPDATES, {"entry_id": "missing"}, blocking=True
+        )
+
+
+async def test_profile_updates_already_active(hass, coordinator):
+    """Test that an entry cannot be profiled twice at the same time."""
+    await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE_UPDATES, {"entry_id": ENTRY_ID}, blocking=True
+    )
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_PROFILE_UPDATES, {"entry_id": ENTRY_ID}, blocking=True
+        )
+
+
+async def _profile(hass, entry_id, mode="tracemalloc", cycles=1):
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE_UPDATES,
+        {"entry_id": entry_id, "mode": mode, "cycles": cycles},
+        blocking=True,
+    )
+
+
+async def test_concurrent_tracemalloc_profiles(hass, tmp_path, coordinator):
+    """Test that tracing runs until the last of overlapping profiles is done."""
+    other = BraiinsDataUpdateCoordinator(
+        hass, coordinator.api_client, timedelta(minutes=1)
+    )
+    hass.data[DOMAIN]["other_entry"] = other
+    assert not tracemalloc.is_tracing()
+
+    await _profile(hass, ENTRY_ID)
+    await _profile(hass, "other_entry")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert tracemalloc.is_tracing()
+
+    await other.async_refresh()
+    await hass.async_block_till_done()
+
+    assert other.last_update_success
+    assert not tracemalloc.is_tracing()
+    assert len(list(tmp_path.glob("braiins_pool_tracemalloc_*.txt"))) == 2
+
+
+async def test_unload_stops_profiling(hass, coordinator):
+    """Test that unloading an entry mid-profile restores the coordinator."""
+    entry = MockConfigEntry(domain=DOMAIN, entry_id=ENTRY_ID)
+    entry.add_to_hass(hass)
+
+    await _profile(hass, ENTRY_ID, cycles=5)
+    assert UpdateProfiler.is_active(coordinator)
+    assert tracemalloc.is_tracing()
+
+    await entry._async_process_on_unload(hass)
+
+    assert not UpdateProfiler.is_active(coordinator)
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,182 @@
+from datetime import timedelta
+from decimal import Decimal
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.setup import async_setup_component
+
+from custom_components.braiins_pool.api import BraiinsPoolApiClient
+from custom_components.braiins_pool.const import (
+    CONF_API_KEY,
+    CONF_REWARDS_ACCOUNT_NAME,
+    DOMAIN,
+)
+from custom_components.braiins_pool.coordinator import (
+    BraiinsDataUpdateCoordinator,
+    BraiinsFarmUpdateCoordinator,
+)
+from custom_components.braiins_pool.prometheus import (
+    CONTENT_TYPE,
+    METRICS_URL,
+    OpenMetricsRenderer,
+)
+from custom_components.braiins_pool.schema import decode_workers
+
+from tests.fake_braiins import workers_payload
+
+pytestmark = pytest.mark.asyncio
+
+PROFILE = {
+    "current_balance": Decimal("0.00012345"),
+    "today_reward": Decimal("0.00000100"),
+    "all_time_reward": Decimal("0.01"),
+    "ok_workers": 2,
+    "pool_5m_hash_rate": 200000.0,
+}
+POOL_STATS = {
+    "hash_rate_5m": 5.0e9,
+    "active_workers": 50_000,
+    "luck_b10": 1.25,
+    "last_block_height": 825_000,
+}
+
+
+def _account_coordinator(hass, workers: int = 2, api_key: str = "secret"):
+    api_client = BraiinsPoolApiClient(None, api_key)
+    api_client.get_user_profile = AsyncMock(return_value=PROFILE)
+    api_client.get_account_stats = AsyncMock(return_value=POOL_STATS)
+    api_client.get_workers = AsyncMock(
+        return_value=decode_workers(workers_payload(workers=workers), "btc")
+    )
+    return BraiinsDataUpdateCoordinator(
+        hass, api_client, timedelta(minutes=1), fetch_workers=True
+    )
+
+
+async def _add_entry(hass, coordinator, name: str = 'Miner "A"') -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_API_KEY: "secret", CONF_REWARDS_ACCOUNT_NAME: name},
+    )
+    entry.add_to_hass(hass)
+    await coordinator.async_refresh()
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    return entry
+
+
+async def test_render_account(hass):
+    """Test the samples and labels of a single account."""
+    coordinator = _account_coordinator(hass)
+    await _add_entry(hass, coordinator)
+
+    text = OpenMetricsRenderer().render(hass)
+
+    assert text.endswith("# EOF\n")
+    lines = text.splitlines()
+    assert 'braiins_pool_last_update_success{account="Miner \\"A\\""} 1' in lines
+    assert (
+        'braiins_pool_current_balance{account="Miner \\"A\\"",coin="btc"} 0.00012345'
+        in lines
+    )
+    assert 'braiins_pool_pool_last_block_height{coin="btc"} 825000' in lines
+    up = [line for line in lines if line.startswith("braiins_pool_worker_up{")]
+    assert len(up) == 2
+    assert 'worker="fakeminer.worker00000"' in up[0]
+    # Every family is emitted as one contiguous block after its metadata
+    names = [line.split("{")[0] for line in lines if not line.startswith("#")]
+    assert names == sorted(names, key=names.index)
+    families = {line.split()[2] for line in lines if line.startswith("# TYPE")}
+    assert set(names) <= families
+
+
+async def test_render_stale_account(hass, freezer):
+    """Test that data kept from an earlier update is flagged and dated."""
+    freezer.move_to("2024-01-01 00:00:00+00:00")
+    coordinator = _account_coordinator(hass)
+    coordinator.stale_grace = timedelta(minutes=5)
+    await _add_entry(hass, coordinator)
+    renderer = OpenMetricsRenderer()
+
+    lines = renderer.render(hass).splitlines()
+    assert 'braiins_pool_data_stale{account="Miner \\"A\\""} 0' in lines
+    assert (
+        'braiins_pool_data_timestamp_seconds{account="Miner \\"A\\""} 1704067200.0'
+        in lines
+    )
+
+    freezer.tick(timedelta(minutes=1))
+    coordinator.api_client.get_user_profile.side_effect = RuntimeError("down")
+    await coordinator.async_refresh()
+
+    lines = renderer.render(hass).splitlines()
+    assert 'braiins_pool_last_update_success{account="Miner \\"A\\""} 1' in lines
+    assert 'braiins_pool_data_stale{account="Miner \\"A\\""} 1' in lines
+    assert (
+        'braiins_pool_data_timestamp_seconds{account="Miner \\"A\\""} 1704067200.0'
+        in lines
+    )
+
+
+async def test_render_farm_and_shared_pool_stats(hass):
+    """Test that farm accounts are rendered and pool stats only once."""
+    accounts = {
+        "rig-a": _account_coordinator(hass, api_key="key-a"),
+        "rig-b": _account_coordinator(hass, api_key="key-b"),
+    }
+    farm = BraiinsFarmUpdateCoordinator(
+        hass, accounts, timedelta(minutes=1), max_concurrent=2, stagger=timedelta()
+    )
+    await _add_entry(hass, farm, "Farm")
+
+    lines = OpenMetricsRenderer().render(hass).splitlines()
+
+    assert 'braiins_pool_last_update_success{account="rig-a"} 1' in lines
+    assert 'braiins_pool_last_update_success{account="rig-b"} 1' in lines
+    assert (
+        len([line for line in lines if line.startswith("braiins_pool_pool_luck_b10")])
+        == 1
+    )
+
+
+async def test_render_reuses_lines_until_update(hass):
+    """Test that scrapes never call the API and reuse unchanged accounts."""
+    coordinator = _account_coordinator(hass, workers=10_000)
+    await _add_entry(hass, coordinator)
+    renderer = OpenMetricsRenderer()
+    api_calls = coordinator.api_client.get_workers.await_count
+
+    first = renderer.render(hass)
+    started = time.perf_counter()
+    second = renderer.render(hass)
+    cached_seconds = time.perf_counter() - started
+
+    assert second == first
+    assert first.count("braiins_pool_worker_up{") == 10_000
+    assert coordinator.api_client.get_workers.await_count == api_calls
+    assert cached_seconds < 1
+
+    coordinator.api_client.get_user_profile.return_value = {
+        **PROFILE,
+        "ok_workers": 1,
+    }
+    await coordinator.async_refresh()
+    assert 'coin="btc"} 1\n' in renderer.render(hass)
+
+
+async def test_metrics_view(hass, hass_client):
+    """Test the scrape endpoint."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    coordinator = _account_coordinator(hass)
+    await _add_entry(hass, coordinator, "Miner")
+    client = await hass_client()
+
+    response = await client.get(METRICS_URL)
+
+    assert response.status == 200
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    assert 'braiins_pool_ok_workers{account="Miner",coin="btc"} 2' in (
+        await response.text()
+    )
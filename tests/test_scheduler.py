@@ -0,0 +1,181 @@
+"""Unit tests for the Braiins Pool poll scheduling helpers."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiohttp import ClientError
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.braiins_pool.const import DOMAIN
+from custom_components.braiins_pool.coordinator import BraiinsDataUpdateCoordinator
+from custom_components.braiins_pool.scheduler import (
+    RefreshCoalescer,
+    entry_jitter,
+    next_aligned_time,
+)
+from custom_components.braiins_pool.services import (
+    SERVICE_REFRESH,
+    async_setup_services,
+)
+
+
+def _ts(hour, minute, second):
+    return datetime(2023, 10, 8, hour, minute, second, tzinfo=timezone.utc).timestamp()
+
+
+def test_next_aligned_time():
+    """Test polls land the offset after the next interval boundary."""
+    assert next_aligned_time(_ts(12, 3, 17), 300, 20) == _ts(12, 5, 20)
+    assert next_aligned_time(_ts(12, 3, 17), 60, 20) == _ts(12, 3, 20)
+    assert next_aligned_time(_ts(12, 3, 25), 60, 20) == _ts(12, 4, 20)
+    # Exactly on a poll slot schedules the next one, never the current one.
+    assert next_aligned_time(_ts(12, 5, 20), 300, 20) == _ts(12, 10, 20)
+
+
+def test_entry_jitter_is_deterministic_and_bounded():
+    """Test that jitter is stable per entry and spreads different entries."""
+    jitters = [entry_jitter(f"entry_{i}", 10) for i in range(50)]
+
+    assert jitters == [entry_jitter(f"entry_{i}", 10) for i in range(50)]
+    assert all(0 <= jitter < 10 for jitter in jitters)
+    assert len(set(jitters)) == 50
+    assert entry_jitter("entry_1", 0) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_refresh_coalescer_window():
+    """Test that requests within the window share one refresh."""
+    refresh = AsyncMock()
+    coalescer = RefreshCoalescer(refresh, window=0.05, min_spacing=0)
+
+    await asyncio.gather(*(coalescer.async_request() for _ in range(10)))
+    assert refresh.await_count == 1
+
+    await coalescer.async_request()
+    assert refresh.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_coalescer_spacing():
+    """Test that refreshes start at least the minimum spacing apart."""
+    loop = asyncio.get_running_loop()
+    starts = []
+    coalescer = RefreshCoalescer(
+        AsyncMock(side_effect=lambda: starts.append(loop.time())),
+        window=0,
+        min_spacing=0.2,
+    )
+
+    await coalescer.async_request()
+    await asyncio.gather(coalescer.async_request(), coalescer.async_request())
+
+    assert coalescer.refreshes == 2
+    assert starts[1] - starts[0] >= 0.19
+
+
+@pytest.mark.asyncio
+async def test_refresh_coalescer_spacing_from_last_fetch():
+    """Test that a refresh is spaced from a fetch the coalescer did not make."""
+    loop = asyncio.get_running_loop()
+    fetched_at = loop.time()
+    starts = []
+    coalescer = RefreshCoalescer(
+        AsyncMock(side_effect=lambda: starts.append(loop.time())),
+        window=0,
+        min_spacing=0.2,
+        since_last_fetch=lambda: loop.time() - fetched_at,
+    )
+
+    await coalescer.async_request()
+
+    assert starts[0] - fetched_at >= 0.19
+
+
+@pytest.mark.asyncio
+async def test_refresh_coalescer_cancel():
+    """Test that cancelling releases the waiting callers without a refresh."""
+    refresh = AsyncMock()
+    coalescer = RefreshCoalescer(refresh, window=10, min_spacing=0)
+    request = asyncio.ensure_future(coalescer.async_request())
+    await asyncio.sleep(0)
+
+    coalescer.cancel()
+    await request
+    refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_refresh_service(hass):
+    """Test the refresh service targets entries and collapses bursts."""
+    coordinators = {}
+    for entry_id in ("account_a", "account_b"):
+        entry = MockConfigEntry(domain=DOMAIN, entry_id=entry_id, data={})
+        entry.add_to_hass(hass)
+        api_client = AsyncMock()
+        api_client.get_user_profile = AsyncMock(return_value={})
+        api_client.get_account_stats = AsyncMock(return_value={})
+        coordinators[entry_id] = BraiinsDataUpdateCoordinator(
+            hass, api_client, timedelta(minutes=1)
+        )
+    hass.data[DOMAIN] = dict(coordinators)
+    async_setup_services(hass)
+
+    with patch("custom_components.braiins_pool.coordinator.REFRESH_COALESCE_SECS", 0):
+        await asyncio.gather(
+            *(
+                hass.services.async_call(
+                    DOMAIN, SERVICE_REFRESH, {"entry_id": "account_a"}, blocking=True
+                )
+                for _ in range(10)
+            )
+        )
+        assert coordinators["account_a"].api_client.get_user_profile.await_count == 1
+        assert coordinators["account_b"].api_client.get_user_profile.await_count == 0
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_REFRESH, {"entry_type": "farm"}, blocking=True
+            )
+
+        coordinators["account_b"].api_client.get_user_profile.side_effect = (
+            RuntimeError("down")
+        )
+        with pytest.raises(HomeAssistantError, match="account_b"):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_REFRESH, {"entry_id": "account_b"}, blocking=True
+            )
+
+    for coordinator in coordinators.values():
+        await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_refresh_service_fails_on_stale_data(hass):
+    """Test that data served stale after a failed fetch fails the service."""
+    entry = MockConfigEntry(domain=DOMAIN, entry_id="account", data={})
+    entry.add_to_hass(hass)
+    api_client = AsyncMock()
+    api_client.get_user_profile = AsyncMock(return_value={})
+    api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(hass, api_client, timedelta(minutes=1))
+    coordinator.stale_grace = timedelta(minutes=5)
+    await coordinator.async_refresh()
+    hass.data[DOMAIN] = {"account": coordinator}
+    async_setup_services(hass)
+
+    api_client.get_user_profile.side_effect = ClientError("down")
+    with (
+        patch("custom_components.braiins_pool.coordinator.REFRESH_COALESCE_SECS", 0),
+        patch("custom_components.braiins_pool.coordinator.REFRESH_MIN_SPACING_SECS", 0),
+        pytest.raises(HomeAssistantError, match="account"),
+    ):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_REFRESH, {"entry_id": "account"}, blocking=True
+        )
+
+    assert coordinator.last_update_success is True
+    assert coordinator.stale is True
+    await coordinator.async_shutdown()
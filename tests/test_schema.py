@@ -0,0 +1,185 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from custom_components.braiins_pool.schema import (
+    DailyReward,
+    SchemaError,
+    decode_daily_rewards,
+    decode_payouts,
+    decode_pool_stats,
+    decode_profile,
+    decode_workers,
+)
+from tests.fake_braiins import payouts_payload, pool_stats_payload, workers_payload
+
+
+def test_missing_coin_decodes_empty():
+    """Test that a response without the coin decodes to no data."""
+    assert decode_profile({"username": "miner"}, "btc") == {}
+    assert decode_pool_stats({}, "btc") == {}
+    assert decode_workers({}, "btc") == {}
+    assert decode_payouts({"btc": {"payouts": None}}, "btc") == []
+
+
+def test_profile_defaults_missing_figures():
+    """Test that a new account without figures gets zeros."""
+    assert decode_profile({"btc": {}}, "btc") == {
+        "current_balance": Decimal("0"),
+        "today_reward": Decimal("0"),
+        "all_time_reward": Decimal("0"),
+        "ok_workers": 0,
+        "pool_5m_hash_rate": 0.0,
+    }
+
+
+def test_pool_stats_without_blocks():
+    """Test that the last block is left out while none is listed."""
+    payload = pool_stats_payload(blocks=0)
+
+    stats = decode_pool_stats(payload, "btc")
+
+    assert stats["recent_blocks"] == 0
+    assert "last_block_height" not in stats
+
+
+def test_records_are_typed():
+    """Test that history records carry converted values."""
+    data = {"btc": {"daily_rewards": [{"date": 1704067200, "total_reward": "0.5"}]}}
+
+    (reward,) = decode_daily_rewards(data, "btc")
+
+    assert isinstance(reward, DailyReward)
+    assert reward.date == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert reward.total_reward == Decimal("0.5")
+    assert reward.referral_bonus == Decimal("0")
+    assert not hasattr(reward, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "decode,data,message",
+    [
+        (decode_profile, [], "expected an object, got list"),
+        (decode_profile, {"btc": "n/a"}, "btc: expected an object, got str"),
+        (
+            decode_profile,
+            {"btc": {"current_balance": "lots"}},
+            "btc: unexpected value of 'current_balance': 'lots'",
+        ),
+        (
+            decode_pool_stats,
+            {"btc": {"blocks": {"825000": {"date_found": "yesterday"}}}},
+            "btc.blocks.825000: unexpected value of 'date_found': 'yesterday'",
+        ),
+        (
+            decode_workers,
+            {"btc": {"workers": {"miner.rig1": {"state": "ok"}}}},
+            "btc.workers['miner.rig1']: missing 'hash_rate_5m'",
+        ),
+        (decode_payouts, {"btc": {"payouts": {}}}, "btc.payouts: expected a list"),
+        (
+            decode_daily_rewards,
+            {"btc": {"daily_rewards": [{"date": 1704067200}]}},
+            "btc.daily_rewards[0]: missing 'total_reward'",
+        ),
+    ],
+)
+def test_schema_drift(decode, data, message):
+    """Test that unexpected responses fail with the path of the problem."""
+    with pytest.raises(SchemaError) as excinfo:
+        decode(data, "btc")
+
+    assert str(excinfo.value) == message
+
+
+def test_error_names_the_failing_record():
+    """Test that the record index is reported, not the first or last one."""
+    data = payouts_payload("2024-01-01", "2024-01-07")
+    data["btc"]["payouts"][3]["amount"] = None
+
+    with pytest.raises(SchemaError, match=r"^btc\.payouts\[3\]: .*'amount'"):
+        decode_payouts(data, "btc")
+
+    data = workers_payload(workers=5)
+    name = list(data["btc"]["workers"])[2]
+    del data["btc"]["workers"][name]["hash_rate_5m"]
+
+    with pytest.raises(SchemaError, match=rf"^btc\.workers\['{name}'\]: missing"):
+        decode_workers(data, "btc")
+
+
+@pytest.mark.parametrize(
+    "decode,data,message",
+    [
+        (
+            decode_workers,
+            {"btc": {"workers": {"rig": {"state": None, "hash_rate_5m": 1.0}}}},
+            "btc.workers['rig']: unexpected value of 'state': None",
+        ),
+        (
+            decode_workers,
+            {"btc": {"workers": {"rig": {"state": 1, "hash_rate_5m": 1.0}}}},
+            "btc.workers['rig']: unexpected value of 'state': 1",
+        ),
+        (
+            decode_workers,
+            {"btc": {"workers": {"rig": {"state": "ok", "hash_rate_5m": True}}}},
+            "btc.workers['rig']: unexpected value of 'hash_rate_5m': True",
+        ),
+        (
+            decode_profile,
+            {"btc": {"ok_workers": False}},
+            "btc: unexpected value of 'ok_workers': False",
+        ),
+        (
+            decode_profile,
+            {"btc": {"ok_workers": 2.5}},
+            "btc: unexpected value of 'ok_workers': 2.5",
+        ),
+        (
+            decode_profile,
+            {"btc": {"current_balance": None}},
+            "btc: unexpected value of 'current_balance': None",
+        ),
+        (
+            decode_payouts,
+            {
+                "btc": {
+                    "payouts": [
+                        {"requested_at": 1704067200, "status": "sent", "amount": "1"}
+                        | {"tx_id": 42}
+                    ]
+                }
+            },
+            "btc.payouts[0]: unexpected value of 'tx_id': 42",
+        ),
+        (
+            decode_payouts,
+            {
+                "btc": {
+                    "payouts": [
+                        {"requested_at": 10**20, "status": "sent", "amount": "1"}
+                    ]
+                }
+            },
+            "btc.payouts[0]: unexpected value of 'requested_at': 100000000000000000000",
+        ),
+    ],
+)
+def test_strict_types(decode, data, message):
+    """Test that null, bool and mistyped values are not converted silently."""
+    with pytest.raises(SchemaError) as excinfo:
+        decode(data, "btc")
+
+    assert str(excinfo.value) == message
+
+
+def test_float_amounts_keep_their_decimal_value():
+    """Test that an amount sent as a JSON float has no binary noise."""
+    profile = decode_profile(
+        {"btc": {"current_balance": 0.1, "ok_workers": 3.0}}, "btc"
+    )
+
+    assert profile["current_balance"] == Decimal("0.1")
+    assert profile["ok_workers"] == 3
@@ -1,11 +1,13 @@
 import pytest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
 from unittest.mock import MagicMock, patch
 
 from homeassistant.core import HomeAssistant
-from homeassistant.const import CONF_API_KEY
+from aiohttp import ClientError
+from homeassistant.const import CONF_API_KEY, EntityCategory
 from homeassistant.helpers.entity_component import (
     async_update_entity,
 )  # For potential future use
@@ -20,7 +22,15 @@ from custom_components.braiins_pool.const import (
     CONF_REWARDS_ACCOUNT_NAME,
     SATOSHIS_PER_BTC,
 )
-from custom_components.braiins_pool.sensor import SENSOR_TYPES, BraiinsPoolSensor
+from custom_components.braiins_pool.metrics import ApiMetrics
+from custom_components.braiins_pool.sensor import (
+    METRIC_SENSOR_TYPES,
+    POOL_STATS_SENSOR_TYPES,
+    SENSOR_TYPES,
+    BraiinsPoolMetricSensor,
+    BraiinsPoolSensor,
+    BraiinsPoolStatsSensor,
+)
 from custom_components.braiins_pool.coordinator import BraiinsDataUpdateCoordinator
 
 MOCK_API_KEY = "test_api_key_789"
@@ -51,7 +61,9 @@ def mock_coordinator(hass, mock_config_entry_data):
         "today_reward_satoshi": 100000,  # 0.001 * SATOSHIS_PER_BTC
         "current_balance_satoshi": 5000000,  # 0.05 * SATOSHIS_PER_BTC
         "all_time_reward_satoshi": 123000000,  # 1.23 * SATOSHIS_PER_BTC
+        "pool_stats": {"hash_rate_5m": 5.1e9, "luck_b10": 0.73},
     }
+    coordinator.coins = ["btc"]
     coordinator.config_entry = MagicMock(spec=ConfigEntry)
     coordinator.config_entry.data = mock_config_entry_data
     coordinator.config_entry.entry_id = MOCK_ENTRY_ID
@@ -138,6 +150,134 @@ async def test_sensor_keyerror_fix(
 
     async_add_entities_mock.assert_called_once()
     # Further assertions can be made on the entities passed to async_add_entities_mock if needed
+    added_entities = async_add_entities_mock.call_args.args[0]
+    assert len(added_entities) == (
+        len(SENSOR_TYPES) + len(POOL_STATS_SENSOR_TYPES) + len(METRIC_SENSOR_TYPES)
+    )
+
+
+async def test_pool_stats_sensors(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry_obj
+):
+    """Test pool-wide sensors read from the shared pool stats snapshot."""
+    sensors = {
+        description.key: BraiinsPoolStatsSensor(
+            mock_coordinator, description, mock_config_entry_obj
+        )
+        for description in POOL_STATS_SENSOR_TYPES
+    }
+
+    assert sensors["hash_rate_5m"].native_value == 5.1e9
+    assert sensors["luck_b10"].native_value == 0.73
+    assert sensors["luck_b50"].native_value is None
+    assert (
+        sensors["hash_rate_5m"].unique_id == f"{MOCK_ENTRY_ID}_pool_stats_hash_rate_5m"
+    )
+    # Pool sensors must not collide with the account's own hash rate sensor.
+    assert sensors["hash_rate_5m"].unique_id != f"{MOCK_ENTRY_ID}_pool_5m_hash_rate"
+
+    mock_coordinator.data = {}
+    assert sensors["hash_rate_5m"].native_value is None
+
+
+async def test_daily_sensors_last_reset(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry_obj
+):
+    """Test that daily sensors report the start of the UTC day as last reset."""
+    day_start = datetime(2023, 10, 9, tzinfo=timezone.utc)
+    mock_coordinator.data["day_start"] = day_start
+    sensors = {
+        description.key: BraiinsPoolSensor(
+            mock_coordinator, description, mock_config_entry_obj
+        )
+        for description in SENSOR_TYPES
+    }
+
+    assert sensors["today_reward"].last_reset == day_start
+    assert sensors["today_reward_satoshi"].last_reset == day_start
+    assert sensors["all_time_reward"].last_reset is None
+
+
+async def test_sensor_data_age_attributes(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry_obj, freezer
+):
+    """Test that sensors report the data age once stale data may be served."""
+    sensor = BraiinsPoolSensor(mock_coordinator, SENSOR_TYPES[0], mock_config_entry_obj)
+    mock_coordinator.stale_grace = None
+    assert sensor.extra_state_attributes is None
+
+    freezer.move_to("2023-10-09 12:00:00+00:00")
+    mock_coordinator.stale_grace = timedelta(minutes=10)
+    mock_coordinator.data_time = datetime(2023, 10, 9, 11, 58, tzinfo=timezone.utc)
+    mock_coordinator.stale = True
+    assert sensor.extra_state_attributes == {"data_age": 120, "stale": True}
+
+
+async def test_sensors_per_coin(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry_obj
+):
+    """Test that every configured coin gets its own sensors."""
+    from custom_components.braiins_pool.sensor import (
+        async_setup_entry as sensor_async_setup_entry,
+    )
+
+    mock_coordinator.coins = ["btc", "zec"]
+    mock_coordinator.data["coins"] = {
+        "zec": {
+            "today_reward": 0.5,
+            "pool_stats": {"luck_b10": 1.2},
+        }
+    }
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][mock_config_entry_obj.entry_id] = mock_coordinator
+    async_add_entities_mock = MagicMock()
+
+    await sensor_async_setup_entry(hass, mock_config_entry_obj, async_add_entities_mock)
+
+    entities = {
+        entity.unique_id: entity for entity in async_add_entities_mock.call_args.args[0]
+    }
+    # Original bitcoin sensors keep their unique IDs.
+    assert entities[f"{MOCK_ENTRY_ID}_today_reward"].native_value == 0.001
+    zec_reward = entities[f"{MOCK_ENTRY_ID}_zec_today_reward"]
+    assert zec_reward.native_value == 0.5
+    assert zec_reward.native_unit_of_measurement == "ZEC"
+    assert zec_reward.name == "Braiins Pool ZEC Today's Reward"
+    assert entities[f"{MOCK_ENTRY_ID}_zec_pool_stats_luck_b10"].native_value == 1.2
+    assert f"{MOCK_ENTRY_ID}_zec_today_reward_satoshi" not in entities
+
+
+async def test_farm_sensors(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry_obj
+):
+    """Test that farm entries get the farm sensors on top of the totals."""
+    from custom_components.braiins_pool.sensor import (
+        FARM_SENSOR_TYPES,
+        async_setup_entry as sensor_async_setup_entry,
+    )
+
+    mock_config_entry_obj.data = {
+        CONF_REWARDS_ACCOUNT_NAME: "My Farm",
+        "entry_type": "farm",
+    }
+    mock_coordinator.data["accounts_ok"] = 4
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][mock_config_entry_obj.entry_id] = mock_coordinator
+    async_add_entities_mock = MagicMock()
+
+    await sensor_async_setup_entry(hass, mock_config_entry_obj, async_add_entities_mock)
+
+    entities = {
+        entity.unique_id: entity for entity in async_add_entities_mock.call_args.args[0]
+    }
+    assert len(entities) == (
+        len(SENSOR_TYPES)
+        + len(POOL_STATS_SENSOR_TYPES)
+        + len(FARM_SENSOR_TYPES)
+        + len(METRIC_SENSOR_TYPES)
+    )
+    assert entities[f"{MOCK_ENTRY_ID}_accounts_ok"].native_value == 4
+    assert entities[f"{MOCK_ENTRY_ID}_current_balance"].device_info["name"] == "My Farm"
 
 
 @pytest.mark.usefixtures()
@@ -173,6 +313,11 @@ def test_sensor_types_attributes():
             assert (
                 description.native_unit_of_measurement == "Satoshi"
             ), f"Sensor {description.key} should have Satoshi unit"
+        elif description.key == "previous_day_reward":
+            # A closed day's record, not an accumulating total.
+            assert description.device_class == SensorDeviceClass.MONETARY
+            assert description.state_class is None
+            assert description.native_unit_of_measurement == "BTC"
         elif description.key == "pool_5m_hash_rate":
             assert (
                 description.device_class == SensorDeviceClass.DATA_RATE
@@ -198,3 +343,39 @@ def test_sensor_types_attributes():
                 assert (
                     description.state_class != SensorStateClass.TOTAL
                 ), f"Sensor {description.key} should not have TOTAL state class unless specified"
+
+
+async def test_metric_sensors(
+    hass: HomeAssistant, mock_coordinator, mock_config_entry_obj
+):
+    """Test the disabled-by-default diagnostic sensors reading the metrics."""
+    metrics = ApiMetrics()
+    metrics.endpoint("profile").observe_response(120.0, 512)
+    metrics.endpoint("profile").observe_response(80.0, 512)
+    metrics.endpoint("profile").observe_error(ClientError())
+    metrics.cache("pool_stats").hits = 3
+    metrics.cache("pool_stats").misses = 1
+    mock_coordinator.metrics = metrics
+    sensors = {
+        description.key: BraiinsPoolMetricSensor(
+            mock_coordinator, description, mock_config_entry_obj
+        )
+        for description in METRIC_SENSOR_TYPES
+    }
+
+    assert all(
+        not description.entity_registry_enabled_default
+        and description.entity_category == EntityCategory.DIAGNOSTIC
+        for description in METRIC_SENSOR_TYPES
+    )
+    assert sensors["profile_latency"].native_value == 100.0
+    assert sensors["profile_latency"].extra_state_attributes["requests"] == 2
+    assert sensors["profile_latency"].extra_state_attributes["latency_ms_p95"] == 250
+    assert sensors["profile_errors"].native_value == 1
+    assert sensors["profile_errors"].extra_state_attributes == {
+        "errors": {"ClientError": 1}
+    }
+    assert sensors["pool_stats_cache_hit_ratio"].native_value == 75.0
+    # Nothing observed yet for pool stats requests
+    assert sensors["pool_stats_latency"].native_value is None
+    assert sensors["pool_stats_errors"].extra_state_attributes is None
@@ -0,0 +1,74 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import aiohttp
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.braiins_pool.coordinator import BraiinsDataUpdateCoordinator
+from custom_components.braiins_pool.session import (
+    CONNECTIONS_PER_HOST,
+    PREWARM_LEAD_SECS,
+    async_create_session,
+    async_prewarm,
+)
+from tests.fake_braiins import FakeBraiinsApi
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_create_session(hass):
+    """Test the tuning of the dedicated session."""
+    session = async_create_session(hass)
+    try:
+        assert session.connector.limit_per_host == CONNECTIONS_PER_HOST
+        assert session.headers[aiohttp.hdrs.ACCEPT_ENCODING].startswith("gzip")
+    finally:
+        await session.close()
+
+
+async def test_prewarm_opens_connections(hass, socket_enabled):
+    """Test that pre-warming opens reusable connections and ignores errors."""
+    fake = FakeBraiinsApi()
+    session = async_create_session(hass)
+    try:
+        async with fake.serve() as base_url:
+            await async_prewarm(session, base_url, connections=2)
+
+            assert fake.request_count("/") == 2
+            assert len(session.connector._conns) == 1
+
+        # The server is gone; pre-warming must not raise
+        await async_prewarm(session, base_url)
+    finally:
+        await session.close()
+
+
+async def test_prewarm_scheduled_before_poll(hass, freezer):
+    """Test that the coordinator pre-warms shortly before each poll."""
+    api_client = AsyncMock()
+    api_client.get_user_profile = AsyncMock(return_value={})
+    api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(hass, api_client, timedelta(minutes=1))
+    coordinator.prewarm = AsyncMock()
+    unsub = coordinator.async_add_listener(lambda: None)
+
+    freezer.tick(timedelta(seconds=60 - PREWARM_LEAD_SECS))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert coordinator.prewarm.await_count == 1
+    assert api_client.get_user_profile.await_count == 0
+
+    freezer.tick(timedelta(seconds=PREWARM_LEAD_SECS + 1))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert api_client.get_user_profile.await_count == 1
+
+    unsub()
+    await coordinator.async_shutdown()
+    freezer.tick(timedelta(minutes=5))
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert coordinator.prewarm.await_count == 1
@@ -0,0 +1,155 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.braiins_pool.coordinator import BraiinsDataUpdateCoordinator
+from custom_components.braiins_pool.schema import Worker
+from custom_components.braiins_pool.timeseries import (
+    BLOCK_RECORDS,
+    INDEX_ENTRY,
+    RECORD,
+    HashrateHistory,
+    TimeSeries,
+    async_track_hashrate_history,
+    hashrate_values,
+)
+
+START = 1_700_000_000
+
+
+def _minutes(count: int, start: int = START) -> list[tuple[int, float]]:
+    return [(start + 60 * i, 100_000.0 + i * 0.125) for i in range(count)]
+
+
+def test_append_and_query(tmp_path):
+    """Test that points come back exactly, at a fixed size per point."""
+    series = TimeSeries(tmp_path / "btc")
+    points = _minutes(3 * BLOCK_RECORDS + 5)
+
+    assert series.extend(points) == len(points)
+
+    assert series.query(0, 2**32) == points
+    assert series.query(points[1500][0], points[1600][0]) == points[1500:1601]
+    assert series.query(points[10][0] + 1, points[11][0] - 1) == []
+    assert (tmp_path / "btc.dat").stat().st_size == len(points) * RECORD.size
+    assert (tmp_path / "btc.idx").stat().st_size == 4 * INDEX_ENTRY.size
+
+
+def test_append_skips_old_points_and_persists(tmp_path):
+    """Test that the store is append-only and survives reopening."""
+    series = TimeSeries(tmp_path / "btc")
+    assert series.append(START, 1.0)
+    assert not series.append(START, 2.0)
+    assert not series.append(START - 60, 2.0)
+    # A change too large for a delta record starts a new block
+    assert series.append(START + 60, 5e9)
+
+    reopened = TimeSeries(tmp_path / "btc")
+    assert reopened.append(START + 120, 3.0)
+    assert reopened.query(START, START + 120) == [
+        (START, 1.0),
+        (START + 60, 5e9),
+        (START + 120, 3.0),
+    ]
+
+
+def test_recovers_from_torn_write(tmp_path):
+    """Test that half-written records and orphaned index entries are dropped."""
+    series = TimeSeries(tmp_path / "btc")
+    series.extend(_minutes(BLOCK_RECORDS))
+    with open(tmp_path / "btc.idx", "ab") as index:
+        index.write(INDEX_ENTRY.pack(BLOCK_RECORDS, START + 60 * BLOCK_RECORDS, 0))
+    with open(tmp_path / "btc.dat", "ab") as data:
+        data.write(b"\x01\x02\x03")
+
+    reopened = TimeSeries(tmp_path / "btc")
+    assert len(reopened) == BLOCK_RECORDS
+    assert reopened.append(START + 60 * BLOCK_RECORDS, 7.0)
+    assert reopened.query(START + 60 * (BLOCK_RECORDS - 1), 2**32) == [
+        _minutes(BLOCK_RECORDS)[-1],
+        (START + 60 * BLOCK_RECORDS, 7.0),
+    ]
+
+
+def test_downsample(tmp_path):
+    """Test that points are averaged per aligned interval."""
+    series = TimeSeries(tmp_path / "btc")
+    series.extend([(3600, 1.0), (3660, 3.0), (7200, 10.0), (10_900, 4.0)])
+
+    assert series.downsample(0, 2**32, 3600) == [
+        (3600, 2.0),
+        (7200, 10.0),
+        (10_800, 4.0),
+    ]
+    assert series.downsample(3660, 7200, 3600) == [(3600, 3.0), (7200, 10.0)]
+
+
+def test_history_series_names(tmp_path):
+    """Test that series names map to files and back."""
+    history = HashrateHistory(tmp_path / "entry")
+    values = hashrate_values(
+        {
+            "coins": {
+                "btc": {
+                    "pool_5m_hash_rate": 200.0,
+                    "workers": {
+                        "miner.rig/1": Worker("ok", None, 0.0, 100.0, 0.0, 0.0)
+                    },
+                }
+            }
+        }
+    )
+    assert values == {"btc/account": 200.0, "btc/worker/miner.rig/1": 100.0}
+
+    history.record(START, values)
+
+    assert history.series() == ["btc/account", "btc/worker/miner.rig/1"]
+    assert history["btc/worker/miner.rig/1"].query(START, START) == [(START, 100.0)]
+
+
+@pytest.mark.asyncio
+async def test_track_hashrate_history(hass, tmp_path, freezer):
+    """Test that every successful update is recorded."""
+    freezer.move_to("2024-01-01 00:00:00+00:00")
+    api_client = AsyncMock()
+    api_client.get_user_profile = AsyncMock(return_value={"pool_5m_hash_rate": 5.0})
+    api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(hass, api_client, timedelta(minutes=1))
+    history = HashrateHistory(tmp_path)
+    unsub = async_track_hashrate_history(hass, coordinator, history)
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    freezer.tick(60)
+    api_client.get_user_profile.side_effect = RuntimeError("down")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    unsub()
+
+    assert history["btc/account"].query(0, 2**32) == [(1_704_067_200, 5.0)]
+
+
+@pytest.mark.asyncio
+async def test_stale_data_is_not_recorded(hass, tmp_path, freezer):
+    """Test that data served stale after a failed update adds no point."""
+    freezer.move_to("2024-01-01 00:00:00+00:00")
+    api_client = AsyncMock()
+    api_client.get_user_profile = AsyncMock(return_value={"pool_5m_hash_rate": 5.0})
+    api_client.get_account_stats = AsyncMock(return_value={})
+    coordinator = BraiinsDataUpdateCoordinator(hass, api_client, timedelta(minutes=1))
+    coordinator.stale_grace = timedelta(minutes=5)
+    history = HashrateHistory(tmp_path)
+    unsub = async_track_hashrate_history(hass, coordinator, history)
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    freezer.tick(60)
+    api_client.get_user_profile.side_effect = RuntimeError("down")
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    unsub()
+
+    assert coordinator.last_update_success is True
+    assert coordinator.stale is True
+    assert history["btc/account"].query(0, 2**32) == [(1_704_067_200, 5.0)]
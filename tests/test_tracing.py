@@ -0,0 +1,37 @@
+from aiohttp import ClientError
+
+from custom_components.braiins_pool.tracing import RequestTracer
+
+
+def test_record_redacts_and_truncates():
+    """Test that secrets are redacted wherever they appear."""
+    tracer = RequestTracer("secret", size=2, body_limit=10)
+
+    tracer.record(
+        "https://pool.braiins.com/x?token=secret",
+        {"Pool-Auth-Token": "secret", "Accept": "application/json"},
+        200,
+        {"Set-Cookie": "a=b", "X-Echo": "secret"},
+        '{"token": "secret", "padding": "..."}',
+        12.5,
+    )
+
+    (exchange,) = tracer.dump()
+    assert "secret" not in str(exchange)
+    assert exchange["request_headers"]["Accept"] == "application/json"
+    assert exchange["body_length"] == 37
+    assert exchange["body_truncated"]
+    assert exchange["elapsed_ms"] == 12.5
+
+
+def test_ring_buffer():
+    """Test that only the last exchanges are kept."""
+    tracer = RequestTracer("secret", size=2)
+
+    for index in range(3):
+        tracer.record(f"https://pool.braiins.com/{index}", {}, error=ClientError())
+
+    assert [exchange["url"][-1] for exchange in tracer.dump()] == ["1", "2"]
+    assert tracer.dump()[0]["error"] == "ClientError: "
+    tracer.clear()
+    assert tracer.dump() == []